@@ -0,0 +1,43 @@
+"""
+Per-request cost of authenticating a bearer token and checking a model
+permission, with simplejwt's JWTAuthentication (a user query per request)
+and with StatelessJWTAuthentication (claims, once the version is cached).
+
+    python -m benchmarks.auth_overhead --iterations 2000
+"""
+import argparse
+
+from benchmarks.common import measure, report, setup_django, test_environment
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth.models import Group, Permission
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from toDoApp.authentication import StatelessJWTAuthentication, UserRefreshToken
+    from toDoApp.models import Employee
+
+    with test_environment():
+        group, _ = Group.objects.get_or_create(name='Employees')
+        group.permissions.add(*Permission.objects.filter(codename__in=['view_task', 'change_task']))
+        user = Employee.objects.create_user(email='bench@example.com', password='benchpassword')
+        token = UserRefreshToken.for_user(user).access_token
+        request = APIRequestFactory().get('/api/v1/tasks/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        for authentication in (JWTAuthentication(), StatelessJWTAuthentication()):
+            def authenticate():
+                user, _ = authentication.authenticate(Request(request))
+                assert user.has_perm('toDoApp.view_task')
+
+            report(type(authentication).__name__, measure(authenticate, args.iterations, warmup=10))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Shared helpers for the standalone benchmark scripts in this directory.
+
+Each script is run from the repository root, e.g.
+``python -m benchmarks.kafka_producer``. They use DJANGO_SETTINGS_MODULE
+(default ``todo.settings``) and run against a throwaway test database, so
+they never touch real data.
+"""
+from contextlib import contextmanager
+from pathlib import Path
+import statistics
+import time
+import sys
+import os
+
+
+def setup_django():
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todo.settings')
+
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_environment():
+    """
+    Create the test database for the duration of the block.
+    """
+    from django.test.utils import (
+        setup_databases, setup_test_environment,
+        teardown_databases, teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(fn, iterations, warmup=5):
+    """
+    Call fn() iterations times and return the wall time of each call in seconds.
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label, samples):
+    print(
+        f"{label:<32} n={len(samples):<6} "
+        f"mean={statistics.mean(samples) * 1000:8.3f}ms "
+        f"p50={percentile(samples, 50) * 1000:8.3f}ms "
+        f"p95={percentile(samples, 95) * 1000:8.3f}ms "
+        f"p99={percentile(samples, 99) * 1000:8.3f}ms"
+    )
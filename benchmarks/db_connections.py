@@ -0,0 +1,64 @@
+"""
+Connection overhead per request in each DB_CONNECTION_MODE: a request
+opens its connection (or takes one), runs one query and closes (or
+returns) it, the way Django's request_started/request_finished handlers
+drive the connection of a thread.
+
+    none        a new connection per request (CONN_MAX_AGE=0, the old setting)
+    persistent  CONN_MAX_AGE with CONN_HEALTH_CHECKS
+    pool        toDoApp.pooled_postgresql
+
+Needs the PostgreSQL database of DJANGO_SETTINGS_MODULE; the gap grows with
+the network distance to it and with TLS.
+
+    python -m benchmarks.db_connections --requests 500
+"""
+import argparse
+import copy
+
+from benchmarks.common import measure, report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db import connections
+    from django.db.utils import load_backend
+
+    settings_dict = connections.settings['default']
+    if settings_dict['ENGINE'] not in ('django.db.backends.postgresql', 'toDoApp.pooled_postgresql'):
+        raise SystemExit(f"Needs PostgreSQL, not {settings_dict['ENGINE']}.")
+
+    options = {key: value for key, value in settings_dict['OPTIONS'].items() if key != 'pool'}
+    modes = {
+        'none': {'ENGINE': 'django.db.backends.postgresql', 'CONN_MAX_AGE': 0, 'OPTIONS': options},
+        'persistent': {'ENGINE': 'django.db.backends.postgresql', 'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True, 'OPTIONS': options},
+        'pool': {'ENGINE': 'toDoApp.pooled_postgresql', 'CONN_MAX_AGE': 0, 'OPTIONS': {**options, 'pool': {'max_size': 1}}},
+    }
+    for mode, overrides in modes.items():
+        wrapper = load_backend(overrides['ENGINE']).DatabaseWrapper({**copy.deepcopy(settings_dict), **overrides}, f'bench_{mode}')
+        # Keeps every connection object alive so that ids are not reused.
+        opened = {}
+
+        def handle_request():
+            wrapper.close_if_unusable_or_obsolete()
+            with wrapper.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            opened.setdefault(id(wrapper.connection), wrapper.connection)
+            wrapper.close_if_unusable_or_obsolete()
+
+        try:
+            samples = measure(handle_request, args.requests, warmup=1)
+        finally:
+            wrapper.close()
+        report(mode, samples)
+        print(f"{'':<32} {len(opened)} connections opened for {args.requests + 1} requests")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Bytes per event and encode throughput of the task event encodings,
+against the previous payload: json.dumps(default=str) of the serialized
+task plus the requesting user.
+
+    python -m benchmarks.event_encoding --events 100000
+"""
+from datetime import timedelta
+import argparse
+import json
+import time
+import uuid
+
+from benchmarks.common import setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=100000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.utils import timezone
+    from toDoApp.kafka import events
+    from toDoApp.kafka.events import TaskEventV1, encode_event
+    from toDoApp.models import Category, CustomUser, Task
+    from toDoApp.serializers.task_serializer import TaskSerializer
+
+    user = CustomUser(id=uuid.uuid4(), email='bench@example.com')
+    task = Task(
+        id=123456, title='Prepare quarterly report',
+        description='Collect the numbers from every team and write the summary.',
+        due_date=timezone.now() + timedelta(days=3), priority='high',
+        category=Category(id=42, name='Work'), user=user,
+    )
+    task_data = TaskSerializer(task).data
+    event = TaskEventV1.build(task, 'created')
+
+    candidates = [
+        ('legacy json', lambda: json.dumps({'task_data': task_data, 'user_data': user}, default=str).encode('utf-8')),
+        ('task.v1 json', lambda: encode_event(TaskEventV1.name, event, 'json')[0]),
+        ('task.v1 struct', lambda: encode_event(TaskEventV1.name, event, 'struct')[0]),
+    ]
+    if events.msgpack is not None:
+        candidates.append(('task.v1 msgpack', lambda: encode_event(TaskEventV1.name, event, 'msgpack')[0]))
+
+    for label, encode in candidates:
+        size = len(encode())
+        start = time.perf_counter()
+        for _ in range(args.events):
+            encode()
+        elapsed = time.perf_counter() - start
+        print(f"{label:<18} {size:5d} bytes/event  {args.events / elapsed:12,.0f} events/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Per-request latency of POST /api/v1/tasks/ with the old per-request
+producer (build, send, flush), the shared batching producer, and the
+transactional outbox (no broker on the request path).
+
+The producer paths talk to an in-process fake broker which sleeps to
+simulate the bootstrap handshake and the flush round trip.
+
+    python -m benchmarks.kafka_producer --requests 200
+"""
+from datetime import timedelta
+from unittest.mock import patch
+import argparse
+import json
+import os
+
+from benchmarks.common import measure, report, setup_django, test_environment
+
+
+def legacy_produce_message(broker):
+    """
+    The producer path as it was before pooling: one producer per message.
+    """
+    def produce_message(topic, message, key=None, schema=''):
+        producer = broker.producer_class()(
+            value_serializer=lambda v: json.dumps(v, default=str).encode('utf-8')
+        )
+        producer.send(topic, message)
+        producer.flush()
+
+    return produce_message
+
+
+def pooled_produce_message(topic, message, key=None, schema=''):
+    """
+    enqueue() replaced by a send on the shared producer; the message goes
+    out as JSON, whatever its schema.
+    """
+    from toDoApp.kafka.producer import produce_message
+    return produce_message(topic, message, key=key)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--connect-latency', type=float, default=0.005)
+    parser.add_argument('--flush-latency', type=float, default=0.002)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.utils import timezone
+    from rest_framework.test import APIClient
+    from toDoApp.kafka import producer
+    from toDoApp.kafka.fake_broker import FakeBroker
+    from toDoApp.models import Category, CustomUser
+
+    with test_environment():
+        user = CustomUser.objects.create_superuser(email='bench@example.com', password='benchpassword')
+        category = Category.objects.create(name='Bench')
+        client = APIClient()
+        client.force_authenticate(user=user)
+        payload = {
+            'title': 'Benchmark task',
+            'description': 'Created by the producer benchmark',
+            'due_date': (timezone.now() + timedelta(days=1)).isoformat(),
+            'priority': 'medium',
+            'category': category.id,
+        }
+
+        def post():
+            response = client.post('/api/v1/tasks/', payload)
+            assert response.status_code == 200, response.content
+
+        broker = FakeBroker(connect_latency=args.connect_latency, flush_latency=args.flush_latency)
+        with patch('toDoApp.views.enqueue', legacy_produce_message(broker)):
+            report('per-request producer', measure(post, args.requests))
+        print(f"  broker connections: {broker.connections}")
+
+        broker = FakeBroker(connect_latency=args.connect_latency, flush_latency=args.flush_latency)
+        with patch.dict(os.environ, {'KAFKA_BOOTSTRAP_SERVER': 'fake:9092'}), \
+                patch.object(producer, 'KafkaProducer', broker.producer_class()), \
+                patch('toDoApp.views.enqueue', pooled_produce_message):
+            producer.reset_producer()
+            report('pooled producer', measure(post, args.requests))
+            producer.close_producer()
+        print(f"  broker connections: {broker.connections}")
+
+        report('transactional outbox', measure(post, args.requests))
+
+
+if __name__ == '__main__':
+    main()
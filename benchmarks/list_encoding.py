@@ -0,0 +1,74 @@
+"""
+Rows per second and peak memory of encoding a page of tasks with
+TaskSerializer(many=True) plus get_paginated_response(), as TaskList did,
+and with RowEncoder plus get_paginated_data(). Both include fetching the
+page from the database.
+
+    python -m benchmarks.list_encoding --rows 10000
+"""
+import argparse
+import statistics
+import tracemalloc
+
+from benchmarks.common import measure, report, setup_django, test_environment
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from io import StringIO
+    from django.core.management import call_command
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from toDoApp.models import Task
+    from toDoApp.pagination import PageNumberPagination
+    from toDoApp.serializers.row_encoder import RowEncoder
+    from toDoApp.serializers.task_serializer import TaskSerializer
+
+    with test_environment():
+        call_command('seed_data', users=20, categories=20, tasks=args.rows, random_seed=0, stdout=StringIO(), stderr=StringIO())
+        request = Request(APIRequestFactory().get('/api/v1/tasks/'))
+        queryset = Task.objects.order_by('due_date')
+        encoder = RowEncoder(TaskSerializer)
+
+        def paginator():
+            pagination = PageNumberPagination()
+            pagination.page_size = args.rows
+            return pagination
+
+        def serializer_page():
+            pagination = paginator()
+            page = pagination.paginate_queryset(queryset, request)
+            return pagination.get_paginated_response(TaskSerializer(page, many=True).data).data
+
+        def encoder_page():
+            pagination = paginator()
+            page = pagination.paginate_queryset(encoder.rows(queryset), request)
+            return pagination.get_paginated_data(encoder.encode(page))
+
+        assert serializer_page() == encoder_page()
+        for label, fn in [('TaskSerializer', serializer_page), ('RowEncoder', encoder_page)]:
+            samples = measure(fn, args.iterations, warmup=2)
+            report(label, samples)
+            print(
+                f"{'':<32} {args.rows / statistics.mean(samples):,.0f} rows/s, "
+                f"peak {peak_memory(fn) / 2 ** 20:.1f} MiB"
+            )
+
+
+if __name__ == '__main__':
+    main()
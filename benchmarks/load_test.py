@@ -0,0 +1,130 @@
+"""
+Requests per second and latency percentiles of running servers under many
+concurrent keep-alive clients, to compare the sync (gunicorn) and async
+(ASYNC_API, uvicorn workers) deployments of the same code.
+
+Start both deployments against the same database and cache, e.g.
+
+    gunicorn --config gunicorn_config.py --bind 0.0.0.0:8000
+    ASYNC_API=true gunicorn --config gunicorn_config.py --bind 0.0.0.0:8001
+
+then point the load at both:
+
+    python -m benchmarks.load_test --token "$ACCESS_TOKEN" --concurrency 256 \\
+        --url http://localhost:8000/api/v1/tasks/ --url http://localhost:8001/api/v1/tasks/
+
+Unlike the other scripts this does not set up Django; it only speaks HTTP.
+"""
+from urllib.parse import urlsplit
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import report
+
+
+class Connection:
+    """
+    A minimal HTTP/1.1 keep-alive client; reconnects when the server closes.
+    """
+
+    def __init__(self, url, token):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.netloc = parts.netloc
+        self.token = token
+        self.request = self.build('GET', parts.path + (f'?{parts.query}' if parts.query else ''))
+        self.reader = self.writer = None
+
+    def build(self, method, path, body=None):
+        """
+        Encode a request for path on this connection's server; body is
+        sent as JSON.
+        """
+        headers = [f'{method} {path} HTTP/1.1', f'Host: {self.netloc}', 'Accept: application/json']
+        if self.token:
+            headers.append(f'Authorization: Bearer {self.token}')
+        payload = b''
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers += ['Content-Type: application/json', f'Content-Length: {len(payload)}']
+        return ('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + payload
+
+    async def send(self, request=None):
+        """
+        Send a request built by build(), by default a GET of the URL, and
+        return the response status and body.
+        """
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(request or self.request)
+        await self.writer.drain()
+
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split()[1])
+        headers = dict(line.lower().split(': ', 1) for line in lines[1:] if ': ' in line)
+
+        if 'content-length' in headers:
+            body = await self.reader.readexactly(int(headers['content-length']))
+        else:
+            body = await self.reader.read()
+            headers['connection'] = 'close'
+
+        if headers.get('connection') == 'close':
+            self.close()
+        return status, body
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def run(url, token, concurrency, total):
+    remaining = total
+    samples, errors = [], 0
+
+    async def worker():
+        nonlocal remaining, errors
+        connection = Connection(url, token)
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                status, _ = await connection.send()
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                connection.close()
+                errors += 1
+                continue
+            samples.append(time.perf_counter() - start)
+            if status >= 400:
+                errors += 1
+        connection.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, errors, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', action='append', required=True, help="Repeat to compare several servers.")
+    parser.add_argument('--token', default='', help="JWT access token sent as a Bearer token.")
+    parser.add_argument('--concurrency', type=int, default=256)
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--warmup', type=int, default=200)
+    args = parser.parse_args()
+
+    for url in args.url:
+        asyncio.run(run(url, args.token, min(args.concurrency, args.warmup), args.warmup))
+        samples, errors, elapsed = asyncio.run(run(url, args.token, args.concurrency, args.requests))
+        print(f"{url}: {len(samples) / elapsed:.0f} req/s, {errors} errors, concurrency {args.concurrency}")
+        if samples:
+            report('  latency', samples)
+
+
+if __name__ == '__main__':
+    main()
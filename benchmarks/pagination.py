@@ -0,0 +1,84 @@
+"""
+Latency of fetching page N of GET /api/v1/tasks/ with page-number
+(COUNT + OFFSET) and keyset (cursor) pagination over a large table, a
+tenth of it without a due date. Cursor pages should cost the same at every
+depth; the last lines give each one's median relative to the first page.
+
+    python -m benchmarks.pagination --tasks 200000 --pages 1 100 1000 10000
+"""
+from datetime import timedelta
+import argparse
+import random
+
+from benchmarks.common import measure, percentile, report, setup_django, test_environment
+
+
+def seed(count, user, category, undated=0.1, batch_size=10000):
+    from django.utils import timezone
+    from toDoApp.models import Task
+
+    now = timezone.now()
+    for start in range(0, count, batch_size):
+        Task.objects.bulk_create([
+            Task(
+                title=f'Task {i}',
+                due_date=None if random.random() < undated else now + timedelta(minutes=random.randrange(60 * 24 * 365)),
+                category=category,
+                user=user,
+            )
+            for i in range(start, min(start + batch_size, count))
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tasks', type=int, default=200000)
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 100, 1000, 10000])
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework.test import APIClient
+    from toDoApp.models import Category, CustomUser
+
+    with test_environment():
+        user = CustomUser.objects.create_superuser(email='bench@example.com', password='benchpassword')
+        category = Category.objects.create(name='Bench')
+        seed(args.tasks, user, category)
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        # Walk the cursor links once to find the cursor of every requested page.
+        cursors, url, page = {}, '/api/v1/tasks/?pagination=cursor', 1
+        while url and page <= max(args.pages):
+            if page in args.pages:
+                cursors[page] = url
+            url = client.get(url).data['data']['next']
+            page += 1
+
+        cursor_medians = {}
+        for page in args.pages:
+            if page not in cursors:
+                print(f"page {page}: beyond the end of {args.tasks} tasks")
+                continue
+
+            def by_number():
+                assert client.get(f'/api/v1/tasks/?page={page}').status_code == 200
+
+            def by_cursor():
+                assert client.get(cursors[page]).status_code == 200
+
+            report(f'page {page} (page number)', measure(by_number, args.iterations, warmup=1))
+            samples = measure(by_cursor, args.iterations, warmup=1)
+            report(f'page {page} (cursor)', samples)
+            cursor_medians[page] = percentile(samples, 50)
+
+        first = cursor_medians[min(cursor_medians)]
+        for page, median in cursor_medians.items():
+            print(f"page {page} (cursor) / page {min(cursor_medians)}: {median / first:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Throughput of rendering and parsing a large page of tasks with DRF's
+JSONRenderer/JSONParser, ORJSONRenderer/ORJSONParser and
+MessagePackRenderer/MessagePackParser.
+
+    python -m benchmarks.renderers --rows 10000
+"""
+import argparse
+import statistics
+import io
+
+from benchmarks.common import measure, report, setup_django, test_environment
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.management import call_command
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from toDoApp.models import Task
+    from toDoApp.parsers import MessagePackParser, ORJSONParser
+    from toDoApp.renderers import MessagePackRenderer, ORJSONRenderer
+    from toDoApp.serializers.row_encoder import RowEncoder
+    from toDoApp.serializers.task_serializer import TaskSerializer
+
+    with test_environment():
+        call_command('seed_data', users=20, categories=20, tasks=args.rows, random_seed=0, stdout=io.StringIO(), stderr=io.StringIO())
+        encoder = RowEncoder(TaskSerializer)
+        results = encoder.encode(encoder.rows(Task.objects.order_by('due_date')))
+        data = {
+            'success': True,
+            'message': "Tasks retrieved successfully.",
+            'data': {'count': len(results), 'next': None, 'previous': None, 'results': results},
+        }
+
+        for renderer, body_parser in [
+            (JSONRenderer(), JSONParser()),
+            (ORJSONRenderer(), ORJSONParser()),
+            (MessagePackRenderer(), MessagePackParser()),
+        ]:
+            body = renderer.render(data)
+            name = type(renderer).__name__
+            for label, fn in [
+                (f'render {name}', lambda: renderer.render(data)),
+                (f'parse {type(body_parser).__name__}', lambda: body_parser.parse(io.BytesIO(body))),
+            ]:
+                samples = measure(fn, args.iterations, warmup=2)
+                report(label, samples)
+                seconds = statistics.mean(samples)
+                print(f"{'':<32} {len(body) / 2 ** 20 / seconds:,.0f} MiB/s, {args.rows / seconds:,.0f} rows/s, body {len(body) / 2 ** 20:.2f} MiB")
+
+
+if __name__ == '__main__':
+    main()
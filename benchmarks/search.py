@@ -0,0 +1,60 @@
+"""
+Latency of GET /api/v1/tasks/ searching with the icontains title filter
+against the search parameter (pg_trgm on PostgreSQL, icontains elsewhere).
+
+    python -m benchmarks.search --tasks 200000
+"""
+import argparse
+import random
+
+from benchmarks.common import measure, report, setup_django, test_environment
+
+WORDS = (
+    'report budget meeting invoice review deploy release design hiring '
+    'planning audit migration backup roadmap onboarding renewal'
+).split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tasks', type=int, default=200000)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--term', default='invoice')
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db import connection
+    from rest_framework.test import APIClient
+    from toDoApp.models import Category, CustomUser, Task
+
+    with test_environment():
+        user = CustomUser.objects.create_superuser(email='bench@example.com', password='benchpassword')
+        category = Category.objects.create(name='Bench')
+        for start in range(0, args.tasks, 10000):
+            Task.objects.bulk_create([
+                Task(
+                    title=' '.join(random.sample(WORDS, 3)),
+                    description=' '.join(random.choices(WORDS, k=12)),
+                    category=category,
+                    user=user,
+                )
+                for _ in range(start, min(start + 10000, args.tasks))
+            ])
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE "toDoApp_task"')
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+        print(f"{args.tasks} tasks on {connection.vendor}")
+
+        for label, url in [
+            ('title icontains', f'/api/v1/tasks/?title={args.term}'),
+            ('search', f'/api/v1/tasks/?search={args.term}'),
+        ]:
+            report(label, measure(lambda: client.get(url), args.iterations, warmup=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""
+Throughput and latency percentiles of the task endpoints (list, detail,
+create, filter), checked against a stored baseline so that performance
+regressions fail loudly.
+
+By default every scenario runs in process, through the Django test client,
+against a throwaway database filled by ``manage.py seed_data``:
+
+    python -m benchmarks.suite --tasks 100000 --baseline benchmarks/baseline.json
+
+With --url, virtual users instead run a weighted mix of the scenarios
+against a running server over keep-alive connections for --duration
+seconds, like a locust run. The server needs data (run seed_data there);
+create inserts real tasks, and needs an employer's token:
+
+    python -m benchmarks.suite --url http://localhost:8000 --token "$ACCESS_TOKEN" --concurrency 64
+
+--save writes the results as JSON; saving to benchmarks/baseline.json
+records a new baseline. The exit status is 1 when a scenario's p95 is more
+than --tolerance above the baseline's, or its throughput more than
+--tolerance below. Baselines only compare with runs of the same mode,
+database and data size, so record one per environment.
+"""
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import urllib.request
+import argparse
+import asyncio
+import random
+import json
+import time
+import sys
+import io
+
+from benchmarks.common import measure, percentile, report, setup_django, test_environment
+from benchmarks.load_test import Connection
+
+TASKS_URL = '/api/v1/tasks/'
+SCENARIOS = ('list', 'detail', 'create', 'filter')
+# Share of the requests of each scenario in the --url mix.
+WEIGHTS = {'list': 40, 'detail': 35, 'create': 10, 'filter': 15}
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+
+def summarize(samples, elapsed, errors=0):
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'throughput': round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        'p50': round(percentile(samples, 50) * 1000, 3),
+        'p95': round(percentile(samples, 95) * 1000, 3),
+        'p99': round(percentile(samples, 99) * 1000, 3),
+    }
+
+
+def new_task(category_ids):
+    return {
+        'title': 'Benchmark task',
+        'description': 'Created by benchmarks.suite',
+        'due_date': (datetime.now(timezone.utc) + timedelta(days=random.randrange(1, 60))).isoformat(),
+        'priority': random.choice(['low', 'medium', 'high']),
+        'category': random.choice(category_ids),
+    }
+
+
+def run_in_process(args, scenarios):
+    from django.core.management import call_command
+    from django.db import connection
+    from rest_framework.test import APIClient
+    from toDoApp.authentication import UserRefreshToken
+    from toDoApp.models import Category, Employer, Task
+
+    call_command(
+        'seed_data', users=args.users, categories=args.categories, tasks=args.tasks,
+        random_seed=args.random_seed, stdout=io.StringIO(), stderr=io.StringIO(),
+    )
+    employer = Employer.objects.create_user(email='bench@example.com', password='benchpassword')
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {UserRefreshToken.for_user(employer).access_token}')
+
+    task_ids = list(Task.objects.values_list('id', flat=True)[:10000])
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    requests = {
+        'list': lambda: client.get(TASKS_URL),
+        'detail': lambda: client.get(f'{TASKS_URL}{random.choice(task_ids)}/'),
+        'create': lambda: client.post(TASKS_URL, new_task(category_ids), format='json'),
+        'filter': lambda: client.get(
+            TASKS_URL, {'is_completed': 'false', 'priority': 'high', 'category': random.choice(category_ids)}
+        ),
+    }
+
+    for name in scenarios:
+        response = requests[name]()
+        if response.status_code >= 400:
+            raise SystemExit(f"{name}: HTTP {response.status_code} {response.content[:200]!r}")
+
+    results = {}
+    for name in scenarios:
+        samples = measure(requests[name], args.iterations, warmup=args.warmup)
+        report(name, samples)
+        results[name] = summarize(samples, sum(samples))
+    environment = {'mode': 'in-process', 'database': connection.vendor, 'tasks': args.tasks}
+    return environment, results
+
+
+def fetch_json(url, token):
+    request = urllib.request.Request(url, headers={'Accept': 'application/json', 'Authorization': f'Bearer {token}'})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.load(response)
+
+
+async def run_mix(args, scenarios, task_ids, category_ids):
+    deadline = time.perf_counter() + args.duration
+    names = list(scenarios)
+    weights = [WEIGHTS[name] for name in names]
+    samples = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+
+    async def virtual_user():
+        connection = Connection(args.url, args.token)
+        paths = {
+            'list': lambda: connection.build('GET', TASKS_URL),
+            'detail': lambda: connection.build('GET', f'{TASKS_URL}{random.choice(task_ids)}/'),
+            'create': lambda: connection.build('POST', TASKS_URL, new_task(category_ids)),
+            'filter': lambda: connection.build(
+                'GET', f'{TASKS_URL}?is_completed=false&priority=high&category={random.choice(category_ids)}'
+            ),
+        }
+        while time.perf_counter() < deadline:
+            name = random.choices(names, weights)[0]
+            request = paths[name]()
+            start = time.perf_counter()
+            try:
+                status, _ = await connection.send(request)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                connection.close()
+                errors[name] += 1
+                continue
+            samples[name].append(time.perf_counter() - start)
+            if status >= 400:
+                errors[name] += 1
+        connection.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user() for _ in range(args.concurrency)))
+    return samples, errors, time.perf_counter() - start
+
+
+def run_http(args, scenarios):
+    page = fetch_json(args.url.rstrip('/') + TASKS_URL, args.token)['data']['results']
+    if not page:
+        raise SystemExit("The server has no tasks; run manage.py seed_data there first.")
+    task_ids = [task['id'] for task in page]
+    category_ids = sorted({task['category'] for task in page})
+
+    samples, errors, elapsed = asyncio.run(run_mix(args, scenarios, task_ids, category_ids))
+    results = {}
+    for name in scenarios:
+        if samples[name]:
+            report(name, samples[name])
+            # Each scenario's share of the mix's requests per second.
+            results[name] = summarize(samples[name], elapsed, errors[name])
+    total = sum(len(values) for values in samples.values())
+    print(f"{total / elapsed:.0f} req/s in total, concurrency {args.concurrency}")
+    environment = {'mode': 'http', 'url': args.url, 'concurrency': args.concurrency}
+    return environment, results
+
+
+def compare(environment, results, baseline, tolerance):
+    """
+    Print the change of every scenario against the baseline and return the
+    names of those that regressed.
+    """
+    if baseline.get('environment') != environment:
+        print(f"Warning: baseline environment {baseline.get('environment')} differs from {environment}.")
+
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if previous is None:
+            print(f"{name:<10} not in the baseline")
+            continue
+        p95_change = result['p95'] / previous['p95'] - 1 if previous['p95'] else 0.0
+        throughput_change = result['throughput'] / previous['throughput'] - 1 if previous['throughput'] else 0.0
+        regressed = p95_change > tolerance or throughput_change < -tolerance
+        print(
+            f"{name:<10} p95 {previous['p95']:8.3f} -> {result['p95']:8.3f}ms ({p95_change:+.0%})  "
+            f"throughput {previous['throughput']:8.1f} -> {result['throughput']:8.1f}/s ({throughput_change:+.0%})"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS, help="Repeat to run several; default all.")
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--categories', type=int, default=50)
+    parser.add_argument('--tasks', type=int, default=20000)
+    parser.add_argument('--random-seed', type=int, default=0)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--url', help="Run the mix against this server instead of in process.")
+    parser.add_argument('--token', default='', help="JWT access token sent as a Bearer token.")
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--baseline', type=Path, help=f"Compare with this file, e.g. {DEFAULT_BASELINE.name}.")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--save', type=Path, help="Write the results to this file.")
+    args = parser.parse_args()
+    scenarios = args.scenario or SCENARIOS
+
+    if args.url:
+        environment, results = run_http(args, scenarios)
+    else:
+        setup_django()
+        with test_environment():
+            environment, results = run_in_process(args, scenarios)
+
+    if args.save:
+        args.save.write_text(json.dumps({'environment': environment, 'scenarios': results}, indent=2) + '\n')
+    if args.baseline:
+        regressions = compare(environment, results, json.loads(args.baseline.read_text()), args.tolerance)
+        if regressions:
+            print(f"Regressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,51 @@
+import os
+
 workers = 4
 bind = "0.0.0.0:8000"
-module = "todo.wsgi:application"
\ No newline at end of file
+module = "todo.wsgi:application"
+wsgi_app = "todo.wsgi:application"
+
+# With ASYNC_API set, serve the ASGI application from uvicorn workers so the
+# async views in toDoApp/async_views.py run on an event loop.
+if os.getenv('ASYNC_API', '').lower() in ('1', 'true'):
+    worker_class = "uvicorn.workers.UvicornWorker"
+    wsgi_app = "todo.asgi:application"
+
+
+def on_starting(server):
+    # Samples of a previous run would otherwise be added to this one's.
+    directory = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+
+
+def when_ready(server):
+    # Every worker thread may hold a connection (see DB_CONNECTION_MODE in
+    # todo/settings.py); keep this under Postgres' max_connections.
+    server.log.info(
+        "Up to %d database connections: %d workers x %d threads",
+        server.cfg.workers * server.cfg.threads, server.cfg.workers, server.cfg.threads,
+    )
+
+
+def post_fork(server, worker):
+    # A pooled worker needs no more connections than it has threads; set
+    # before the worker loads the settings.
+    os.environ.setdefault('DB_POOL_SIZE', str(server.cfg.threads))
+    # Each worker builds its own Kafka producer lazily on first use.
+    from toDoApp.kafka.producer import reset_producer
+    reset_producer()
+
+
+def worker_exit(server, worker):
+    from toDoApp.kafka.producer import close_producer
+    close_producer()
+
+
+def child_exit(server, worker):
+    # Lets /metrics drop the exited worker's live gauges; counters are kept.
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
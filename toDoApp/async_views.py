@@ -0,0 +1,237 @@
+"""
+Async versions of the task and category views, served instead of the ones in
+toDoApp.views when ASYNC_API is set (see async_urls.py and gunicorn_config.py).
+
+They reuse the sync views' configuration and helpers; only the handlers
+change, reading through the async ORM and the asyncio cache client. Writes
+that need a transaction (the task row and its outbox event) still run as
+one sync function in a thread, since a transaction cannot span awaits.
+"""
+from asgiref.sync import sync_to_async
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.response import Response
+
+from django.conf import settings
+
+from toDoApp import views
+from toDoApp.cache import category_cache, task_cache, task_list_cache, tagged
+from toDoApp.categories import category_registry
+from toDoApp.models import Category, Task
+from toDoApp.pagination import AsyncPageNumberPagination
+
+
+class AsyncAPIView(views.BaseAPIView):
+    """
+    A BaseAPIView whose handlers are coroutines.
+
+    DRF's dispatch is synchronous, so authentication, permission checks and
+    throttling, which may query the database, run in a thread; the handler
+    itself runs on the event loop.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if not isinstance(response, Response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def afilter_queryset(self, queryset):
+        # Filtersets validate in sync code that may query (ModelChoiceFilter).
+        return await sync_to_async(self.filter_queryset)(queryset)
+
+    async def acached_success_response(self, query_cache, params, compute, message="Success", scope=None):
+        """
+        cached_success_response() for a coroutine function compute.
+        """
+        async def compute_tagged():
+            return tagged(await compute())
+
+        entry = await query_cache.aget_or_set(params, compute_tagged, scope=scope)
+        return self.etag_response(entry, message)
+
+    async def category_context(self, request, items):
+        """
+        Serializer context with the categories the items refer to, looked
+        up front so validating a task makes no sync query or cache read.
+        """
+        categories = await sync_to_async(category_registry.in_bulk)(views.item_ids(items, 'category'))
+        return {'request': request, 'categories': categories}
+
+
+class TaskList(AsyncAPIView, views.TaskList):
+
+    pagination_class = AsyncPageNumberPagination
+
+    @extend_schema(operation_id="get_all_tasks", parameters=views.TASK_LIST_PARAMETERS)
+    async def get(self, request, *args, **kwargs):
+        self.observe_page_depth()
+        try:
+            if settings.TASK_CACHE_ENABLED:
+                params = {'_host': request.get_host(), '_user': request.user.pk, **dict(request.query_params.lists())}
+                return await self.acached_success_response(task_list_cache, params, self.alist_tasks, message="Tasks retrieved successfully.")
+            return self.success_response(data=await self.alist_tasks(), message="Tasks retrieved successfully.")
+        except Exception as e:
+            return self.bad_request_response(errors=str(e), message="Failed to retrieve tasks.")
+
+    async def alist_tasks(self):
+        tasks = self.row_encoder.rows(await self.afilter_queryset(self.queryset))
+        page_tasks = await self.paginator.apaginate_queryset(tasks, self.request, view=self)
+        return self.get_paginated_data(self.row_encoder.encode(page_tasks))
+
+    @extend_schema(operation_id="create_task")
+    async def post(self, request, *args, **kwargs):
+        try:
+            context = await self.category_context(request, [request.data])
+            serializer = self.serializer_class(data=request.data, context=context)
+            if serializer.is_valid():
+                await sync_to_async(self.create_task)(serializer)
+                return self.success_response(data=serializer.data, message="Task created successfully.")
+            return self.bad_request_response(errors=serializer.errors, message="Failed to create task.")
+        except Exception as e:
+            return self.bad_request_response(errors=str(e), message="Failed to create task.")
+
+
+class TaskDetail(AsyncAPIView, views.TaskDetail):
+
+    @extend_schema(operation_id="retrieve_task")
+    async def get(self, request, pk, *args, **kwargs):
+        try:
+            if settings.TASK_CACHE_ENABLED:
+                return await self.acached_success_response(task_cache, {}, lambda: self.aretrieve_task(pk), message="Task retrieved successfully.", scope=pk)
+            return self.success_response(data=await self.aretrieve_task(pk), message="Task retrieved successfully.")
+        except Task.DoesNotExist:
+            return self.bad_request_response(message="Task not found.", status_code=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return self.bad_request_response(errors=str(e), message="Failed to retrieve task.")
+
+    async def aretrieve_task(self, pk):
+        task = await self.queryset.aget(pk=pk)
+        return self.serializer_class(task).data
+
+    async def aupdate(self, request, pk, partial):
+        try:
+            task = await self.queryset.aget(pk=pk)
+            context = await self.category_context(request, [request.data])
+            serializer = self.serializer_class(task, data=request.data, partial=partial, context=context)
+            if serializer.is_valid():
+                await sync_to_async(self.update_task)(serializer)
+                return self.success_response(data=serializer.data, message="Task updated successfully.")
+            return self.bad_request_response(errors=serializer.errors, message="Failed to update task.")
+        except Task.DoesNotExist:
+            return self.bad_request_response(message="Task not found.", status_code=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return self.bad_request_response(errors=str(e), message="Failed to update task.")
+
+    @extend_schema(operation_id="update_task")
+    async def put(self, request, pk, *args, **kwargs):
+        return await self.aupdate(request, pk, partial=False)
+
+    @extend_schema(operation_id="update_task_partial")
+    async def patch(self, request, pk, *args, **kwargs):
+        return await self.aupdate(request, pk, partial=True)
+
+    @extend_schema(operation_id="delete_task")
+    async def delete(self, request, pk, *args, **kwargs):
+        try:
+            task = await self.queryset.aget(pk=pk)
+            await sync_to_async(self.delete_task)(task)
+            return self.success_response(message="Task deleted successfully.")
+        except Task.DoesNotExist:
+            return self.bad_request_response(message="Task not found.", status_code=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return self.bad_request_response(errors=str(e), message="Failed to delete task.")
+
+
+class CategoryList(AsyncAPIView, views.CategoryList):
+
+    pagination_class = AsyncPageNumberPagination
+
+    @extend_schema(operation_id="get_all_categories", parameters=views.CATEGORY_LIST_PARAMETERS)
+    async def get(self, request, *args, **kwargs):
+        self.observe_page_depth()
+        try:
+            params = {'_host': request.get_host(), **dict(request.query_params.lists())}
+            data = await category_cache.aget_or_set(params, self.alist_categories)
+            return self.success_response(data=data, message="Categories retrieved successfully.")
+        except Exception as e:
+            return self.bad_request_response(errors=str(e), message="Failed to retrieve categories.")
+
+    async def alist_categories(self):
+        categories = self.row_encoder.rows(await self.afilter_queryset(self.queryset))
+        page_categories = await self.paginator.apaginate_queryset(categories, self.request, view=self)
+        return self.get_paginated_data(self.row_encoder.encode(page_categories))
+
+    @extend_schema(operation_id="create_category")
+    async def post(self, request, *args, **kwargs):
+        try:
+            serializer = self.serializer_class(data=request.data)
+            # validate_name() checks uniqueness against the registry, which may query.
+            if await sync_to_async(serializer.is_valid)():
+                await sync_to_async(serializer.save)()
+                return self.success_response(data=serializer.data, message="Category created successfully.")
+            return self.bad_request_response(errors=serializer.errors, message="Failed to create category.")
+        except Exception as e:
+            return self.bad_request_response(errors=str(e), message="Failed to create category.")
+
+
+class CategoryDetail(AsyncAPIView, views.CategoryDetail):
+
+    @extend_schema(operation_id="retrieve_category")
+    async def get(self, request, pk, *args, **kwargs):
+        try:
+            category = await self.queryset.aget(pk=pk)
+            serializer = self.serializer_class(category)
+            return self.success_response(data=serializer.data, message="Category retrieved successfully.")
+        except Category.DoesNotExist:
+            return self.bad_request_response(message="Category not found.", status_code=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return self.bad_request_response(errors=str(e), message="Failed to retrieve category.")
+
+    async def aupdate(self, request, pk, partial):
+        try:
+            category = await self.queryset.aget(pk=pk)
+            serializer = self.serializer_class(category, data=request.data, partial=partial)
+            if await sync_to_async(serializer.is_valid)():
+                await sync_to_async(serializer.save)()
+                return self.success_response(data=serializer.data, message="Category updated successfully.")
+            return self.bad_request_response(errors=serializer.errors, message="Failed to update category.")
+        except Category.DoesNotExist:
+            return self.bad_request_response(message="Category not found.", status_code=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return self.bad_request_response(errors=str(e), message="Failed to update category.")
+
+    @extend_schema(operation_id="update_category")
+    async def put(self, request, pk, *args, **kwargs):
+        return await self.aupdate(request, pk, partial=False)
+
+    @extend_schema(operation_id="update_category_partial")
+    async def patch(self, request, pk, *args, **kwargs):
+        return await self.aupdate(request, pk, partial=True)
+
+    @extend_schema(operation_id="delete_category")
+    async def delete(self, request, pk, *args, **kwargs):
+        try:
+            category = await self.queryset.aget(pk=pk)
+            await category.adelete()
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        except Category.DoesNotExist:
+            return self.bad_request_response(message="Category not found.", status_code=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return self.bad_request_response(errors=str(e), message="Failed to delete category.")
@@ -0,0 +1,222 @@
+"""
+JWT authentication without a user query per request.
+
+Access tokens carry the user's role, active and superuser flags and
+auth_version. StatelessJWTAuthentication trusts those claims while the
+token's auth_version matches the one published in the shared cache, and
+returns a ClaimsUser built from them; otherwise (an older token, or the
+version is not cached) it reads the row like JWTAuthentication.
+
+CustomUser.save() bumps auth_version when a claimed field changes and the
+post_save receiver in toDoApp/signals.py publishes it. Changes made with
+queryset.update() bypass both. Permissions are not claims: ClaimsUser checks
+them through the authentication backends, whose cache is versioned
+separately.
+"""
+from collections import OrderedDict
+import threading
+import copy
+import time
+
+from django.conf import settings
+from django.contrib import auth
+from django.utils.functional import cached_property
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from toDoApp.cache import CACHE_ERRORS, cache_available, cache_failed, timed_cache
+from toDoApp.models import CustomUser
+from toDoApp.replicas import primary
+
+# Long enough to outlive every access token issued for a version.
+AUTH_VERSION_TIMEOUT = 24 * 60 * 60
+
+
+def auth_version_key(pk):
+    return f'auth:{pk}:version'
+
+
+def current_auth_version(pk):
+    """
+    Return the published auth_version of a user, or None if unknown.
+    """
+    if not cache_available():
+        return None
+    try:
+        return timed_cache.get(auth_version_key(pk))
+    except CACHE_ERRORS:
+        cache_failed()
+        return None
+
+
+def publish_auth_version(user, replace=True):
+    """
+    Publish the auth_version of a user row. With replace=False it is only
+    stored if none is, so a row read before a concurrent save cannot
+    overwrite the newer version.
+    """
+    if not cache_available():
+        return
+    try:
+        if replace:
+            timed_cache.set(auth_version_key(user.pk), user.auth_version, AUTH_VERSION_TIMEOUT)
+        else:
+            timed_cache.add(auth_version_key(user.pk), user.auth_version, AUTH_VERSION_TIMEOUT)
+    except CACHE_ERRORS:
+        cache_failed()
+
+
+def forget_auth_version(pk):
+    """
+    Drop the published auth_version of a deleted user, so their tokens fall
+    back to the row lookup, which rejects them.
+    """
+    if not cache_available():
+        return
+    try:
+        timed_cache.delete(auth_version_key(pk))
+    except CACHE_ERRORS:
+        cache_failed()
+
+
+def set_user_claims(token, user):
+    token['role'] = user.role
+    token['is_active'] = user.is_active
+    token['is_superuser'] = user.is_superuser
+    token['is_staff'] = user.is_staff
+    token['auth_version'] = user.auth_version
+
+
+class UserRefreshToken(RefreshToken):
+    """
+    A refresh token whose access tokens carry the user's claims.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        set_user_claims(token, user)
+        return token
+
+
+class UserRowCache:
+    """
+    A small per-process LRU of user rows for the views that need a full
+    CustomUser. Rows expire after ttl seconds and are keyed by auth_version,
+    so a row is reloaded once the token shows a newer version.
+    """
+
+    def __init__(self, maxsize=1024, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._rows = OrderedDict()
+
+    def get(self, pk, version):
+        with self._lock:
+            entry = self._rows.get(pk)
+            if entry is not None and entry[0] == version and entry[1] > time.monotonic():
+                self._rows.move_to_end(pk)
+                # A copy, so one request's changes don't leak into another's.
+                return copy.copy(entry[2])
+
+        user = CustomUser.objects.get(pk=pk)
+        self.put(user)
+        return user
+
+    def put(self, user):
+        with self._lock:
+            self._rows[str(user.pk)] = (user.auth_version, time.monotonic() + self.ttl, copy.copy(user))
+            self._rows.move_to_end(str(user.pk))
+            while len(self._rows) > self.maxsize:
+                self._rows.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+
+
+user_rows = UserRowCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL)
+
+
+class ClaimsUser(TokenUser):
+    """
+    The user of a request authenticated by StatelessJWTAuthentication, built
+    from the token's claims. The full row is loaded on first access to
+    instance.
+    """
+
+    def __getattr__(self, attr):
+        # TokenUser answers unknown attributes from the claims; private ones,
+        # like the backends' _perm_cache, must stay unset until assigned.
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return super().__getattr__(attr)
+
+    @cached_property
+    def is_active(self):
+        return self.token.get('is_active', True)
+
+    @cached_property
+    def role(self):
+        return self.token.get('role')
+
+    @cached_property
+    def auth_version(self):
+        return self.token.get('auth_version')
+
+    @cached_property
+    def instance(self):
+        return user_rows.get(self.pk, self.auth_version)
+
+    def get_all_permissions(self, obj=None):
+        permissions = set()
+        for backend in auth.get_backends():
+            if hasattr(backend, 'get_all_permissions'):
+                permissions.update(backend.get_all_permissions(self, obj))
+        return permissions
+
+    def has_perm(self, perm, obj=None):
+        if self.is_active and self.is_superuser:
+            return True
+        return any(backend.has_perm(self, perm, obj) for backend in auth.get_backends() if hasattr(backend, 'has_perm'))
+
+    def has_perms(self, perm_list, obj=None):
+        return all(self.has_perm(perm, obj) for perm in perm_list)
+
+    def has_module_perms(self, app_label):
+        if self.is_active and self.is_superuser:
+            return True
+        return any(
+            backend.has_module_perms(self, app_label) for backend in auth.get_backends() if hasattr(backend, 'has_module_perms')
+        )
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that returns a ClaimsUser instead of querying the user
+    while the token's auth_version is current.
+    """
+
+    def get_user(self, validated_token):
+        version = validated_token.get('auth_version')
+        if version is not None and validated_token.get('is_active', True):
+            user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+            if user_id is not None and version == current_auth_version(user_id):
+                return ClaimsUser(validated_token)
+
+        # From the primary: the row fills the shared version key and the
+        # row cache, which a lagging replica could fill with old claims.
+        with primary():
+            user = super().get_user(validated_token)
+        publish_auth_version(user, replace=False)
+        user_rows.put(user)
+        return user
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    # The same bearer scheme in the OpenAPI schema.
+    target_class = StatelessJWTAuthentication
@@ -0,0 +1,26 @@
+from django.contrib.auth.backends import ModelBackend
+
+from toDoApp.authentication import ClaimsUser
+from toDoApp.cache import permission_cache
+
+
+class CachedPermissionBackend(ModelBackend):
+    """
+    ModelBackend that keeps each user's resolved permissions in the shared
+    cache, so DjangoModelPermissions checks don't query user and group
+    permissions on every request.
+
+    Entries are invalidated by version bumps from the m2m_changed and
+    post_save/post_delete receivers in toDoApp/signals.py.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, '_perm_cache'):
+            # ModelBackend's queries need the row behind a token's claims.
+            user = user_obj.instance if isinstance(user_obj, ClaimsUser) else user_obj
+            user_obj._perm_cache = permission_cache.get_or_set(
+                user_obj.pk, lambda: super(CachedPermissionBackend, self).get_all_permissions(user),
+            )
+        return user_obj._perm_cache
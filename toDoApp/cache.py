@@ -0,0 +1,479 @@
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.serializers.json import DjangoJSONEncoder
+from django_redis.cache import RedisCache
+from django_redis.exceptions import ConnectionInterrupted
+from redis import asyncio as aioredis
+from redis.exceptions import ConnectionError, TimeoutError
+from urllib.parse import urlencode
+import threading
+import asyncio
+import weakref
+import hashlib
+import logging
+import json
+import time
+
+from toDoApp.metrics import cache_counters
+from toDoApp.replicas import primary
+from toDoApp.timing import timed
+
+logger = logging.getLogger('toDoApp')
+
+# Raised by the cache backend when Redis is unreachable; the cache is then
+# skipped and values are computed directly.
+CACHE_ERRORS = (ConnectionError, TimeoutError, ConnectionInterrupted)
+
+# Seconds to bypass the cache after a failure, so an outage costs one
+# connection timeout per interval rather than one per request.
+RETRY_INTERVAL = 5
+
+_retry_after = 0.0
+
+
+def cache_available():
+    return time.monotonic() >= _retry_after
+
+
+def cache_failed():
+    global _retry_after
+    _retry_after = time.monotonic() + RETRY_INTERVAL
+    logger.warning("Cache not available")
+
+
+class AsyncRedisCache:
+    """
+    asyncio access to the django-redis cache that shares its key format and
+    serializer, so async views read and invalidate the same entries as the
+    sync ones. Django's own acache methods would run the blocking client in
+    a thread instead.
+
+    Implements the subset of Django's async cache API that QueryCache uses.
+    redis.asyncio connections belong to one event loop, so each loop gets
+    its own client.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._clients = weakref.WeakKeyDictionary()
+
+    def _client(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            sync_client = self.backend.client
+            options = sync_client._options
+            client = aioredis.Redis.from_url(
+                sync_client._server[0],
+                socket_timeout=options.get('SOCKET_TIMEOUT'),
+                socket_connect_timeout=options.get('SOCKET_CONNECT_TIMEOUT'),
+                **options.get('CONNECTION_POOL_KWARGS', {}),
+            )
+            self._clients[loop] = client
+        return client
+
+    def _key(self, key):
+        return self.backend.client.make_key(key)
+
+    async def aget(self, key, default=None):
+        value = await self._client().get(self._key(key))
+        return default if value is None else self.backend.client.decode(value)
+
+    async def aset(self, key, value, timeout=None):
+        await self._client().set(self._key(key), self.backend.client.encode(value), ex=timeout)
+
+    async def aadd(self, key, value, timeout=None):
+        return bool(await self._client().set(self._key(key), self.backend.client.encode(value), ex=timeout, nx=True))
+
+    async def adelete(self, key):
+        return bool(await self._client().delete(self._key(key)))
+
+
+class TimedCache:
+    """
+    Wraps a cache so each call is timed as 'cache' in the request's
+    Server-Timing (see toDoApp.timing). Covers the calls QueryCache makes.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get(self, key, default=None):
+        with timed('cache'):
+            return self.backend.get(key, default)
+
+    def get_many(self, keys):
+        with timed('cache'):
+            return self.backend.get_many(keys)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT):
+        with timed('cache'):
+            return self.backend.add(key, value, timeout=timeout)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        with timed('cache'):
+            return self.backend.set(key, value, timeout)
+
+    def delete(self, key):
+        with timed('cache'):
+            return self.backend.delete(key)
+
+    def incr(self, key):
+        with timed('cache'):
+            return self.backend.incr(key)
+
+    async def aget(self, key, default=None):
+        with timed('cache'):
+            return await self.backend.aget(key, default)
+
+    async def aadd(self, key, value, timeout=None):
+        with timed('cache'):
+            return await self.backend.aadd(key, value, timeout=timeout)
+
+    async def aset(self, key, value, timeout=None):
+        with timed('cache'):
+            return await self.backend.aset(key, value, timeout)
+
+    async def adelete(self, key):
+        with timed('cache'):
+            return await self.backend.adelete(key)
+
+
+timed_cache = TimedCache(cache)
+
+_async_cache = None
+
+
+def get_async_cache():
+    """
+    Return the default cache's async interface: a shared native client for
+    Redis, otherwise Django's thread-based acache methods.
+    """
+    global _async_cache
+    backend = caches['default']
+    if not isinstance(backend, RedisCache):
+        return timed_cache
+    if _async_cache is None:
+        _async_cache = TimedCache(AsyncRedisCache(backend))
+    return _async_cache
+
+
+class QueryCache:
+    """
+    Caches computed values per normalized set of query parameters.
+
+    Every key embeds a generation number, so bump() invalidates all variants
+    at once without scanning for keys; stale entries simply expire. A scope
+    (e.g. an object's pk) gets its own generation and can be invalidated
+    alone. On a miss only one caller recomputes a key (a lock per key inside
+    the process, and a short-lived cache.add() lock across processes); the
+    others wait for its result.
+    """
+
+    LOCK_STRIPES = 64
+
+    def __init__(self, namespace, timeout=60 * 15, lock_timeout=10, wait_timeout=2.0):
+        self.namespace = namespace
+        self.timeout = timeout
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self._locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'errors': 0}
+        self._counters = cache_counters(namespace)
+
+    def _count(self, stat):
+        with self._stats_lock:
+            self._stats[stat] += 1
+        self._counters[stat].inc()
+
+    def _failed(self):
+        self._count('errors')
+        cache_failed()
+
+    def stats(self):
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._stats_lock:
+            for stat in self._stats:
+                self._stats[stat] = 0
+
+    def generation_key(self, scope=None):
+        if scope is None:
+            return f'{self.namespace}:generation'
+        return f'{self.namespace}:{scope}:generation'
+
+    def generation(self, scope=None):
+        key = self.generation_key(scope)
+        generation = timed_cache.get(key)
+        if generation is None:
+            # Seed from the clock rather than 1, so a generation key that was
+            # evicted can never come back to a number whose entries still exist.
+            timed_cache.add(key, int(time.time() * 1000), timeout=None)
+            generation = timed_cache.get(key)
+        return generation
+
+    def bump(self, scope=None):
+        """
+        Invalidate every cached variant in the namespace, or in one scope of it.
+        """
+        key = self.generation_key(scope)
+        try:
+            timed_cache.incr(key)
+        except ValueError:
+            timed_cache.add(key, int(time.time() * 1000), timeout=None)
+        except CACHE_ERRORS:
+            self._failed()
+
+    @staticmethod
+    def normalize(params):
+        """
+        Return a canonical string for a dict of parameters, where values may be
+        lists: keys are sorted, list values sorted and empty values dropped.
+        """
+        items = []
+        for name, value in params.items():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            items.extend((name, str(v)) for v in sorted(values, key=str) if v not in (None, ''))
+        return urlencode(sorted(items))
+
+    def make_key(self, params, generation, scope=None):
+        digest = hashlib.sha1(self.normalize(params).encode('utf-8')).hexdigest()
+        if scope is None:
+            return f'{self.namespace}:{generation}:{digest}'
+        return f'{self.namespace}:{scope}:{generation}:{digest}'
+
+    def get_or_set(self, params, compute, scope=None):
+        """
+        Return the cached value for params, computing and storing it on a miss.
+        """
+        if not cache_available():
+            return compute()
+
+        try:
+            key = self.make_key(params, self.generation(scope), scope)
+            value = timed_cache.get(key)
+        except CACHE_ERRORS:
+            self._failed()
+            return compute()
+
+        if value is not None:
+            self._count('hits')
+            return value
+
+        with self._locks[hash(key) % self.LOCK_STRIPES]:
+            return self._compute_once(key, compute)
+
+    def _compute_once(self, key, compute):
+        lock_key = f'{key}:lock'
+        try:
+            value = timed_cache.get(key)
+            if value is not None:
+                # Another thread in this process filled it while we waited.
+                self._count('hits')
+                return value
+
+            self._count('misses')
+            locked = timed_cache.add(lock_key, 1, timeout=self.lock_timeout)
+            if not locked:
+                value = self._wait_for(key)
+                if value is not None:
+                    return value
+        except CACHE_ERRORS:
+            self._failed()
+            return compute()
+
+        try:
+            with primary():
+                value = compute()
+            timed_cache.set(key, value, self.timeout)
+        except CACHE_ERRORS:
+            self._failed()
+        finally:
+            if locked:
+                try:
+                    timed_cache.delete(lock_key)
+                except CACHE_ERRORS:
+                    pass
+        return value
+
+    async def ageneration(self, scope=None):
+        store = get_async_cache()
+        key = self.generation_key(scope)
+        generation = await store.aget(key)
+        if generation is None:
+            await store.aadd(key, int(time.time() * 1000), timeout=None)
+            generation = await store.aget(key)
+        return generation
+
+    async def aget_or_set(self, params, compute, scope=None):
+        """
+        get_or_set() for async callers; compute is a coroutine function.
+
+        There is no per-process thread lock here: concurrent misses on one
+        event loop are collapsed by the same cache.add() lock that is used
+        across processes.
+        """
+        if not cache_available():
+            return await compute()
+
+        store = get_async_cache()
+        try:
+            key = self.make_key(params, await self.ageneration(scope), scope)
+            value = await store.aget(key)
+            if value is not None:
+                self._count('hits')
+                return value
+
+            self._count('misses')
+            lock_key = f'{key}:lock'
+            locked = await store.aadd(lock_key, 1, timeout=self.lock_timeout)
+            if not locked:
+                value = await self._await_for(store, key)
+                if value is not None:
+                    return value
+        except CACHE_ERRORS:
+            self._failed()
+            return await compute()
+
+        try:
+            with primary():
+                value = await compute()
+            await store.aset(key, value, self.timeout)
+        except CACHE_ERRORS:
+            self._failed()
+        finally:
+            if locked:
+                try:
+                    await store.adelete(lock_key)
+                except CACHE_ERRORS:
+                    pass
+        return value
+
+    async def _await_for(self, store, key):
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.02)
+            value = await store.aget(key)
+            if value is not None:
+                return value
+        return None
+
+    def _wait_for(self, key):
+        """
+        Poll for a value another process is computing; None if it takes too long.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.02)
+            value = timed_cache.get(key)
+            if value is not None:
+                return value
+        return None
+
+
+class PermissionCache:
+    """
+    Caches each user's resolved permission set.
+
+    An entry is stored with the global and per-user versions it was computed
+    under, and a lookup reads it together with both current versions in one
+    get_many(), so a hit costs a single round trip. Bumping a user's version
+    invalidates that user; bumping the global one (group permissions
+    changed) invalidates everyone.
+    """
+
+    def __init__(self, namespace='perms', timeout=60 * 60):
+        self.namespace = namespace
+        self.timeout = timeout
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'errors': 0}
+        self._counters = cache_counters(namespace)
+
+    def _count(self, stat):
+        with self._stats_lock:
+            self._stats[stat] += 1
+        self._counters[stat].inc()
+
+    def stats(self):
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def version_key(self, pk=None):
+        if pk is None:
+            return f'{self.namespace}:version'
+        return f'{self.namespace}:{pk}:version'
+
+    def _version(self, values, key):
+        version = values.get(key)
+        if version is None:
+            # Seeded from the clock, like QueryCache generations.
+            timed_cache.add(key, int(time.time() * 1000), timeout=None)
+            version = timed_cache.get(key)
+        return version
+
+    def get_or_set(self, pk, compute):
+        if not cache_available():
+            return compute()
+
+        entry_key, user_key, global_key = f'{self.namespace}:{pk}', self.version_key(pk), self.version_key()
+        try:
+            values = timed_cache.get_many([entry_key, user_key, global_key])
+            versions = (self._version(values, global_key), self._version(values, user_key))
+        except CACHE_ERRORS:
+            self._count('errors')
+            cache_failed()
+            return compute()
+
+        entry = values.get(entry_key)
+        if entry is not None and entry[0] == versions:
+            self._count('hits')
+            return entry[1]
+
+        self._count('misses')
+        with primary():
+            permissions = compute()
+        try:
+            timed_cache.set(entry_key, (versions, permissions), self.timeout)
+        except CACHE_ERRORS:
+            self._count('errors')
+            cache_failed()
+        return permissions
+
+    def bump(self, pk=None):
+        """
+        Invalidate one user's cached permissions, or everyone's.
+        """
+        key = self.version_key(pk)
+        try:
+            timed_cache.incr(key)
+        except ValueError:
+            timed_cache.add(key, int(time.time() * 1000), timeout=None)
+        except CACHE_ERRORS:
+            self._count('errors')
+            cache_failed()
+
+
+def tagged(data):
+    """
+    Wrap response data with an ETag computed from its content.
+    """
+    content = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True, separators=(',', ':'))
+    return {'etag': '"%s"' % hashlib.sha1(content.encode('utf-8')).hexdigest(), 'data': data}
+
+
+category_cache = QueryCache('categories')
+task_list_cache = QueryCache('tasks')
+task_cache = QueryCache('task')
+permission_cache = PermissionCache()
+
+
+def invalidate_task_cache(*pks):
+    """
+    Drop cached task lists and the cached copies of the given tasks.
+    """
+    task_list_cache.bump()
+    for pk in pks:
+        task_cache.bump(scope=pk)
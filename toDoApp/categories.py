@@ -0,0 +1,114 @@
+"""
+A process-local registry of category ids and names.
+
+Task writes check their category, and category writes the uniqueness of the
+name, against it instead of querying. Categories are few and rarely change:
+the registry loads them all with one query and keeps them until the
+generation of category_cache moves on. The Category signals bump that
+generation on every change, before and after commit, so every worker sees an
+edit on its next lookup, at the cost of one cache read per lookup. Without
+the cache, lookups query the database as before.
+
+A snapshot loaded inside a transaction that changed categories may hold rows
+that are later rolled back, so it only serves that one lookup.
+"""
+import threading
+
+from django.db import DEFAULT_DB_ALIAS, connection
+
+from toDoApp.cache import CACHE_ERRORS, cache_available, cache_failed, category_cache
+from toDoApp.models import Category
+from toDoApp.replicas import primary
+
+
+class CategoryRegistry:
+
+    def __init__(self, query_cache):
+        self.query_cache = query_cache
+        self._lock = threading.Lock()
+        # (generation, pk -> name, names)
+        self._snapshot = None
+        self._local = threading.local()
+
+    def changed(self):
+        """
+        Note that this thread changed a category in its current transaction.
+        """
+        if connection.in_atomic_block:
+            self._local.changed = True
+
+    def clear(self):
+        with self._lock:
+            self._snapshot = None
+
+    def generation(self):
+        if not cache_available():
+            return None
+        try:
+            return self.query_cache.generation()
+        except CACHE_ERRORS:
+            cache_failed()
+            return None
+
+    def snapshot(self):
+        """
+        Return the current (generation, pk -> name, names), or None if the
+        cache is unavailable.
+        """
+        generation = self.generation()
+        if generation is None:
+            return None
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot[0] == generation:
+            return snapshot
+
+        in_transaction = connection.in_atomic_block
+        if not in_transaction:
+            self._local.changed = False
+        with self._lock:
+            if self._snapshot is not None and self._snapshot[0] == generation:
+                return self._snapshot
+            # Read after the generation, so a change committed meanwhile
+            # leaves a newer generation behind and is loaded next time.
+            with primary():
+                names = dict(Category.objects.values_list('id', 'name'))
+            snapshot = (generation, names, frozenset(names.values()))
+            if not (in_transaction and getattr(self._local, 'changed', False)):
+                self._snapshot = snapshot
+        return snapshot
+
+    @staticmethod
+    def instance(pk, name):
+        # A fresh instance per caller, as a query would return.
+        return Category.from_db(DEFAULT_DB_ALIAS, ['id', 'name'], [pk, name])
+
+    def get(self, pk):
+        """
+        Return category pk, or raise Category.DoesNotExist.
+        """
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return Category.objects.get(pk=pk)
+        try:
+            return self.instance(pk, snapshot[1][pk])
+        except KeyError:
+            raise Category.DoesNotExist(f"Category {pk} does not exist.")
+
+    def in_bulk(self, pks):
+        """
+        Return a pk -> category dict of the given pks that exist.
+        """
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return Category.objects.in_bulk(pks)
+        names = snapshot[1]
+        return {pk: self.instance(pk, names[pk]) for pk in pks if pk in names}
+
+    def name_taken(self, name):
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return Category.objects.filter(name=name).exists()
+        return name in snapshot[2]
+
+
+category_registry = CategoryRegistry(category_cache)
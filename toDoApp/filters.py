@@ -1,13 +1,18 @@
 from django_filters import rest_framework as filters
 from .models import Category, Task
+from .search import search_queryset
 
 class CategoryFilter(filters.FilterSet):
 
     name = filters.CharFilter(lookup_expr='icontains')
+    search = filters.CharFilter(method='filter_search', label='Search')
 
     class Meta:
         model = Category
         fields = ['name']
+
+    def filter_search(self, queryset, name, value):
+        return search_queryset(queryset, ['name'], value)
             
             
 
@@ -19,6 +24,7 @@ class TaskFilter(filters.FilterSet):
     due_date_lt = filters.DateFilter(field_name='due_date', lookup_expr='lt', label='Due Date Less Than')
     is_completed = filters.BooleanFilter()
     priority = filters.ChoiceFilter(choices=Task.PRIORITY_CHOICES)
+    search = filters.CharFilter(method='filter_search', label='Search')
 
     class Meta:
         model = Task
@@ -29,4 +35,7 @@ class TaskFilter(filters.FilterSet):
             'is_completed',
             'priority',
             'category',
-        ]
\ No newline at end of file
+        ]
+
+    def filter_search(self, queryset, name, value):
+        return search_queryset(queryset, ['title', 'description'], value)
\ No newline at end of file
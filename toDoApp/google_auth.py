@@ -0,0 +1,174 @@
+"""
+Verification of Google ID tokens against a cached set of Google's keys.
+
+google.oauth2.id_token.verify_oauth2_token() downloads the keys on every
+call. GoogleCertCache keeps them for as long as the response's Cache-Control
+allows, fetching them through one pooled HTTP session, and refreshes them in
+a background thread shortly before they expire, so logins don't wait on
+Google. A token signed with a key id that isn't cached (Google rotated its
+keys) triggers one synchronous refetch, at most once per
+UNKNOWN_KEY_REFETCH_INTERVAL. Synchronous fetches are serialized, so the
+logins that find the keys missing or expired wait for one download instead
+of each starting their own.
+"""
+import threading
+import logging
+import base64
+import json
+import time
+import re
+
+from django.conf import settings
+from google.auth import jwt
+import requests
+import rsa
+
+logger = logging.getLogger('toDoApp')
+
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+# Used when a response has no usable max-age.
+DEFAULT_MAX_AGE = 60 * 60
+UNKNOWN_KEY_REFETCH_INTERVAL = 60
+
+MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+def b64decode(value):
+    return base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+
+
+def jwk_to_pem(jwk):
+    """
+    Return an RSA JWK as a PKCS#1 PEM public key, a format every
+    google.auth verifier accepts.
+    """
+    n = int.from_bytes(b64decode(jwk['n']), 'big')
+    e = int.from_bytes(b64decode(jwk['e']), 'big')
+    return rsa.PublicKey(n, e).save_pkcs1('PEM').decode()
+
+
+def parse_certs(data):
+    """
+    Return a key id -> PEM mapping from a JWKS document (v3 endpoint) or a
+    key id -> certificate mapping (v1 endpoint).
+    """
+    if 'keys' in data:
+        return {jwk['kid']: jwk_to_pem(jwk) for jwk in data['keys'] if jwk.get('kty') == 'RSA'}
+    return dict(data)
+
+
+def max_age(headers):
+    """
+    Seconds the response may be cached for, from Cache-Control and Age.
+    """
+    cache_control = headers.get('Cache-Control', '')
+    if 'no-store' in cache_control or 'no-cache' in cache_control:
+        return 0
+    match = MAX_AGE_RE.search(cache_control)
+    if not match:
+        return DEFAULT_MAX_AGE
+    try:
+        age = int(headers.get('Age', 0))
+    except ValueError:
+        age = 0
+    return max(0, int(match.group(1)) - age)
+
+
+def token_key_id(token):
+    try:
+        return json.loads(b64decode(token.split('.')[0])).get('kid')
+    except (ValueError, AttributeError):
+        return None
+
+
+class GoogleCertCache:
+
+    def __init__(self, url, session=None, refresh_margin=300, timeout=5):
+        self.url = url
+        self.session = session
+        self.refresh_margin = refresh_margin
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        # Held by the synchronous fetches of get() and get_for().
+        self._fetch_lock = threading.Lock()
+        self._certs = None
+        self._expires_at = 0
+        self._last_fetch = 0
+        self._refreshing = False
+
+    def get_session(self):
+        if self.session is None:
+            self.session = requests.Session()
+            self.session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        return self.session
+
+    def fetch(self):
+        response = self.get_session().get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        certs = parse_certs(response.json())
+        with self._lock:
+            self._certs = certs
+            self._expires_at = time.monotonic() + max_age(response.headers)
+            self._last_fetch = time.monotonic()
+        return certs
+
+    def get(self):
+        """
+        Return the current key id -> PEM mapping, fetching it if there is
+        none or it has expired.
+        """
+        now = time.monotonic()
+        with self._lock:
+            certs, expires_at = self._certs, self._expires_at
+            refresh = certs is not None and expires_at > now and expires_at - now < self.refresh_margin and not self._refreshing
+            if refresh:
+                self._refreshing = True
+
+        if certs is None or expires_at <= now:
+            with self._fetch_lock:
+                # Another thread may have fetched them while this one waited.
+                with self._lock:
+                    if self._certs is not None and self._expires_at > time.monotonic():
+                        return self._certs
+                return self.fetch()
+        if refresh:
+            threading.Thread(target=self._refresh, daemon=True).start()
+        return certs
+
+    def _refresh(self):
+        try:
+            self.fetch()
+        except Exception as e:
+            # The cached keys remain until they expire; get() then fetches.
+            logger.warning(f"Refreshing Google certificates failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def get_for(self, key_id):
+        """
+        get(), refetching once if key_id is not among the cached keys.
+        """
+        certs = self.get()
+        if key_id is None or key_id in certs:
+            return certs
+        with self._fetch_lock:
+            with self._lock:
+                certs = self._certs
+                recently_fetched = time.monotonic() - self._last_fetch < UNKNOWN_KEY_REFETCH_INTERVAL
+            return certs if recently_fetched else self.fetch()
+
+
+google_certs = GoogleCertCache(settings.GOOGLE_CERTS_URL)
+
+
+def verify_id_token(token, audience=None):
+    """
+    Verify a Google ID token's signature, expiry and issuer, and return its
+    claims. Raises ValueError (or a google.auth error) if it is invalid.
+    """
+    certs = google_certs.get_for(token_key_id(token))
+    id_info = jwt.decode(token, certs=certs, audience=audience)
+    if id_info.get('iss') not in GOOGLE_ISSUERS:
+        raise ValueError(f"Wrong issuer: {id_info.get('iss')}")
+    return id_info
@@ -0,0 +1,105 @@
+"""
+The groups that employees and employers are added to on creation.
+
+bootstrap_groups() creates them with their permissions, resolving every
+codename in one query; run it once per database with
+``python manage.py bootstrap_groups``. User creation then only checks that
+its group still exists and inserts the user's row in the groups m2m table:
+group ids are cached in the process and resolved (bootstrapping if the
+groups are missing) on first use.
+"""
+import threading
+import logging
+
+from django.contrib.auth.models import Group, Permission
+from django.db import transaction
+
+from toDoApp.models import CustomUser
+
+logger = logging.getLogger('toDoApp')
+
+ROLE_GROUPS = {
+    CustomUser.Role.EMPLOYEE: ('Employees', [
+        'change_task', 'delete_task', 'view_task',
+        'view_category',
+    ]),
+    CustomUser.Role.EMPLOYER: ('Employers', [
+        'add_task', 'change_task', 'delete_task', 'view_task',
+        'add_category', 'change_category', 'delete_category', 'view_category',
+    ]),
+}
+
+_group_ids = {}
+_group_ids_lock = threading.Lock()
+
+
+def bootstrap_groups():
+    """
+    Create the role groups that don't exist yet, with their permissions.
+    Existing groups are left alone, so permissions changed by an admin are
+    kept. Returns the names of the groups created.
+    """
+    created = []
+    existing = set(Group.objects.filter(name__in=[name for name, _ in ROLE_GROUPS.values()]).values_list('name', flat=True))
+    missing = [(name, codenames) for name, codenames in ROLE_GROUPS.values() if name not in existing]
+    if not missing:
+        return created
+
+    with transaction.atomic():
+        permission_ids = dict(
+            Permission.objects.filter(codename__in={codename for _, codenames in missing for codename in codenames})
+            .values_list('codename', 'id')
+        )
+        for name, codenames in missing:
+            group, was_created = Group.objects.get_or_create(name=name)
+            if not was_created:
+                continue
+            for codename in codenames:
+                if codename not in permission_ids:
+                    logger.warning(f"Permission '{codename}' does not exist.")
+            group.permissions.add(*[permission_ids[codename] for codename in codenames if codename in permission_ids])
+            created.append(name)
+    return created
+
+
+def role_group_id(role):
+    """
+    Return the id of the group for role, or None if the role has none.
+    """
+    if role not in ROLE_GROUPS:
+        return None
+    with _group_ids_lock:
+        if role in _group_ids:
+            return _group_ids[role]
+
+    name = ROLE_GROUPS[role][0]
+    group_id = Group.objects.filter(name=name).values_list('id', flat=True).first()
+    if group_id is None:
+        bootstrap_groups()
+        group_id = Group.objects.get(name=name).id
+    with _group_ids_lock:
+        _group_ids[role] = group_id
+    return group_id
+
+
+def clear_group_ids():
+    with _group_ids_lock:
+        _group_ids.clear()
+
+
+def add_to_role_group(user):
+    """
+    Add a newly created user to the group of their role with one insert.
+
+    The row is inserted through the m2m table directly: a new user has no
+    groups to check for and no cached permissions to invalidate.
+    """
+    group_id = role_group_id(user.role)
+    if group_id is None:
+        return
+    # Another process may have deleted the cached group. Foreign keys are
+    # only checked at commit, so the insert itself would not fail.
+    if not Group.objects.filter(pk=group_id).exists():
+        clear_group_ids()
+        group_id = role_group_id(user.role)
+    CustomUser.groups.through.objects.create(customuser_id=user.pk, group_id=group_id)
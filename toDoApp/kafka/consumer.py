@@ -0,0 +1,195 @@
+from collections import defaultdict
+from importlib import import_module
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import close_old_connections, transaction
+from kafka import KafkaConsumer
+import threading
+import logging
+import struct
+import time
+import os
+
+from toDoApp.kafka.events import decode_event
+
+logger = logging.getLogger('toDoApp')
+
+
+class HandlerRegistry:
+    """
+    Maps (schema, event type) to the handlers that process those events.
+
+    A handler receives the list of decoded events from one poll, so it can
+    apply them with bulk queries.
+    """
+
+    def __init__(self):
+        self._handlers = defaultdict(list)
+
+    def register(self, schema, event_type):
+        def decorator(handler):
+            self._handlers[(schema, event_type)].append(handler)
+            return handler
+        return decorator
+
+    def handlers_for(self, schema, event_type):
+        return self._handlers.get((schema, event_type), [])
+
+    def __bool__(self):
+        return bool(self._handlers)
+
+
+registry = HandlerRegistry()
+register_handler = registry.register
+
+
+def load_handlers():
+    """
+    Import the modules listed in KAFKA_CONSUMER_HANDLERS so their
+    @register_handler decorators run.
+    """
+    for module in getattr(settings, 'KAFKA_CONSUMER_HANDLERS', []):
+        import_module(module)
+
+
+class ConsumerMetrics:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.records = 0
+        self.batches = 0
+        self.skipped = 0
+        self.failures = 0
+        self.lag = {}
+
+    def record_batch(self, records, skipped):
+        with self._lock:
+            self.records += records
+            self.skipped += skipped
+            self.batches += 1
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+    def snapshot(self):
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            return {
+                'records': self.records,
+                'batches': self.batches,
+                'skipped': self.skipped,
+                'failures': self.failures,
+                'records_per_second': self.records / elapsed if elapsed else 0.0,
+                'lag': sum(self.lag.values()),
+                'lag_by_partition': {f'{tp.topic}-{tp.partition}': lag for tp, lag in self.lag.items()},
+            }
+
+
+def get_consumer(topics, group_id, max_records=500):
+    return KafkaConsumer(
+        *topics,
+        bootstrap_servers=[os.getenv('KAFKA_BOOTSTRAP_SERVER')],
+        group_id=group_id,
+        enable_auto_commit=False,
+        auto_offset_reset='earliest',
+        max_poll_records=max_records,
+    )
+
+
+class TaskEventConsumer:
+    """
+    Polls batches of events, hands each run of consecutive events of one
+    (schema, type) within a partition to its handlers inside one
+    transaction, then commits the offsets. Runs are dispatched in offset
+    order, so the events of a key (one partition) are applied in the order
+    they were produced: a task's update is never handled before its creation.
+
+    Offsets are committed only after the handlers' writes commit, so a crash
+    replays the batch (at-least-once); handlers should be idempotent. A
+    failing batch is rewound and retried on the next poll.
+
+    A registry without handlers is refused: the consumer would commit, and so
+    lose for its group, events that nothing processed.
+    """
+
+    def __init__(self, consumer, registry=registry, max_records=500, poll_timeout_ms=1000, lag_interval=10):
+        if not registry:
+            raise ImproperlyConfigured(
+                "No Kafka event handlers are registered; list their modules in KAFKA_CONSUMER_HANDLERS."
+            )
+        self.consumer = consumer
+        self.registry = registry
+        self.max_records = max_records
+        self.poll_timeout_ms = poll_timeout_ms
+        self.lag_interval = lag_interval
+        self.metrics = ConsumerMetrics()
+        self._lag_checked = 0.0
+
+    def poll_once(self):
+        """
+        Process one batch and return the number of records in it.
+        """
+        batch = self.consumer.poll(timeout_ms=self.poll_timeout_ms, max_records=self.max_records)
+        if not batch:
+            self.update_lag()
+            return 0
+
+        # [((schema, type), events)] in offset order per partition.
+        runs = []
+        skipped = 0
+        for records in batch.values():
+            run = None
+            for record in records:
+                try:
+                    schema, event = decode_event(record.value, record.headers)
+                except (KeyError, ValueError, IndexError, struct.error) as e:
+                    logger.warning(f"Skipping undecodable record {record.topic}-{record.partition}@{record.offset}: {e}")
+                    skipped += 1
+                    continue
+                group = (schema, event['type'])
+                if run is None or run[0] != group:
+                    run = (group, [])
+                    runs.append(run)
+                run[1].append(event)
+
+        try:
+            close_old_connections()
+            with transaction.atomic():
+                for (schema, event_type), events in runs:
+                    for handler in self.registry.handlers_for(schema, event_type):
+                        handler(events)
+        except Exception:
+            self.metrics.record_failure()
+            for tp, records in batch.items():
+                self.consumer.seek(tp, records[0].offset)
+            raise
+
+        self.consumer.commit()
+        count = sum(len(records) for records in batch.values())
+        self.metrics.record_batch(count, skipped)
+        self.update_lag()
+        return count
+
+    def update_lag(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._lag_checked < self.lag_interval:
+            return
+        self._lag_checked = now
+
+        partitions = self.consumer.assignment()
+        if not partitions:
+            return
+        end_offsets = self.consumer.end_offsets(list(partitions))
+        self.metrics.lag = {
+            tp: max(0, end_offsets[tp] - self.consumer.position(tp)) for tp in partitions
+        }
+
+    def run(self, stop_event=None, retry_backoff=1.0):
+        while stop_event is None or not stop_event.is_set():
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("Event batch failed, retrying")
+                time.sleep(retry_backoff)
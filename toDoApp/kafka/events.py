@@ -0,0 +1,167 @@
+"""
+Versioned event schemas for the Kafka topics.
+
+An event is a flat dict of JSON-friendly values (timestamps are epoch
+milliseconds, UUIDs are strings) so it can be stored in the outbox as-is.
+It is encoded only when it is sent, using KAFKA_EVENT_ENCODING:
+
+    json     compact JSON object, {"v": 1, ...}
+    msgpack  MessagePack array of the field values, [1, ...]
+    struct   fixed-layout binary record, see TaskEventV1.STRUCT
+
+The schema name and encoding travel in the record headers, and every
+encoding also carries the schema version in its first field.
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+import struct
+import json
+import uuid
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+ENCODINGS = ('json', 'msgpack', 'struct')
+
+SCHEMA_HEADER = 'schema'
+ENCODING_HEADER = 'encoding'
+
+
+def to_millis(value):
+    if value is None:
+        return None
+    return int(value.timestamp() * 1000)
+
+
+class TaskEventV1:
+    name = 'task.v1'
+    version = 1
+
+    EVENT_TYPES = ('created', 'updated', 'deleted')
+    PRIORITIES = ('low', 'medium', 'high')
+
+    FIELDS = (
+        'type', 'task_id', 'user_id', 'category_id', 'title', 'description',
+        'due_date', 'is_completed', 'priority', 'occurred_at',
+    )
+
+    # version, type, task_id, category_id, due_date, occurred_at,
+    # is_completed, priority, user_id, title length, description length;
+    # followed by the UTF-8 title and description.
+    STRUCT = struct.Struct('>BBqqqq?B16sHI')
+    NO_DATE = -2 ** 63
+
+    @classmethod
+    def build(cls, task, event_type):
+        return {
+            'type': event_type,
+            'task_id': task.pk,
+            'user_id': str(task.user_id),
+            'category_id': task.category_id,
+            'title': task.title,
+            'description': task.description,
+            'due_date': to_millis(task.due_date),
+            'is_completed': task.is_completed,
+            'priority': task.priority,
+            'occurred_at': to_millis(timezone.now()),
+        }
+
+    @classmethod
+    def encode_json(cls, event):
+        return json.dumps({'v': cls.version, **event}, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    @classmethod
+    def decode_json(cls, data):
+        event = json.loads(data)
+        event.pop('v')
+        return event
+
+    @classmethod
+    def encode_msgpack(cls, event):
+        return msgpack.packb([cls.version, *(event[field] for field in cls.FIELDS)])
+
+    @classmethod
+    def decode_msgpack(cls, data):
+        values = msgpack.unpackb(data)
+        return dict(zip(cls.FIELDS, values[1:]))
+
+    @classmethod
+    def encode_struct(cls, event):
+        title = event['title'].encode('utf-8')
+        description = event['description'].encode('utf-8')
+        due_date = event['due_date']
+        header = cls.STRUCT.pack(
+            cls.version,
+            cls.EVENT_TYPES.index(event['type']),
+            event['task_id'],
+            event['category_id'],
+            cls.NO_DATE if due_date is None else due_date,
+            event['occurred_at'],
+            event['is_completed'],
+            cls.PRIORITIES.index(event['priority']),
+            uuid.UUID(event['user_id']).bytes,
+            len(title),
+            len(description),
+        )
+        return b''.join((header, title, description))
+
+    @classmethod
+    def decode_struct(cls, data):
+        (_, event_type, task_id, category_id, due_date, occurred_at,
+         is_completed, priority, user_id, title_length, description_length) = cls.STRUCT.unpack_from(data)
+        offset = cls.STRUCT.size
+        title = data[offset:offset + title_length].decode('utf-8')
+        offset += title_length
+        description = data[offset:offset + description_length].decode('utf-8')
+        return {
+            'type': cls.EVENT_TYPES[event_type],
+            'task_id': task_id,
+            'user_id': str(uuid.UUID(bytes=user_id)),
+            'category_id': category_id,
+            'title': title,
+            'description': description,
+            'due_date': None if due_date == cls.NO_DATE else due_date,
+            'is_completed': is_completed,
+            'priority': cls.PRIORITIES[priority],
+            'occurred_at': occurred_at,
+        }
+
+
+SCHEMAS = {schema.name: schema for schema in (TaskEventV1,)}
+
+
+def get_encoding():
+    encoding = getattr(settings, 'KAFKA_EVENT_ENCODING', 'struct')
+    if encoding not in ENCODINGS:
+        raise ImproperlyConfigured(f"KAFKA_EVENT_ENCODING must be one of {', '.join(ENCODINGS)}.")
+    if encoding == 'msgpack' and msgpack is None:
+        raise ImproperlyConfigured("KAFKA_EVENT_ENCODING is 'msgpack' but msgpack is not installed.")
+    return encoding
+
+
+def encode_event(schema_name, event, encoding=None):
+    """
+    Return (value, headers) for sending the event with the given schema.
+    """
+    encoding = encoding or get_encoding()
+    schema = SCHEMAS[schema_name]
+    value = getattr(schema, f'encode_{encoding}')(event)
+    headers = [
+        (SCHEMA_HEADER, schema_name.encode('ascii')),
+        (ENCODING_HEADER, encoding.encode('ascii')),
+    ]
+    return value, headers
+
+
+def decode_event(value, headers):
+    """
+    Return (schema_name, event) for a record produced by encode_event.
+    """
+    headers = dict(headers or ())
+    schema_name = headers[SCHEMA_HEADER].decode('ascii')
+    encoding = headers[ENCODING_HEADER].decode('ascii')
+    return schema_name, getattr(SCHEMAS[schema_name], f'decode_{encoding}')(value)
@@ -0,0 +1,186 @@
+"""
+In-memory stand-in for a Kafka cluster, used by tests and benchmarks so they
+run without a network.
+"""
+from collections import defaultdict, namedtuple
+from kafka.consumer.fetcher import ConsumerRecord
+from kafka.structs import OffsetAndMetadata, TopicPartition
+import threading
+import time
+import zlib
+
+
+RecordMetadata = namedtuple('RecordMetadata', ['topic', 'partition', 'offset'])
+
+
+class FakeFuture:
+
+    def __init__(self, value=None, exception=None):
+        self.value = value
+        self.exception = exception
+
+    def add_callback(self, fn, *args, **kwargs):
+        if self.exception is None:
+            fn(*args, self.value, **kwargs)
+        return self
+
+    def add_errback(self, fn, *args, **kwargs):
+        if self.exception is not None:
+            fn(*args, self.exception, **kwargs)
+        return self
+
+    def get(self, timeout=None):
+        if self.exception is not None:
+            raise self.exception
+        return self.value
+
+    def succeeded(self):
+        return self.exception is None
+
+    def failed(self):
+        return self.exception is not None
+
+
+class FakeBroker:
+    """
+    Keeps every topic as a fixed number of partitions of
+    (key, value, headers) records.
+
+    connect_latency and flush_latency are slept on producer construction and
+    flush, to stand in for the bootstrap handshake and broker round trip.
+    Setting fail_sends makes every send fail with the given exception.
+    """
+
+    def __init__(self, partitions=3, connect_latency=0.0, flush_latency=0.0):
+        self.partitions = partitions
+        self.connect_latency = connect_latency
+        self.flush_latency = flush_latency
+        self.fail_sends = None
+        self.connections = 0
+        self.topics = defaultdict(lambda: [[] for _ in range(self.partitions)])
+        self.committed = {}
+        self._lock = threading.Lock()
+
+    def partition_for(self, key):
+        if key is None:
+            return 0
+        return zlib.crc32(key) % self.partitions
+
+    def append(self, topic, key, value, headers=None):
+        with self._lock:
+            partition = self.partition_for(key)
+            log = self.topics[topic][partition]
+            log.append((key, value, headers or []))
+            return RecordMetadata(topic, partition, len(log) - 1)
+
+    def messages(self, topic):
+        """
+        Return every value on the topic, partition by partition.
+        """
+        return [value for log in self.topics[topic] for _, value, _ in log]
+
+    def producer_class(self):
+        """
+        Return a KafkaProducer replacement bound to this broker.
+        """
+        broker = self
+
+        class Producer(FakeProducer):
+            def __init__(self, **config):
+                super().__init__(broker, **config)
+
+        return Producer
+
+    def consumer(self, *topics, group_id=None, partitions=None):
+        """
+        Return a consumer reading the given topics.
+
+        partitions limits the consumer to those partition numbers, standing in
+        for the share of a topic the group coordinator would assign it.
+        """
+        return FakeConsumer(self, topics, group_id, partitions)
+
+
+class FakeProducer:
+
+    def __init__(self, broker, **config):
+        self.broker = broker
+        self.config = config
+        self.closed = False
+        time.sleep(broker.connect_latency)
+        broker.connections += 1
+
+    def send(self, topic, value=None, key=None, headers=None, partition=None, timestamp_ms=None):
+        if self.broker.fail_sends is not None:
+            return FakeFuture(exception=self.broker.fail_sends)
+
+        key_serializer = self.config.get('key_serializer')
+        value_serializer = self.config.get('value_serializer')
+        key_bytes = key_serializer(key) if key_serializer else key
+        value_bytes = value_serializer(value) if value_serializer else value
+        return FakeFuture(self.broker.append(topic, key_bytes, value_bytes, headers))
+
+    def flush(self, timeout=None):
+        time.sleep(self.broker.flush_latency)
+
+    def close(self, timeout=None):
+        self.closed = True
+
+
+class FakeConsumer:
+
+    def __init__(self, broker, topics, group_id=None, partitions=None):
+        self.broker = broker
+        self.group_id = group_id
+        self.closed = False
+        self._assignment = [
+            TopicPartition(topic, partition)
+            for topic in topics
+            for partition in (partitions if partitions is not None else range(broker.partitions))
+        ]
+        self._positions = {tp: broker.committed.get((group_id, tp), 0) for tp in self._assignment}
+
+    def assignment(self):
+        return set(self._assignment)
+
+    def poll(self, timeout_ms=0, max_records=None, update_offsets=True):
+        records = {}
+        remaining = max_records or float('inf')
+        for tp in self._assignment:
+            log = self.broker.topics[tp.topic][tp.partition]
+            position = self._positions[tp]
+            batch = []
+            while position < len(log) and remaining > 0:
+                key, value, headers = log[position]
+                batch.append(ConsumerRecord(
+                    tp.topic, tp.partition, position, 0, 0, key, value, headers,
+                    None, len(key or b''), len(value or b''), -1,
+                ))
+                position += 1
+                remaining -= 1
+            if batch:
+                records[tp] = batch
+                if update_offsets:
+                    self._positions[tp] = position
+        return records
+
+    def position(self, tp):
+        return self._positions[tp]
+
+    def seek(self, tp, offset):
+        self._positions[tp] = offset
+
+    def committed(self, tp):
+        return self.broker.committed.get((self.group_id, tp))
+
+    def commit(self, offsets=None):
+        if offsets is None:
+            offsets = {tp: OffsetAndMetadata(position, '') for tp, position in self._positions.items()}
+        for tp, offset in offsets.items():
+            self.broker.committed[(self.group_id, tp)] = offset.offset
+
+    def end_offsets(self, partitions):
+        return {tp: len(self.broker.topics[tp.topic][tp.partition]) for tp in partitions}
+
+    def close(self, autocommit=True):
+        self.closed = True
@@ -0,0 +1,20 @@
+"""
+Handlers for consumed task events, listed in KAFKA_CONSUMER_HANDLERS.
+
+The web tier invalidates the task caches when it writes, but a bump made
+while the cache is unreachable is skipped (see toDoApp.cache), leaving
+entries from before the write to be served once it is back. Bumping again
+for every consumed event repairs that within the consumer's lag. Bumps are
+idempotent, so replayed batches are harmless.
+"""
+from toDoApp.cache import invalidate_task_cache
+from toDoApp.kafka.consumer import register_handler
+from toDoApp.kafka.events import TaskEventV1
+
+
+def invalidate_cached_tasks(events):
+    invalidate_task_cache(*{event['task_id'] for event in events})
+
+
+for event_type in TaskEventV1.EVENT_TYPES:
+    register_handler(TaskEventV1.name, event_type)(invalidate_cached_tasks)
@@ -0,0 +1,151 @@
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from django.db.models import Min
+from kafka import KafkaProducer
+from kafka.errors import KafkaError
+import logging
+import time
+
+from toDoApp.models import OutboxEvent
+from toDoApp.kafka.events import encode_event, get_encoding
+from toDoApp.kafka.producer import get_producer_config
+from toDoApp.metrics import count_kafka_failure, observe_kafka_send
+
+logger = logging.getLogger('toDoApp')
+
+BACKOFF_BASE_SECONDS = 1
+BACKOFF_MAX_SECONDS = 300
+
+
+def enqueue(topic, message, key=None, schema=''):
+    """
+    Record a message for the relay. Call inside the transaction that makes
+    the change, so the event is stored if and only if the change commits.
+
+    Messages with a schema (see toDoApp.kafka.events) are encoded with
+    KAFKA_EVENT_ENCODING when relayed; others are sent as JSON.
+    """
+    return OutboxEvent.objects.create(topic=topic, key=_key(key), schema=schema, payload=message)
+
+
+def enqueue_many(topic, messages, schema=''):
+    """
+    Record several (key, message) pairs with a single INSERT.
+    """
+    return OutboxEvent.objects.bulk_create(
+        [OutboxEvent(topic=topic, key=_key(key), schema=schema, payload=message) for key, message in messages]
+    )
+
+
+def _key(key):
+    return '' if key is None else str(key)
+
+
+def get_relay_producer():
+    """
+    Build the producer used by the relay.
+
+    Unlike the request-path producer, this one waits for every in-sync replica
+    and keeps one request in flight so retries cannot reorder a user's events.
+    """
+    config = get_producer_config()
+    config.update(acks='all', max_in_flight_requests_per_connection=1)
+    return KafkaProducer(**config)
+
+
+def _send(producer, event, encoding):
+    started = time.perf_counter()
+    if not event.schema:
+        future = producer.send(event.topic, event.payload, key=event.key or None)
+    else:
+        value, headers = encode_event(event.schema, event.payload, encoding)
+        future = producer.send(event.topic, value, key=event.key or None, headers=headers)
+    future.add_callback(lambda record_metadata: observe_kafka_send(event.topic, time.perf_counter() - started))
+    future.add_errback(lambda exception: count_kafka_failure(event.topic))
+    return future
+
+
+def backoff_delay(attempts):
+    return timedelta(seconds=min(BACKOFF_BASE_SECONDS * 2 ** attempts, BACKOFF_MAX_SECONDS))
+
+
+def relay_batch(producer, batch_size=500, timeout=10):
+    """
+    Send up to batch_size due events and return (sent, failed).
+
+    Delivery is at-least-once: rows are deleted only after the broker
+    acknowledged them, so a crash between the send and the delete resends.
+    Events for a key whose earlier event is backing off, or is being sent by
+    another relay (whose locked rows this one skips), are held back, which
+    keeps each user's events in order on their partition. An event that
+    cannot be encoded or sent for a reason other than Kafka is marked failed
+    and left for inspection, so it cannot block the outbox.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        pending = OutboxEvent.objects.filter(failed_at__isnull=True)
+        # Keyless events have no order to keep, so they hold nothing back.
+        waiting_keys = pending.filter(available_at__gt=now).exclude(key='').values('key')
+        events = list(
+            pending.select_for_update(skip_locked=True)
+            .filter(available_at__lte=now)
+            .exclude(key__in=waiting_keys)
+            .order_by('id')[:batch_size]
+        )
+        events = _in_key_order(pending, events)
+        if not events:
+            return 0, 0
+
+        encoding = get_encoding()
+        futures, dead = [], []
+        for event in events:
+            try:
+                futures.append((event, _send(producer, event, encoding)))
+            except KafkaError:
+                raise
+            except Exception as e:
+                logger.exception(f"Outbox event {event.id} cannot be sent")
+                event.failed_at = now
+                event.error = repr(e)
+                dead.append(event)
+        producer.flush(timeout=timeout)
+
+        sent, failed, failed_keys = [], [], set()
+        for event, future in futures:
+            if event.key in failed_keys:
+                # An earlier event for this key failed; keep the order by retrying both later.
+                continue
+            if future.succeeded():
+                sent.append(event.id)
+                continue
+
+            logger.warning(f"Outbox event {event.id} not delivered: {future.exception}")
+            event.available_at = now + backoff_delay(event.attempts)
+            event.attempts += 1
+            failed.append(event)
+            if event.key:
+                failed_keys.add(event.key)
+
+        OutboxEvent.objects.filter(id__in=sent).delete()
+        OutboxEvent.objects.bulk_update(failed, ['attempts', 'available_at'])
+        OutboxEvent.objects.bulk_update(dead, ['failed_at', 'error'])
+
+    return len(sent), len(failed) + len(dead)
+
+
+def _in_key_order(pending, events):
+    """
+    Drop the events that have an older pending event for their key outside
+    the batch, i.e. one locked by another relay.
+    """
+    keys = {event.key for event in events if event.key}
+    if not keys:
+        return events
+    ids = [event.id for event in events]
+    first_outside = dict(
+        pending.filter(key__in=keys).exclude(id__in=ids)
+        .values('key').annotate(first=Min('id')).values_list('key', 'first')
+    )
+    return [event for event in events if event.id < first_outside.get(event.key, event.id + 1)]
@@ -1,21 +1,196 @@
 from kafka import KafkaProducer
+from kafka.errors import NoBrokersAvailable
+from django.conf import settings
+import threading
 import logging
+import atexit
 import json
+import time
 import os
 
+from toDoApp.metrics import count_kafka_failure, observe_kafka_send
+from toDoApp.timing import timed
+
 logger = logging.getLogger('toDoApp')
 
+DEFAULT_PRODUCER_CONFIG = {
+    'acks': 1,
+    'linger_ms': 20,
+    'batch_size': 64 * 1024,
+    'compression_type': 'gzip',
+    'retries': 3,
+    'max_block_ms': 2000,
+}
+
+# Seconds to wait before trying to reach the brokers again after a failed connect,
+# so a broker outage doesn't make every request pay for a bootstrap attempt.
+RECONNECT_BACKOFF = 30
+
+_lock = threading.Lock()
+_producer = None
+_producer_pid = None
+_retry_after = 0.0
+
+_stats_lock = threading.Lock()
+_stats = {'sent': 0, 'delivered': 0, 'failed': 0}
+
+_error_callbacks = []
+
+
+def _serialize_value(value):
+    if isinstance(value, bytes):
+        return value
+    return json.dumps(value, default=str).encode('utf-8')
+
+
+def _serialize_key(key):
+    if key is None or isinstance(key, bytes):
+        return key
+    return str(key).encode('utf-8')
+
+
+def get_producer_config():
+    """
+    Return the KafkaProducer keyword arguments for this process.
+    """
+    config = dict(DEFAULT_PRODUCER_CONFIG)
+    config.update(getattr(settings, 'KAFKA_PRODUCER', {}))
+    config['bootstrap_servers'] = [os.getenv('KAFKA_BOOTSTRAP_SERVER')]
+    config.setdefault('value_serializer', _serialize_value)
+    config.setdefault('key_serializer', _serialize_key)
+    return config
+
+
 def get_producer():
-    return KafkaProducer(
-        bootstrap_servers=[os.getenv('KAFKA_BOOTSTRAP_SERVER')],
-        value_serializer=lambda v: json.dumps(v, default=str).encode('utf-8')
-    )
+    """
+    Return the process-wide producer, creating it on first use.
+
+    The producer is owned by the process that created it; a forked gunicorn
+    worker gets its own instance instead of sharing the parent's sockets.
+    Returns None when no bootstrap server is configured.
+    """
+    global _producer, _producer_pid, _retry_after
+
+    if _producer is not None and _producer_pid == os.getpid():
+        return _producer
+
+    if not os.getenv('KAFKA_BOOTSTRAP_SERVER'):
+        return None
+
+    with _lock:
+        if _producer_pid != os.getpid():
+            # Inherited from the parent process: its sockets are not ours to use.
+            _producer = None
+            _producer_pid = os.getpid()
+
+        if _producer is None:
+            if time.monotonic() < _retry_after:
+                raise NoBrokersAvailable()
+            try:
+                _producer = KafkaProducer(**get_producer_config())
+            except NoBrokersAvailable:
+                _retry_after = time.monotonic() + RECONNECT_BACKOFF
+                raise
+    return _producer
+
+
+def reset_producer():
+    """
+    Forget the current producer without closing it.
+
+    Called in a freshly forked worker, where the inherited producer belongs
+    to the parent process.
+    """
+    global _producer, _producer_pid, _retry_after
+    with _lock:
+        _producer = None
+        _producer_pid = None
+        _retry_after = 0.0
+
+
+def close_producer(timeout=5):
+    """
+    Flush pending messages and close the producer owned by this process.
+    """
+    global _producer
+    with _lock:
+        producer, _producer = _producer, None
+    if producer is not None and _producer_pid == os.getpid():
+        try:
+            producer.flush(timeout=timeout)
+            producer.close(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Error closing Kafka producer: {e}")
+
+
+atexit.register(close_producer)
+
+
+def add_error_callback(callback):
+    """
+    Register a callable invoked as callback(topic, message, exception)
+    whenever a message fails to be delivered.
+    """
+    _error_callbacks.append(callback)
+
+
+def remove_error_callback(callback):
+    if callback in _error_callbacks:
+        _error_callbacks.remove(callback)
+
+
+def get_stats():
+    """
+    Return a snapshot of the delivery counters for this process.
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_stats():
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0
+
+
+def _increment(key):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def _on_delivery(topic, started):
+    _increment('delivered')
+    observe_kafka_send(topic, time.perf_counter() - started)
+
+
+def _on_error(topic, message, exception):
+    _increment('failed')
+    count_kafka_failure(topic)
+    logger.error(f"Failed to deliver message to '{topic}': {exception}")
+    for callback in list(_error_callbacks):
+        try:
+            callback(topic, message, exception)
+        except Exception:
+            logger.exception("Kafka error callback failed")
 
-def produce_message(topic, message):
-    producer = get_producer()
-    producer.send(topic, message)
-    logger.debug("Message sent")
-    producer.flush()
 
+def produce_message(topic, message, key=None):
+    """
+    Queue a message on the shared producer and return its future.
 
+    The producer batches and sends in its background thread, so this does
+    not wait for the broker. Returns None when Kafka is not configured.
+    """
+    with timed('kafka'):
+        producer = get_producer()
+        if producer is None:
+            logger.debug("Kafka is not configured. Message dropped.")
+            return None
 
+        started = time.perf_counter()
+        future = producer.send(topic, message, key=key)
+    _increment('sent')
+    future.add_callback(lambda record_metadata: _on_delivery(topic, started))
+    future.add_errback(lambda exception: _on_error(topic, message, exception))
+    logger.debug("Message queued")
+    return future
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from toDoApp.groups import bootstrap_groups
+
+
+class Command(BaseCommand):
+    help = "Create the employee and employer groups with their permissions, if they don't exist."
+
+    def handle(self, *args, **options):
+        created = bootstrap_groups()
+        if created:
+            self.stdout.write(self.style.SUCCESS(f"Created groups: {', '.join(created)}"))
+        else:
+            self.stdout.write("Groups already exist.")
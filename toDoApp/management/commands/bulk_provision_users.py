@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+import json
+import sys
+import os
+
+from toDoApp.provisioning import FORMATS, format_for, provision, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Create employees and employers from a CSV (email,password,role header) or JSONL file. "
+        "Rows without a password get an unusable one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Input file, or - for stdin.")
+        parser.add_argument('--format', choices=FORMATS, help="Defaults to the file extension.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Password hashing processes; 0 hashes inline.")
+        parser.add_argument('--role', default='EMPLOYEE', help="Role of rows that don't have one.")
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or format_for(options['path'])
+        if file_format is None:
+            raise CommandError("Cannot tell the format from the file name; pass --format.")
+
+        stream = sys.stdin if options['path'] == '-' else open(options['path'], encoding='utf-8', newline='')
+        try:
+            report = None
+            for report in provision(
+                read_rows(stream, file_format), batch_size=options['batch_size'],
+                workers=options['workers'], default_role=options['role'].upper(),
+            ):
+                self.stderr.write(f"Processed {report.processed}: {report.created} created, {report.failed} failed.")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if report is None:
+            self.stdout.write("No rows.")
+            return
+        for error in report.errors:
+            self.stdout.write(json.dumps(error))
+        if report.failed > len(report.errors):
+            self.stdout.write(f"... and {report.failed - len(report.errors)} more errors.")
+        self.stdout.write(self.style.SUCCESS(f"Created {report.created} users, {report.failed} rows failed."))
@@ -0,0 +1,93 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+import multiprocessing
+import threading
+import logging
+import signal
+import time
+
+from toDoApp.kafka.consumer import TaskEventConsumer, get_consumer, load_handlers, registry
+
+logger = logging.getLogger('toDoApp')
+
+
+def run_consumer(topics, group_id, max_records, report_interval):
+    load_handlers()
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *args: stop_event.set())
+
+    consumer = TaskEventConsumer(get_consumer(topics, group_id, max_records), max_records=max_records)
+    reporter = threading.Thread(
+        target=report_metrics, args=(consumer, report_interval, stop_event), daemon=True
+    )
+    reporter.start()
+    try:
+        consumer.run(stop_event)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        consumer.consumer.close()
+
+
+def report_metrics(consumer, interval, stop_event):
+    while not stop_event.wait(interval):
+        stats = consumer.metrics.snapshot()
+        logger.info(
+            f"Consumed {stats['records']} records in {stats['batches']} batches "
+            f"({stats['records_per_second']:.1f}/s), lag {stats['lag']}, failures {stats['failures']}"
+        )
+
+
+class Command(BaseCommand):
+    help = "Consume task events and dispatch them to the registered handlers."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--topic', action='append', dest='topics', help="Topic to consume (repeatable).")
+        parser.add_argument('--group', default='todo-task-events', help="Consumer group id.")
+        parser.add_argument('--max-records', type=int, default=500, help="Records per batch.")
+        parser.add_argument(
+            '--processes', type=int, default=1,
+            help="Consumers to run; the group spreads the topic's partitions across them.",
+        )
+        parser.add_argument('--report-interval', type=float, default=30.0, help="Seconds between metric log lines.")
+
+    def handle(self, *args, **options):
+        load_handlers()
+        if not registry:
+            raise CommandError(
+                "No event handlers are registered (see KAFKA_CONSUMER_HANDLERS); "
+                "consuming would commit the group's offsets past events nothing processed."
+            )
+
+        consumer_args = (
+            options['topics'] or ['task_topic'], options['group'],
+            options['max_records'], options['report_interval'],
+        )
+
+        if options['processes'] == 1:
+            run_consumer(*consumer_args)
+            return
+
+        # Children must not share the parent's database connections.
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=run_consumer, args=consumer_args, daemon=True)
+            for _ in range(options['processes'])
+        ]
+        for worker in workers:
+            worker.start()
+
+        def stop(*args):
+            # Each child finishes its batch and closes its consumer on SIGTERM.
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+
+        signal.signal(signal.SIGTERM, stop)
+        try:
+            while any(worker.is_alive() for worker in workers):
+                time.sleep(1)
+        except KeyboardInterrupt:
+            stop()
+        for worker in workers:
+            worker.join()
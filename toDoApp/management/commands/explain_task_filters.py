@@ -0,0 +1,107 @@
+from datetime import timedelta
+from itertools import combinations
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+import random
+
+from toDoApp.filters import TaskFilter
+from toDoApp.models import Category, CustomUser, Task
+
+
+SEQUENTIAL_SCAN_MARKERS = {
+    'postgresql': 'Seq Scan on "toDoApp_task"',
+    'sqlite': 'SCAN toDoApp_task',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Explain the task list query for every combination of TaskFilter filters "
+        "and report the combinations that still scan the whole task table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help="Insert this many synthetic tasks first; they are rolled back afterwards.",
+        )
+        parser.add_argument('--page-size', type=int, default=10)
+        parser.add_argument('--verbose-plans', action='store_true', help="Print every plan, not just the summary.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['seed']:
+                self.seed(options['seed'])
+            self.explain_all(options)
+            transaction.set_rollback(True)
+
+    def seed(self, count, batch_size=10000):
+        user = CustomUser.objects.create(email='explain-task-filters@example.com')
+        categories = Category.objects.bulk_create([Category(name=f'Explain {i}') for i in range(20)])
+        now = timezone.now()
+
+        for start in range(0, count, batch_size):
+            Task.objects.bulk_create([
+                Task(
+                    title=f'Task {i}',
+                    due_date=now + timedelta(hours=random.randrange(-24 * 90, 24 * 365)),
+                    is_completed=random.random() < 0.7,
+                    priority=random.choice(['low', 'medium', 'high']),
+                    category=random.choice(categories),
+                    user=user,
+                )
+                for i in range(start, min(start + batch_size, count))
+            ])
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE "toDoApp_task"')
+        self.stdout.write(f"Seeded {count} tasks.")
+
+    def sample_filters(self):
+        today = timezone.localdate()
+        category = Category.objects.order_by('id').first()
+        filters = {
+            'is_completed': 'false',
+            'priority': 'high',
+            'due_date_gt': today.isoformat(),
+            'due_date_lt': (today + timedelta(days=30)).isoformat(),
+        }
+        if category:
+            filters['category'] = str(category.id)
+        return filters
+
+    def explain(self, data, page_size):
+        queryset = TaskFilter(data, queryset=Task.objects.all().order_by('due_date')).qs[:page_size]
+        if connection.vendor == 'postgresql':
+            return queryset.explain(analyze=True, buffers=True)
+        return queryset.explain()
+
+    def explain_all(self, options):
+        filters = self.sample_filters()
+        marker = SEQUENTIAL_SCAN_MARKERS.get(connection.vendor)
+        scanning = []
+
+        for size in range(len(filters) + 1):
+            for names in combinations(sorted(filters), size):
+                data = {name: filters[name] for name in names}
+                plan = self.explain(data, options['page_size'])
+                label = ', '.join(f'{name}={value}' for name, value in data.items()) or '(no filters)'
+                # SQLite reports "SCAN table USING INDEX ..." for index scans.
+                seq_scan = marker is not None and any(
+                    marker in line and 'USING' not in line for line in plan.splitlines()
+                )
+                if seq_scan:
+                    scanning.append(label)
+
+                if options['verbose_plans']:
+                    self.stdout.write(f"\n{label}\n{plan}")
+
+        total = 2 ** len(filters)
+        if scanning:
+            self.stdout.write(self.style.WARNING(f"{len(scanning)} of {total} filter combinations scan the task table:"))
+            for label in scanning:
+                self.stdout.write(f"  {label}")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"All {total} filter combinations use an index."))
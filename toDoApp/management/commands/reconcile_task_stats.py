@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from toDoApp.stats import reconcile
+
+
+class Command(BaseCommand):
+    help = "Recompute the task statistics counters from the tasks table."
+
+    def handle(self, *args, **options):
+        counts = reconcile()
+        self.stdout.write(self.style.SUCCESS(f"Recomputed {len(counts)} counters for {counts[('total', '')]} tasks."))
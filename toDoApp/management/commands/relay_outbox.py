@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from kafka.errors import KafkaError
+from prometheus_client import start_http_server
+import logging
+import time
+
+from toDoApp.kafka.outbox import get_relay_producer, relay_batch
+
+logger = logging.getLogger('toDoApp')
+
+
+class Command(BaseCommand):
+    help = "Relay pending outbox events to Kafka."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--interval', type=float, default=1.0, help="Seconds to sleep when the outbox is empty.")
+        parser.add_argument('--max-backoff', type=float, default=60.0, help="Longest wait between reconnect attempts.")
+        parser.add_argument('--once', action='store_true', help="Drain the outbox once and exit.")
+        parser.add_argument('--metrics-port', type=int, help="Serve Prometheus metrics (Kafka send latency and failures) on this port.")
+
+    def handle(self, *args, **options):
+        if options['metrics_port']:
+            start_http_server(options['metrics_port'])
+
+        producer = None
+        backoff = options['interval']
+
+        while True:
+            try:
+                if producer is None:
+                    producer = get_relay_producer()
+
+                sent, failed = relay_batch(producer, batch_size=options['batch_size'])
+                backoff = options['interval']
+            except KafkaError as e:
+                logger.warning(f"Kafka unavailable, retrying in {backoff:.0f}s: {e}")
+                if producer is not None:
+                    producer.close()
+                    producer = None
+                if options['once']:
+                    raise
+                time.sleep(backoff)
+                backoff = min(backoff * 2, options['max_backoff'])
+                continue
+
+            if sent or failed:
+                self.stdout.write(f"Relayed {sent} events, {failed} failed.")
+
+            if sent + failed < options['batch_size']:
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+
+        if producer is not None:
+            producer.flush()
+            producer.close()
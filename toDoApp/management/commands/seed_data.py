@@ -0,0 +1,159 @@
+from datetime import timedelta
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from itertools import accumulate
+import random
+import time
+import uuid
+import csv
+import io
+
+from toDoApp.cache import category_cache, invalidate_task_cache
+from toDoApp.groups import role_group_id
+from toDoApp.models import Category, CustomUser, Task
+from toDoApp.stats import reconcile
+
+
+VERBS = (
+    'Review', 'Prepare', 'Update', 'Send', 'Plan', 'Fix', 'Draft', 'Schedule',
+    'Migrate', 'Audit', 'Deploy', 'Renew', 'Call', 'Write', 'Test', 'Archive',
+)
+NOUNS = (
+    'report', 'budget', 'meeting notes', 'invoice', 'release', 'design', 'hiring plan',
+    'roadmap', 'backup', 'onboarding', 'contract', 'newsletter', 'dashboard', 'survey',
+    'presentation', 'payroll', 'inventory', 'server', 'policy', 'proposal',
+)
+QUALIFIERS = ('', '', '', 'for Q1', 'for Q2', 'for Q3', 'for Q4', 'with the team', 'before Friday', 'for the client')
+CATEGORY_NAMES = (
+    'Work', 'Personal', 'Finance', 'Operations', 'Marketing', 'Sales', 'Engineering',
+    'Support', 'Legal', 'HR', 'Facilities', 'Research', 'Design', 'Travel', 'Health',
+)
+PRIORITIES = ('low', 'medium', 'high')
+PRIORITY_WEIGHTS = (30, 50, 20)
+TASK_COLUMNS = ('title', 'description', 'due_date', 'is_completed', 'priority', 'category_id', 'user_id')
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with synthetic users, categories and tasks for load testing. "
+        "Tasks are loaded with COPY on PostgreSQL and bulk_create elsewhere; signals don't "
+        "fire, so the task statistics are reconciled afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--employers', type=float, default=0.1, help="Share of the users that are employers.")
+        parser.add_argument('--categories', type=int, default=50)
+        parser.add_argument('--tasks', type=int, default=100000)
+        parser.add_argument('--batch-size', type=int, default=50000)
+        parser.add_argument('--password', default='seedpassword', help="Password of every seeded user.")
+        parser.add_argument('--random-seed', type=int, help="Seed the generator for reproducible data.")
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['categories'] < 1:
+            raise CommandError("At least one user and one category are needed to own the tasks.")
+        self.random = random.Random(options['random_seed'])
+        self.now = timezone.now()
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            user_ids = self.seed_users(options['users'], options['employers'], options['password'])
+            category_ids = self.seed_categories(options['categories'])
+        self.stdout.write(f"Seeded {len(user_ids)} users and {len(category_ids)} categories.")
+
+        load = self.copy_tasks if connection.vendor == 'postgresql' else self.create_tasks
+        # Zipf-like weights: a few users own most of the tasks, as in practice.
+        user_weights = list(accumulate(1 / rank for rank in range(1, len(user_ids) + 1)))
+        category_weights = list(accumulate(1 / rank ** 0.5 for rank in range(1, len(category_ids) + 1)))
+        for start in range(0, options['tasks'], options['batch_size']):
+            count = min(options['batch_size'], options['tasks'] - start)
+            rows = self.task_rows(count, user_ids, user_weights, category_ids, category_weights)
+            with transaction.atomic():
+                load(rows)
+            done = start + count
+            self.stderr.write(f"{done} tasks, {done / (time.perf_counter() - started):.0f}/s")
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                for model in (CustomUser, Category, Task):
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+        counts = reconcile()
+        category_cache.bump()
+        invalidate_task_cache()
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {options['tasks']} tasks in {time.perf_counter() - started:.1f}s; "
+            f"{counts[('total', '')]} tasks in total."
+        ))
+
+    def seed_users(self, count, employer_share, password):
+        # One hash for everyone: hashing is by design the slowest part of creating a user.
+        password_hash = make_password(password)
+        run = uuid.uuid4().hex[:8]
+        users = [
+            CustomUser(
+                email=f'seed-{run}-{i}@example.com',
+                password=password_hash,
+                role=CustomUser.Role.EMPLOYER if self.random.random() < employer_share else CustomUser.Role.EMPLOYEE,
+            )
+            for i in range(count)
+        ]
+        CustomUser.objects.bulk_create(users, batch_size=1000)
+        membership = CustomUser.groups.through
+        membership.objects.bulk_create(
+            [membership(customuser_id=user.pk, group_id=role_group_id(user.role)) for user in users],
+            batch_size=1000,
+        )
+        return [user.pk for user in users]
+
+    def seed_categories(self, count):
+        names = [
+            CATEGORY_NAMES[index] + (f' {rank + 1}' if rank else '')
+            for rank, index in (divmod(i, len(CATEGORY_NAMES)) for i in range(count))
+        ]
+        categories = Category.objects.bulk_create([Category(name=name) for name in names])
+        return [category.pk for category in categories]
+
+    def task_rows(self, count, user_ids, user_weights, category_ids, category_weights):
+        """
+        count task tuples in TASK_COLUMNS order.
+        """
+        rand = self.random
+        users = rand.choices(user_ids, cum_weights=user_weights, k=count)
+        categories = rand.choices(category_ids, cum_weights=category_weights, k=count)
+        priorities = rand.choices(PRIORITIES, weights=PRIORITY_WEIGHTS, k=count)
+        rows = []
+        for user_id, category_id, priority in zip(users, categories, priorities):
+            title = f'{rand.choice(VERBS)} {rand.choice(NOUNS)} {rand.choice(QUALIFIERS)}'.rstrip()
+            description = ' '.join(rand.choices(NOUNS, k=rand.randrange(0, 12)))
+            if rand.random() < 0.1:
+                due_date, is_completed = None, rand.random() < 0.3
+            else:
+                due_date = self.now + timedelta(minutes=rand.randrange(-90 * 24 * 60, 365 * 24 * 60))
+                # Most past tasks are done, most future ones aren't.
+                is_completed = rand.random() < (0.8 if due_date < self.now else 0.15)
+            rows.append((title, description, due_date, is_completed, priority, category_id, user_id))
+        return rows
+
+    def copy_tasks(self, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for title, description, due_date, is_completed, priority, category_id, user_id in rows:
+            writer.writerow((
+                title, description, due_date.isoformat() if due_date else None,
+                't' if is_completed else 'f', priority, category_id, user_id,
+            ))
+        buffer.seek(0)
+
+        table = connection.ops.quote_name(Task._meta.db_table)
+        columns = ', '.join(connection.ops.quote_name(column) for column in TASK_COLUMNS)
+        with connection.cursor() as cursor:
+            # Unquoted empty fields are NULL in CSV; an empty description is not.
+            cursor.copy_expert(
+                f'COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (description))',
+                buffer,
+            )
+
+    def create_tasks(self, rows):
+        Task.objects.bulk_create([Task(**dict(zip(TASK_COLUMNS, row))) for row in rows], batch_size=1000)
@@ -22,12 +22,7 @@ class CustomUserManager(BaseUserManager):
         return user
     
     def _assign_permissions(self, user, permission_codenames):
-        for codename in permission_codenames:
-            try:
-                permission = Permission.objects.get(codename=codename)
-                user.user_permissions.add(permission)
-            except Permission.DoesNotExist:
-                pass
+        user.user_permissions.add(*Permission.objects.filter(codename__in=permission_codenames).values_list('id', flat=True))
 
     def create_superuser(self, email, password, **extra_fields):
         """
@@ -0,0 +1,122 @@
+"""
+Prometheus metrics for the API, caches, database and Kafka.
+
+Under gunicorn, set PROMETHEUS_MULTIPROC_DIR (an empty directory) so every
+worker writes its samples there and /metrics aggregates all of them; see
+gunicorn_config.py. Without it each process only reports its own samples.
+
+Metrics are updated on the request path, so label children are looked up
+once and kept in dicts: labels() takes a lock and builds a key per call.
+"""
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+import os
+
+# The status is a label of the latency histogram, whose _count series then
+# counts requests per status, rather than a separate counter: every extra
+# series updated per request costs about a microsecond.
+REQUEST_LATENCY = Histogram(
+    'todo_http_request_duration_seconds', 'Request latency.', ['view', 'method', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+# Divided by the request count, gives the queries per request of each view.
+DB_QUERIES = Counter('todo_db_queries_total', 'Database queries made while handling requests.', ['view'])
+CACHE_REQUESTS = Counter('todo_cache_requests_total', 'QueryCache lookups.', ['cache', 'result'])
+KAFKA_SEND_LATENCY = Histogram(
+    'todo_kafka_send_duration_seconds', 'Time from send() to broker acknowledgement.', ['topic'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+KAFKA_SEND_FAILURES = Counter('todo_kafka_send_failures_total', 'Messages that failed to be delivered.', ['topic'])
+PAGE_DEPTH = Histogram(
+    'todo_pagination_page_number', 'Page number requested from page-number paginated lists.', ['view'],
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 500, 1000),
+)
+DB_CONNECTIONS_OPENED = Counter('todo_db_connections_opened_total', 'New database connections.', ['alias'])
+DB_POOL_WAIT = Histogram(
+    'todo_db_pool_wait_seconds', 'Time to check a connection out of the pool.', ['alias'],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+DB_POOL_TIMEOUTS = Counter('todo_db_pool_timeouts_total', 'Pool checkouts that timed out.', ['alias'])
+
+_request_children = {}
+_topic_children = {}
+_alias_children = {}
+_page_children = {}
+
+
+def observe_request(view, method, status, seconds, queries):
+    key = (view, method, status)
+    children = _request_children.get(key)
+    if children is None:
+        children = _request_children[key] = (REQUEST_LATENCY.labels(view, method, str(status)), DB_QUERIES.labels(view))
+    latency, db_queries = children
+    latency.observe(seconds)
+    if queries:
+        db_queries.inc(queries)
+
+
+def _topic_metrics(topic):
+    children = _topic_children.get(topic)
+    if children is None:
+        children = _topic_children[topic] = (KAFKA_SEND_LATENCY.labels(topic), KAFKA_SEND_FAILURES.labels(topic))
+    return children
+
+
+def observe_kafka_send(topic, seconds):
+    _topic_metrics(topic)[0].observe(seconds)
+
+
+def count_kafka_failure(topic):
+    _topic_metrics(topic)[1].inc()
+
+
+def observe_page(view, number):
+    child = _page_children.get(view)
+    if child is None:
+        child = _page_children[view] = PAGE_DEPTH.labels(view)
+    child.observe(number)
+
+
+def _alias_metrics(alias):
+    children = _alias_children.get(alias)
+    if children is None:
+        children = _alias_children[alias] = (
+            DB_CONNECTIONS_OPENED.labels(alias), DB_POOL_WAIT.labels(alias), DB_POOL_TIMEOUTS.labels(alias),
+        )
+    return children
+
+
+def count_db_connect(alias):
+    _alias_metrics(alias)[0].inc()
+
+
+def observe_db_pool_wait(alias, seconds):
+    _alias_metrics(alias)[1].observe(seconds)
+
+
+def count_db_pool_timeout(alias):
+    _alias_metrics(alias)[2].inc()
+
+
+def cache_counters(namespace):
+    """
+    Return the hit, miss and error counters of one QueryCache namespace.
+    """
+    return {
+        'hits': CACHE_REQUESTS.labels(namespace, 'hit'),
+        'misses': CACHE_REQUESTS.labels(namespace, 'miss'),
+        'errors': CACHE_REQUESTS.labels(namespace, 'error'),
+    }
+
+
+def render():
+    """
+    Return (body, content type) for the current samples of every process.
+    """
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
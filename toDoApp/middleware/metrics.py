@@ -0,0 +1,47 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from time import perf_counter
+
+from toDoApp.metrics import observe_request
+from toDoApp.timing import current_timings
+
+# Other methods are reported as 'other' to bound the label values.
+METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status and query count per view (URL name) and method.
+
+    Must come after ProfilingMiddleware, whose request timings supply the
+    query count.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = perf_counter()
+        response = self.get_response(request)
+        self.record(request, response, perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, perf_counter() - start)
+        return response
+
+    def record(self, request, response, seconds):
+        match = request.resolver_match
+        view = match.view_name if match is not None else 'unmatched'
+        method = request.method if request.method in METHODS else 'other'
+        timings = current_timings()
+        queries = timings.counts.get('db', 0) if timings is not None else 0
+        observe_request(view, method, response.status_code, seconds, queries)
@@ -0,0 +1,124 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+from django.utils.text import slugify
+import threading
+import cProfile
+import logging
+import random
+import time
+import uuid
+import os
+
+from toDoApp.timing import end_request, start_request
+
+logger = logging.getLogger('toDoApp')
+
+# Timings reported in Server-Timing, in this order, when the request made such calls.
+SERVER_TIMING_METRICS = ('db', 'cache', 'kafka')
+
+# cProfile hooks the whole thread (and, under ASGI, every request on the
+# event loop), so at most one request per process is profiled at a time.
+_profile_lock = threading.Lock()
+
+
+class ProfilingMiddleware:
+    """
+    Times each request and reports it in the response headers:
+
+        Server-Timing: db;dur=3.10;desc="4 queries", cache;dur=0.42, total;dur=9.81
+        X-Query-Count: 4
+        X-Total-Time: 0.01s
+
+    Queries are counted by a connection execute wrapper, so the numbers are
+    right with DEBUG off, and per-request state lives in a context variable
+    (toDoApp.timing), so threaded and async workers keep requests apart.
+
+    A request is also run under cProfile when it sends X-Profile with the
+    PROFILING_TOKEN, or is picked at random with PROFILING_SAMPLE_RATE; the
+    stats are written to PROFILING_DIR and named in X-Profile-Id.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        timings, token = start_request()
+        profiler = self.start_profiler(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+            profile_id = self.stop_profiler(profiler, request)
+        return self.add_headers(response, timings, profile_id)
+
+    async def __acall__(self, request):
+        timings, token = start_request()
+        profiler = self.start_profiler(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+            profile_id = self.stop_profiler(profiler, request)
+        return self.add_headers(response, timings, profile_id)
+
+    def should_profile(self, request):
+        token = getattr(settings, 'PROFILING_TOKEN', '')
+        if token and constant_time_compare(request.headers.get('X-Profile', ''), token):
+            return True
+        rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0)
+        return rate > 0 and random.random() < rate
+
+    def start_profiler(self, request):
+        if not self.should_profile(request) or not _profile_lock.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def stop_profiler(self, profiler, request):
+        """
+        Stop profiler, if any, and dump its stats; returns the file name.
+        """
+        if profiler is None:
+            return None
+        profiler.disable()
+        _profile_lock.release()
+
+        directory = settings.PROFILING_DIR
+        name = '{}-{}-{}-{}.prof'.format(
+            time.strftime('%Y%m%dT%H%M%S'), request.method, slugify(request.path) or 'root', uuid.uuid4().hex[:8],
+        )
+        try:
+            os.makedirs(directory, exist_ok=True)
+            profiler.dump_stats(os.path.join(directory, name))
+        except OSError as e:
+            logger.warning(f"Could not write profile {name}: {e}")
+            return None
+        return name
+
+    def add_headers(self, response, timings, profile_id):
+        total_ns = timings.elapsed_ns()
+        metrics = []
+        for name in SERVER_TIMING_METRICS:
+            if name in timings.counts:
+                metric = f'{name};dur={timings.durations[name] / 1e6:.2f}'
+                if name == 'db':
+                    metric += f';desc="{timings.counts[name]} queries"'
+                metrics.append(metric)
+        metrics.append(f'total;dur={total_ns / 1e6:.2f}')
+
+        response['Server-Timing'] = ', '.join(metrics)
+        response['X-Query-Count'] = str(timings.counts.get('db', 0))
+        response['X-Total-Time'] = f'{total_ns / 1e9:.2f}s'
+        if profile_id:
+            response['X-Profile-Id'] = profile_id
+        return response
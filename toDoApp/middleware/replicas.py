@@ -0,0 +1,143 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.functional import SimpleLazyObject
+
+from toDoApp.cache import CACHE_ERRORS, cache_available, cache_failed, timed_cache
+from toDoApp.replicas import end_reads, replica_set, route_reads
+
+SAFE_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+# Set on the responses of writes; while present, reads use the primary.
+PIN_COOKIE = 'db_primary'
+
+
+def pin_key(pk):
+    return f'replicas:pin:{pk}'
+
+
+def pin_user(pk):
+    if not cache_available():
+        return
+    try:
+        timed_cache.set(pin_key(pk), 1, settings.REPLICA_PIN_SECONDS)
+    except CACHE_ERRORS:
+        cache_failed()
+
+
+def user_pinned(pk):
+    """
+    Whether a user wrote within REPLICA_PIN_SECONDS; assumed so when the
+    cache cannot tell.
+    """
+    if not cache_available():
+        return True
+    try:
+        return timed_cache.get(pin_key(pk)) is not None
+    except CACHE_ERRORS:
+        cache_failed()
+        return True
+
+
+def request_user(request):
+    """
+    Return the user once the view has authenticated the request, else None.
+    DRF sets request.user on the HttpRequest when it authenticates; until
+    then it is the lazy session user, which must not be evaluated here.
+    """
+    user = request.__dict__.get('user')
+    if user is None or isinstance(user, SimpleLazyObject):
+        return None
+    return user
+
+
+class RequestReads:
+    """
+    Where the reads of one safe request go: a replica chosen on the first
+    read, or the primary once the authenticated user turns out to have
+    written within REPLICA_PIN_SECONDS. Reads made before authentication
+    (of the user itself, say) use the replica.
+    """
+
+    __slots__ = ('request', 'replica', 'pinned')
+
+    def __init__(self, request):
+        self.request = request
+        self.replica = None
+        self.pinned = None
+
+    def database(self):
+        if self.pinned is None:
+            user = request_user(self.request)
+            if user is not None:
+                self.pinned = user.is_authenticated and user_pinned(user.pk)
+        if self.pinned:
+            return DEFAULT_DB_ALIAS
+        if self.replica is None:
+            self.replica = replica_set.choose()
+        return self.replica
+
+
+class ReplicaMiddleware:
+    """
+    Lets safe requests read from the replicas in REPLICA_DATABASES (see
+    toDoApp/replicas.py), and keeps a client that writes on the primary for
+    REPLICA_PIN_SECONDS afterwards, so it reads its own writes despite
+    replication lag: through a cookie for browsers and, since API clients
+    send no cookies, a cache key per authenticated user.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            if token is not None:
+                end_reads(token)
+        user = self.pin(request, response)
+        if user is not None:
+            pin_user(user.pk)
+        return response
+
+    async def __acall__(self, request):
+        token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            if token is not None:
+                end_reads(token)
+        user = self.pin(request, response)
+        if user is not None:
+            await sync_to_async(pin_user)(user.pk)
+        return response
+
+    @staticmethod
+    def start(request):
+        if not settings.REPLICA_DATABASES or request.method not in SAFE_METHODS or PIN_COOKIE in request.COOKIES:
+            return None
+        return route_reads(RequestReads(request))
+
+    @staticmethod
+    def pin(request, response):
+        """
+        Set the pin cookie on the response to a write; returns the user to
+        pin, if authenticated.
+        """
+        if not settings.REPLICA_DATABASES or request.method in SAFE_METHODS or response.status_code >= 400:
+            return None
+        response.set_cookie(
+            PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+            secure=request.is_secure(), httponly=True, samesite='Lax',
+        )
+        user = request_user(request)
+        return user if user is not None and user.is_authenticated else None
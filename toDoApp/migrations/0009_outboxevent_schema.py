@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-18 17:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('toDoApp', '0008_outboxevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxevent',
+            name='schema',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+    ]
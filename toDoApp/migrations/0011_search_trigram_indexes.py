@@ -0,0 +1,39 @@
+from django.db import migrations
+
+# GIN trigram indexes for the search parameter (word similarity on the raw
+# columns) and for the existing icontains filters, which Django renders as
+# UPPER(column) LIKE UPPER('%term%'). PostgreSQL only: other databases keep
+# the unindexed icontains fallback.
+INDEXES = [
+    ('task_title_trgm_idx', '"toDoApp_task"', '"title" gin_trgm_ops'),
+    ('task_description_trgm_idx', '"toDoApp_task"', '"description" gin_trgm_ops'),
+    ('task_title_upper_trgm_idx', '"toDoApp_task"', 'UPPER("title"::text) gin_trgm_ops'),
+    ('task_description_upper_trgm_idx', '"toDoApp_task"', 'UPPER("description"::text) gin_trgm_ops'),
+    ('category_name_trgm_idx', '"toDoApp_category"', '"name" gin_trgm_ops'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, expression in INDEXES:
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON {table} USING gin ({expression})')
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, expression in INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('toDoApp', '0010_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
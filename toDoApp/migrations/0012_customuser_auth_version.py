@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-18 17:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('toDoApp', '0011_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='auth_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
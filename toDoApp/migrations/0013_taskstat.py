@@ -0,0 +1,32 @@
+# Generated by Django 5.0.7 on 2026-10-18 17:43
+
+from django.db import migrations, models
+
+
+def count_existing_tasks(apps, schema_editor):
+    from toDoApp.stats import reconcile
+    reconcile(apps.get_model('toDoApp', 'Task'), apps.get_model('toDoApp', 'TaskStat'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('toDoApp', '0012_customuser_auth_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(max_length=20)),
+                ('key', models.CharField(blank=True, max_length=64)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='taskstat',
+            constraint=models.UniqueConstraint(fields=('dimension', 'key'), name='taskstat_dimension_key_uniq'),
+        ),
+        migrations.RunPython(count_existing_tasks, migrations.RunPython.noop),
+    ]
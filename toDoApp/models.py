@@ -1,4 +1,5 @@
 from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, Group, Permission
 from django.utils import timezone
 from .managers import CustomUserManager, EmployeeManager, EmployerManager
@@ -37,6 +38,9 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         max_length=50,
         default=AUTH_PROVIDERS.get('email')
     )
+    # Copied into access tokens and bumped whenever a field the token
+    # carries changes, so stale tokens fall back to reading the row.
+    auth_version = models.PositiveIntegerField(default=0)
 
     groups = models.ManyToManyField(
         Group,
@@ -58,10 +62,29 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
 
     objects = CustomUserManager()
 
+    # The fields carried as access token claims (see toDoApp/authentication.py).
+    AUTH_FIELDS = ('role', 'is_active', 'is_superuser', 'is_staff')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._auth_state = instance.auth_state()
+        return instance
+
+    def auth_state(self):
+        # Read from __dict__ so deferred fields aren't loaded.
+        return tuple(self.__dict__.get(field) for field in self.AUTH_FIELDS)
+
     def save(self, *args, **kwargs):
         if not self.pk:
             self.role = self.base_role
-        return super().save(*args, **kwargs)
+        if not self._state.adding and getattr(self, '_auth_state', None) not in (None, self.auth_state()):
+            self.auth_version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'auth_version'}
+        result = super().save(*args, **kwargs)
+        self._auth_state = self.auth_state()
+        return result
 
     def __str__(self):
         return self.email
@@ -104,6 +127,85 @@ class Task(models.Model):
     category = models.ForeignKey(Category, related_name='tasks', on_delete=models.PROTECT)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name="tasks", on_delete=models.CASCADE)
 
+    class Meta:
+        # Every TaskFilter filter combined with the list's due_date ordering
+        # (id breaks ties for keyset pagination).
+        indexes = [
+            models.Index(fields=['due_date', 'id'], name='task_due_date_idx'),
+            models.Index(
+                fields=['user', 'due_date', 'id'],
+                condition=models.Q(is_completed=False),
+                name='task_user_open_due_idx',
+            ),
+            models.Index(fields=['is_completed', 'due_date', 'id'], name='task_completed_due_idx'),
+            models.Index(fields=['priority', 'due_date', 'id'], name='task_priority_due_idx'),
+            models.Index(fields=['category', 'due_date', 'id'], name='task_category_due_idx'),
+        ]
+
+    # The fields toDoApp/stats.py counts tasks by.
+    STATS_FIELDS = ('user_id', 'category_id', 'priority', 'is_completed', 'due_date')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._stats_state = instance.stats_state()
+        return instance
+
+    def stats_state(self):
+        """
+        The counted fields as a tuple, or None if some of them are deferred.
+        """
+        if any(field not in self.__dict__ for field in self.STATS_FIELDS):
+            return None
+        return tuple(self.__dict__[field] for field in self.STATS_FIELDS)
+
     def __str__(self):
         return self.title
 
+
+class TaskStat(models.Model):
+    """
+    A task count for one value of one dimension (user, category, priority,
+    completion, due day of open tasks), kept up to date incrementally by
+    toDoApp/stats.py.
+    """
+    dimension = models.CharField(max_length=20)
+    key = models.CharField(max_length=64, blank=True)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'key'], name='taskstat_dimension_key_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}:{self.key}={self.count}"
+
+
+
+class OutboxEvent(models.Model):
+    """
+    An event waiting to be relayed to Kafka.
+
+    Rows are written in the same transaction as the change they describe and
+    deleted by the relay once the broker has acknowledged them.
+    """
+    topic = models.CharField(max_length=255)
+    key = models.CharField(max_length=255, blank=True)
+    schema = models.CharField(max_length=50, blank=True)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    # Set when the event could not be encoded or sent for a reason other
+    # than Kafka; the relay then skips it instead of retrying.
+    failed_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['available_at', 'id'], name='outbox_available_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.topic}:{self.key}"
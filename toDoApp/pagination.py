@@ -0,0 +1,221 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from django.core.paginator import InvalidPage
+from rest_framework import pagination
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+import binascii
+import json
+
+
+class PageNumberPagination(pagination.PageNumberPagination):
+    """
+    PageNumberPagination that can return its envelope as plain data, for
+    views that wrap it in their own response.
+    """
+
+    def get_paginated_data(self, data):
+        return {
+            'count': self.page.paginator.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+
+class AsyncPageNumberPagination(PageNumberPagination):
+    """
+    PageNumberPagination for async views: the count and the page are
+    fetched with the async ORM.
+    """
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+        self.page.object_list = [row async for row in self.page.object_list]
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return list(self.page)
+
+
+class TaskKeysetPagination(BasePagination):
+    """
+    Cursor pagination over the stable (due_date, id) key, nulls last.
+
+    Each page is fetched with a range condition on the key instead of an
+    OFFSET, so deep pages cost the same as the first one, and no COUNT(*) is
+    run. Pass count=true to also get the number of rows before the page.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        rows = []
+        for segment in self.page_segments(queryset, request):
+            rows.extend(segment[:self.page_size + 1 - len(rows)])
+            if len(rows) > self.page_size:
+                break
+        page = self.set_page(rows)
+        self.skipped = None
+        if self.wants_count(request):
+            self.skipped = self.skipped_rows(queryset).count() if page else 0
+        return page
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        rows = []
+        for segment in self.page_segments(queryset, request):
+            rows.extend([row async for row in segment[:self.page_size + 1 - len(rows)]])
+            if len(rows) > self.page_size:
+                break
+        page = self.set_page(rows)
+        self.skipped = None
+        if self.wants_count(request):
+            self.skipped = await self.skipped_rows(queryset).acount() if page else 0
+        return page
+
+    def page_segments(self, queryset, request):
+        """
+        Return the queries for the requested page plus one row, which tells
+        whether there is another page in the same direction, in page order.
+
+        Rows with a due date and the null tail are separate queries, each a
+        single range of the (due_date, id) index; the second one only runs
+        when the first comes up short. One query ORing the two would leave
+        Postgres to scan from the start of the index on every page.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        dated, undated = queryset.filter(due_date__isnull=False), queryset.filter(due_date__isnull=True)
+
+        if self.cursor is None:
+            self.reverse = False
+            return [queryset.order_by(*self.ordering())]
+
+        self.reverse, due_date, pk = self.cursor
+        if self.reverse:
+            if due_date is None:
+                return [undated.filter(id__lt=pk).order_by('-id'), dated.order_by('-due_date', '-id')]
+            return [dated.filter(self.before(due_date, pk)).order_by('-due_date', '-id')]
+        if due_date is None:
+            return [undated.filter(id__gt=pk).order_by('id')]
+        return [dated.filter(self.after(due_date, pk)).order_by('due_date', 'id'), undated.order_by('id')]
+
+    def set_page(self, rows):
+        has_more = len(rows) > self.page_size
+        page = rows[:self.page_size]
+        if self.reverse:
+            page.reverse()
+
+        self.has_next = has_more if not self.reverse else True
+        self.has_previous = has_more if self.reverse else self.cursor is not None
+        self.page = page
+        return page
+
+    def wants_count(self, request):
+        return request.query_params.get(self.count_query_param, '').lower() in ('1', 'true')
+
+    def skipped_rows(self, queryset):
+        return queryset.filter(self.before(*self.row_key(self.page[0])))
+
+    @staticmethod
+    def ordering():
+        return F('due_date').asc(nulls_last=True), 'id'
+
+    @staticmethod
+    def after(due_date, pk):
+        """
+        Rows after the key among those with a due date. The due_date__gte
+        bound repeats what the OR implies, so the index range starts at the
+        key.
+        """
+        return Q(due_date__gte=due_date) & (Q(due_date__gt=due_date) | Q(id__gt=pk))
+
+    @staticmethod
+    def before(due_date, pk):
+        """
+        Rows before the key, the null tail included; see after().
+        """
+        if due_date is None:
+            return Q(due_date__isnull=False) | Q(due_date__isnull=True, id__lt=pk)
+        return Q(due_date__lte=due_date) & (Q(due_date__lt=due_date) | Q(id__lt=pk))
+
+    def row_key(self, row):
+        return row.due_date, row.id
+
+    def encode_cursor(self, row, reverse):
+        due_date, pk = self.row_key(row)
+        payload = {'d': due_date.isoformat() if due_date else None, 'i': pk, 'r': int(reverse)}
+        token = urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        """
+        Return (reverse, due_date, id) from the request's cursor, or None.
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(urlsafe_b64decode(token.encode('ascii')))
+            due_date = parse_datetime(payload['d']) if payload['d'] is not None else None
+            return bool(payload['r']), due_date, int(payload['i'])
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_data(self, data):
+        response_data = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.skipped is not None:
+            response_data['skipped'] = self.skipped
+        return response_data
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'skipped': {'type': 'integer'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,42 @@
+"""
+Request body parsers selected in REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'],
+the counterparts of the renderers in toDoApp/renderers.py.
+"""
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+import msgpack
+import orjson
+
+from toDoApp.renderers import MessagePackRenderer
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser parsing with orjson, which only reads UTF-8 and rejects NaN
+    and Infinity; other encodings, or STRICT_JSON off, fall back to
+    JSONParser.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if not self.strict or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class MessagePackParser(BaseParser):
+    """
+    Parses a MessagePack request body. Map keys must be strings.
+    """
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, TypeError, msgpack.UnpackException) as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
@@ -0,0 +1,31 @@
+"""
+A process pool for password hashing.
+
+Kept free of model imports: spawned workers import this module to find
+their initializer before Django is set up.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+
+
+def _setup_worker(settings_module):
+    os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+
+    import django
+    django.setup()
+
+
+def password_executor(workers):
+    """
+    A pool of processes that hash passwords with the project's hashers.
+
+    Workers are spawned rather than forked, as the pool may be started from
+    a threaded server process.
+    """
+    return ProcessPoolExecutor(
+        workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_setup_worker,
+        initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'todo.settings'),),
+    )
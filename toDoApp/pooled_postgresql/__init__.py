@@ -0,0 +1,11 @@
+"""
+The PostgreSQL backend with a per-process connection pool, selected with
+DB_CONNECTION_MODE=pool (see todo/settings.py).
+
+Django opens a connection per thread and, with CONN_MAX_AGE=0, closes it at
+the end of every request. This backend hands out connections from a pool
+instead and takes them back on close, so a request reuses an open connection
+rather than paying for TCP, TLS and authentication. A process never holds
+more than OPTIONS['pool']['max_size'] connections; threads beyond that wait
+for one, up to OPTIONS['pool']['timeout'] seconds.
+"""
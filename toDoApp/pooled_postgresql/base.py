@@ -0,0 +1,56 @@
+from django.db.backends.postgresql import base, creation
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from toDoApp.pooled_postgresql.pool import close_pools, get_pool
+
+POOL_DEFAULTS = {'max_size': 1, 'timeout': 5.0, 'check_after': 30.0}
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle pooled connections would keep DROP DATABASE from running.
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Takes connections from a pool in get_new_connection() and puts them back
+    in _close(), so Django's per-request connect and close (CONN_MAX_AGE=0)
+    reuse open connections. OPTIONS['pool'] holds the keyword arguments of
+    ConnectionPool.
+    """
+    creation_class = DatabaseCreation
+    pooled = True
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    @property
+    def pool(self):
+        settings_dict = self.settings_dict
+        key = tuple(settings_dict[name] for name in ('NAME', 'USER', 'HOST', 'PORT'))
+        return get_pool(self.alias, key, **{**POOL_DEFAULTS, **settings_dict['OPTIONS'].get('pool', {})})
+
+    def get_new_connection(self, conn_params):
+        connect = super().get_new_connection
+        connection, created = self.pool.get(lambda: connect(conn_params))
+        if not created:
+            # Set by the superclass on connect; a reused connection keeps
+            # the level it was created with.
+            self.isolation_level = IsolationLevel(self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED))
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            # A connection closed mid-transaction or after an error is not
+            # trusted with the next request.
+            if self.in_atomic_block or self.errors_occurred:
+                self.pool.discard(self.connection)
+            else:
+                self.pool.put(self.connection)
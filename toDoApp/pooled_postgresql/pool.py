@@ -0,0 +1,162 @@
+from time import monotonic, perf_counter
+import threading
+import os
+
+from psycopg2 import OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INERROR, TRANSACTION_STATUS_INTRANS
+
+from toDoApp.metrics import count_db_connect, count_db_pool_timeout, observe_db_pool_wait
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """
+    A bounded pool of DB-API connections shared by the threads of one
+    process. Idle connections are reused most recent first, and those idle
+    for longer than check_after seconds are checked with a query before
+    being handed out.
+    """
+
+    def __init__(self, alias, max_size, timeout=10.0, check_after=30.0):
+        self.alias = alias
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_after = check_after
+        self.pid = os.getpid()
+        self._condition = threading.Condition()
+        # (connection, monotonic time it was returned)
+        self._idle = []
+        self._size = 0
+        self._stats = {'connects': 0, 'checkouts': 0, 'timeouts': 0, 'wait': 0.0}
+
+    def stats(self):
+        with self._condition:
+            return {**self._stats, 'size': self._size, 'idle': len(self._idle)}
+
+    def get(self, connect):
+        """
+        Return (connection, created): an idle connection, or a new one from
+        connect() while the pool has room. Raises PoolTimeout when none is
+        returned within the timeout.
+        """
+        start = perf_counter()
+        deadline = monotonic() + self.timeout
+        while True:
+            with self._condition:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        count_db_pool_timeout(self.alias)
+                        raise PoolTimeout(
+                            f"No connection to '{self.alias}' became available within {self.timeout}s "
+                            f"({self.max_size} in use)."
+                        )
+                    self._condition.wait(remaining)
+                if self._idle:
+                    connection, returned_at = self._idle.pop()
+                else:
+                    connection = None
+                    self._size += 1
+                waited = perf_counter() - start
+                self._stats['checkouts'] += 1
+                self._stats['wait'] += waited
+            observe_db_pool_wait(self.alias, waited)
+
+            if connection is None:
+                try:
+                    connection = connect()
+                except BaseException:
+                    self._release_slot()
+                    raise
+                with self._condition:
+                    self._stats['connects'] += 1
+                count_db_connect(self.alias)
+                return connection, True
+
+            if monotonic() - returned_at < self.check_after or self.healthy(connection):
+                return connection, False
+            # Broken while idle (server restart, idle timeout): try another.
+            self.discard(connection)
+
+    @staticmethod
+    def healthy(connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return True
+        except Exception:
+            return False
+
+    def put(self, connection):
+        """
+        Return a connection to the pool, rolling back a transaction left
+        open; connections that are closed or unusable are discarded.
+        """
+        if connection.closed:
+            self.discard(connection)
+            return
+        status = connection.info.transaction_status
+        if status in (TRANSACTION_STATUS_INTRANS, TRANSACTION_STATUS_INERROR):
+            try:
+                connection.rollback()
+            except Exception:
+                self.discard(connection)
+                return
+        elif status != TRANSACTION_STATUS_IDLE:
+            # Active (a query still running) or unknown (connection lost).
+            self.discard(connection)
+            return
+        with self._condition:
+            self._idle.append((connection, monotonic()))
+            self._condition.notify()
+
+    def discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        self._release_slot()
+
+    def _release_slot(self):
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def close(self):
+        """
+        Close the idle connections; those in use are closed when returned.
+        """
+        with self._condition:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self.discard(connection)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, key, max_size, timeout, check_after):
+    """
+    Return the process's pool for a database alias and connection key (the
+    test runner renames the database of an alias). A forked child (e.g. a
+    gunicorn worker of a preloaded app) gets a new pool rather than sharing
+    its parent's sockets.
+    """
+    with _pools_lock:
+        pool = _pools.get((alias, key))
+        if pool is None or pool.pid != os.getpid():
+            pool = _pools[alias, key] = ConnectionPool(alias, max_size, timeout, check_after)
+        return pool
+
+
+def close_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        if pool.pid == os.getpid():
+            pool.close()
@@ -0,0 +1,148 @@
+"""
+Bulk creation of employees and employers from CSV or JSONL.
+
+Rows (email, password, role) are read lazily and handled in batches, so
+memory stays bounded by the batch size whatever the input size. Each batch
+has its passwords hashed in a process pool, its users inserted with one
+bulk_create and their group memberships with one insert into the m2m
+table. post_save does not fire, so the role group handlers in signals.py
+are not involved.
+"""
+from itertools import islice
+import json
+import csv
+import os
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+from toDoApp.groups import role_group_id
+from toDoApp.models import CustomUser
+from toDoApp.password_pool import password_executor
+
+FORMATS = ('csv', 'jsonl')
+PROVISIONABLE_ROLES = (CustomUser.Role.EMPLOYEE, CustomUser.Role.EMPLOYER)
+# Only the first errors are kept, so a bad 100k-row file doesn't fill memory.
+MAX_REPORTED_ERRORS = 100
+
+
+def format_for(filename):
+    """
+    Guess the input format from a file name, or None.
+    """
+    extension = os.path.splitext(filename or '')[1].lower()
+    return {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}.get(extension)
+
+
+def read_rows(stream, file_format):
+    """
+    Yield (line number, row) for every row of a text stream. Rows that
+    cannot be parsed are yielded as None.
+    """
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif file_format == 'jsonl':
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError:
+                yield number, None
+    else:
+        raise ValueError(f"Unknown format '{file_format}', expected one of {', '.join(FORMATS)}.")
+
+
+class ProvisioningReport:
+
+    def __init__(self):
+        self.processed = 0
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def error(self, line, email, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'email': email, 'error': message})
+
+    def progress(self):
+        return {'processed': self.processed, 'created': self.created, 'failed': self.failed}
+
+    def as_dict(self):
+        return {**self.progress(), 'errors': self.errors}
+
+
+def provision(rows, batch_size=1000, workers=0, default_role=CustomUser.Role.EMPLOYEE):
+    """
+    Create users from (line number, row) pairs, yielding the report after
+    every batch. workers is the size of the hashing pool; with 0 passwords
+    are hashed in this process.
+    """
+    report = ProvisioningReport()
+    executor = password_executor(workers) if workers else None
+    rows = iter(rows)
+    try:
+        while batch := list(islice(rows, batch_size)):
+            provision_batch(batch, report, default_role, executor, workers)
+            yield report
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def provision_batch(batch, report, default_role, executor=None, workers=0):
+    accepted = {}
+    for line, row in batch:
+        report.processed += 1
+        if not isinstance(row, dict):
+            report.error(line, None, "Invalid row.")
+            continue
+
+        email = CustomUser.objects.normalize_email(str(row.get('email') or '').strip())
+        role = str(row.get('role') or default_role).strip().upper()
+        try:
+            validate_email(email)
+        except ValidationError:
+            report.error(line, email, "Invalid email.")
+            continue
+        if role not in PROVISIONABLE_ROLES:
+            report.error(line, email, f"Role must be one of {', '.join(PROVISIONABLE_ROLES)}.")
+            continue
+        if email in accepted:
+            report.error(line, email, "Duplicate email in input.")
+            continue
+        accepted[email] = (line, row.get('password') or None, role)
+
+    for email in CustomUser.objects.filter(email__in=list(accepted)).values_list('email', flat=True):
+        report.error(accepted.pop(email)[0], email, "A user with that email already exists.")
+    if not accepted:
+        return
+
+    passwords = [password for _, password, _ in accepted.values()]
+    if executor is not None:
+        chunksize = max(1, len(passwords) // (workers * 4))
+        hashes = list(executor.map(make_password, passwords, chunksize=chunksize))
+    else:
+        hashes = [make_password(password) for password in passwords]
+
+    users = [
+        CustomUser(email=email, password=password_hash, role=role)
+        for (email, (_, _, role)), password_hash in zip(accepted.items(), hashes)
+    ]
+    group_ids = {role: role_group_id(role) for role in PROVISIONABLE_ROLES}
+    membership = CustomUser.groups.through
+    try:
+        with transaction.atomic():
+            CustomUser.objects.bulk_create(users)
+            membership.objects.bulk_create([membership(customuser_id=user.pk, group_id=group_ids[user.role]) for user in users])
+    except IntegrityError as e:
+        # Most likely a user created concurrently with one of these emails.
+        for email, (line, _, _) in accepted.items():
+            report.error(line, email, f"Batch not created: {e}")
+        return
+    report.created += len(users)
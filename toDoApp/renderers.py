@@ -0,0 +1,53 @@
+"""
+Response renderers selected in REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].
+
+ORJSONRenderer produces JSONRenderer's compact UTF-8 output with orjson,
+which serializes dicts, lists, UUIDs and (timezone-aware, e.g. Asia/Karachi)
+datetimes natively. Other types, such as Decimal, fall back to DRF's
+JSONEncoder. MessagePackRenderer is chosen by content negotiation for
+clients that send ``Accept: application/msgpack`` (or ?format=msgpack).
+"""
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+import msgpack
+import orjson
+
+# DRF's fallback for the types neither orjson nor msgpack know.
+default = encoders.JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer serializing with orjson. Datetimes keep their microseconds,
+    which JSONEncoder truncates to milliseconds; serializer fields have
+    already turned the API's datetimes into strings. Indented output (from
+    ``Accept: application/json; indent=4`` or the browsable API) and
+    non-default JSON settings fall back to JSONRenderer.
+    """
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.ensure_ascii or not self.compact or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=default, option=self.options)
+        # Escaped like JSONRenderer does, so the output is valid JavaScript.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders data as MessagePack. Types MessagePack has no representation for
+    (UUIDs, datetimes, Decimal) are converted as JSONEncoder converts them.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=default, use_bin_type=True)
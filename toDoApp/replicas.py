@@ -0,0 +1,152 @@
+"""
+Routing of reads to the read replicas in REPLICA_DATABASES.
+
+Queries go to default unless ReplicaMiddleware (toDoApp/middleware/replicas.py)
+has marked the current request as one whose reads may use a replica: a
+GET, HEAD or OPTIONS request from a client that has not written recently.
+Commands, consumers, signal receivers and unsafe requests thus keep
+reading from the primary. The mark lives in a context variable, so threaded
+and async requests keep it apart and sync_to_async threads inherit it.
+
+Values stored in a shared cache are read from the primary (see primary()):
+a lagging replica would otherwise cache rows that predate the write whose
+invalidation made the entry be recomputed.
+
+Each process checks the replication lag of a replica at most every
+REPLICA_CHECK_INTERVAL seconds and leaves it out while the lag exceeds
+REPLICA_MAX_LAG or it cannot be reached; with none left, reads go to the
+primary.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger('toDoApp')
+
+# Zero while the replica has replayed all it received, so an idle primary
+# does not look like lag.
+LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+# The reads of the current request, with a database() method; None when
+# everything reads from the primary.
+_reads = ContextVar('replica_reads', default=None)
+
+
+def route_reads(reads):
+    """
+    Send the reads of the current context to reads.database(); returns the
+    token for end_reads().
+    """
+    return _reads.set(reads)
+
+
+def end_reads(token):
+    _reads.reset(token)
+
+
+@contextmanager
+def primary():
+    """
+    Read from the primary inside the block.
+    """
+    token = _reads.set(None)
+    try:
+        yield
+    finally:
+        _reads.reset(token)
+
+
+class ReplicaSet:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # alias -> (monotonic time of the check, healthy)
+        self._checks = {}
+
+    def clear(self):
+        with self._lock:
+            self._checks.clear()
+
+    @staticmethod
+    def lag(alias):
+        """
+        Return the replication lag of a replica in seconds.
+        """
+        connection = connections[alias]
+        if connection.vendor != 'postgresql':
+            return 0.0
+        with connection.cursor() as cursor:
+            cursor.execute(LAG_QUERY)
+            return float(cursor.fetchone()[0])
+
+    def healthy(self, alias):
+        check = self._checks.get(alias)
+        now = time.monotonic()
+        if check is not None and now - check[0] < settings.REPLICA_CHECK_INTERVAL:
+            return check[1]
+        # One thread checks; the others go by the last result meanwhile.
+        if not self._lock.acquire(blocking=False):
+            return check is not None and check[1]
+        try:
+            try:
+                lag = self.lag(alias)
+            except DatabaseError:
+                logger.warning("Replica %s not available", alias, exc_info=True)
+                connections[alias].close()
+                lag = None
+            healthy = lag is not None and lag <= settings.REPLICA_MAX_LAG
+            if not healthy and lag is not None and (check is None or check[1]):
+                logger.warning("Replica %s is %.1fs behind, reading from the others", alias, lag)
+            elif healthy and check is not None and not check[1]:
+                logger.info("Replica %s caught up", alias)
+            self._checks[alias] = (now, healthy)
+            return healthy
+        finally:
+            self._lock.release()
+
+    def choose(self):
+        """
+        Return a random healthy replica, or default if there is none.
+        """
+        healthy = [alias for alias in settings.REPLICA_DATABASES if self.healthy(alias)]
+        return random.choice(healthy) if healthy else DEFAULT_DB_ALIAS
+
+
+replica_set = ReplicaSet()
+
+
+class ReplicaRouter:
+    """
+    Writes go to default, reads where the current request's reads go.
+    Replicas are copies of default, so relations between them are allowed.
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db is not None:
+            # Related objects come from where the instance did.
+            return instance._state.db
+        reads = _reads.get()
+        if reads is None:
+            return DEFAULT_DB_ALIAS
+        return reads.database()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.REPLICA_DATABASES}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,42 @@
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db import connections
+from django.db.models import CharField, Q, TextField
+from django.db.models.functions import Greatest
+
+# Registered here rather than through django.contrib.postgres so the app
+# still loads on SQLite, where these lookups are never used.
+CharField.register_lookup(TrigramWordSimilar)
+TextField.register_lookup(TrigramWordSimilar)
+
+
+def search_queryset(queryset, fields, term):
+    """
+    Filter queryset to rows where any of the fields matches term.
+
+    On PostgreSQL rows are matched by trigram word similarity, which the
+    pg_trgm GIN indexes serve, and ordered by full-text rank, then
+    similarity. Other databases fall back to an unranked icontains match.
+    """
+    term = term.strip()
+    if not term:
+        return queryset
+
+    if connections[queryset.db].vendor != 'postgresql':
+        condition = Q()
+        for field in fields:
+            condition |= Q(**{f'{field}__icontains': term})
+        return queryset.filter(condition)
+
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__trigram_word_similar': term})
+
+    similarities = [TrigramWordSimilarity(term, field) for field in fields]
+    return queryset.filter(condition).annotate(
+        search_rank=SearchRank(
+            SearchVector(*fields, config='english'),
+            SearchQuery(term, config='english', search_type='websearch'),
+        ),
+        search_similarity=Greatest(*similarities) if len(similarities) > 1 else similarities[0],
+    ).order_by('-search_rank', '-search_similarity', 'id')
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from toDoApp.categories import category_registry
 from toDoApp.models import Category
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -12,6 +13,6 @@ class CategorySerializer(serializers.ModelSerializer):
         """
         if not value.strip():
             raise serializers.ValidationError("Category name cannot be empty.")
-        if Category.objects.filter(name=value).exists():
+        if category_registry.name_taken(value):
             raise serializers.ValidationError("Category with this name already exists.")
         return value
@@ -1,10 +1,33 @@
 from rest_framework import serializers
+from toDoApp.categories import category_registry
 from toDoApp.models import Task, Category
 from django.utils import timezone
 from toDoApp.serializers.category_serializer import CategorySerializer
 
+class CategoryField(serializers.PrimaryKeyRelatedField):
+    """
+    A category reference that is resolved from context['categories'] (a
+    pk -> Category dict) when present, so a batch of tasks is validated
+    against the categories looked up once, and from the category registry
+    otherwise, rather than with a query per task.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        categories = self.context.get('categories')
+        try:
+            if categories is None:
+                return category_registry.get(int(data))
+            return categories[int(data)]
+        except (KeyError, Category.DoesNotExist):
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
 class TaskSerializer(serializers.ModelSerializer):
-    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all())
+    category = CategoryField(queryset=Category.objects.all())
 
     class Meta:
         model = Task
@@ -13,7 +36,8 @@ class TaskSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         request = self.context.get('request')
-        validated_data['user'] = request.user
+        # The pk, as request.user may be a ClaimsUser rather than a row.
+        validated_data['user_id'] = request.user.pk
         return super().create(validated_data)
 
     def validate_title(self, value):
@@ -0,0 +1,27 @@
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt import serializers
+from rest_framework_simplejwt.settings import api_settings
+
+from toDoApp.authentication import UserRefreshToken, set_user_claims
+from toDoApp.models import CustomUser
+
+
+class TokenObtainPairSerializer(serializers.TokenObtainPairSerializer):
+    token_class = UserRefreshToken
+
+
+class TokenRefreshSerializer(serializers.TokenRefreshSerializer):
+    token_class = UserRefreshToken
+
+    def validate(self, attrs):
+        """
+        Copy the user's current claims into the refresh token before the new
+        access token is made from it, so refreshing picks up role, status
+        and auth_version changes.
+        """
+        refresh = self.token_class(attrs['refresh'])
+        user = CustomUser.objects.filter(pk=refresh.get(api_settings.USER_ID_CLAIM)).first()
+        if user is None or not user.is_active:
+            raise AuthenticationFailed("User is inactive or does not exist.", code='user_inactive')
+        set_user_claims(refresh, user)
+        return super().validate({**attrs, 'refresh': str(refresh)})
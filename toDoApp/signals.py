@@ -1,83 +1,190 @@
 from django.db import transaction
-from django.core.cache import cache
 from django.dispatch import receiver
-from django.db.models.signals import post_save, post_delete
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, pre_save, post_save, post_delete
 from django.contrib.auth.models import Group, Permission
 
-from redis.exceptions import ConnectionError
-
 import logging
 
-from toDoApp.models import CustomUser, Employee, Employer, Category
+from toDoApp.authentication import forget_auth_version, publish_auth_version
+from toDoApp.cache import category_cache, invalidate_task_cache, permission_cache
+from toDoApp.categories import category_registry
+from toDoApp.groups import add_to_role_group, clear_group_ids
+from toDoApp.metrics import count_db_connect
+from toDoApp.stats import record_changes
+from toDoApp.models import CustomUser, Employee, Employer, Category, Task
+from toDoApp.timing import install_query_timer
 
 
 
 @receiver(post_save, sender=Employee)
-def assign_employee_to_group(sender, instance, created, **kwargs):
-    
+@receiver(post_save, sender=Employer)
+def assign_to_role_group(sender, instance, created, **kwargs):
+    """
+    Add a new employee or employer to the group of their role.
+    """
     if created:
-        try: 
-            with transaction.atomic():
-                if instance.role == CustomUser.Role.EMPLOYEE:
-                    group, created = Group.objects.get_or_create(name='Employees')
-
-                    if created:
-                        permissions = [
-                            'change_task', 'delete_task', 'view_task',
-                            'view_category'
-                        ]
-                        add_permissions_to_group(group, permissions)
-                
-                instance.groups.add(group)
-                logging.info(f"User created: {instance.email}, Role: {instance.role}")
+        try:
+            add_to_role_group(instance)
+            logging.info(f"User created: {instance.email}, Role: {instance.role}")
         except Exception as e:
             logging.error(f"Error adding user to group: {e}")
             instance.delete()
 
 
-@receiver(post_save, sender=Employer)
-def assign_employer_to_group(sender, instance, created, **kwargs):
-    
-    if created:
-        try: 
-            with transaction.atomic():
-                if instance.role == CustomUser.Role.EMPLOYER:
-                    group, created = Group.objects.get_or_create(name='Employers')
-
-                    if created:
-                        permissions = [
-                            'add_task', 'change_task', 'delete_task', 'view_task',
-                            'add_category', 'change_category', 'delete_category', 'view_category'
-                        ]
-                        add_permissions_to_group(group, permissions)
-                
-                instance.groups.add(group)
-                logging.info(f"User created: {instance.email}, Role: {instance.role}")
-
-        except Exception as e:
-            logging.error(f"Error adding user to group: {e}")
-            instance.delete()
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def clear_group_ids_cache(sender, **kwargs):
+    """
+    Drop the process's cached role group ids when a group changes.
+    """
+    clear_group_ids()
 
 
+@receiver(post_save, sender=Category)
 @receiver(post_delete, sender=Category)
 def clear_category_cache(sender, instance, **kwargs):
     """
-    Invalidate the cache when a Category instance is saved.
+    Invalidate cached category lists, and the category registry, when a
+    Category is created, updated or deleted.
     """
-    try: 
-        cache_key = 'all_categories'
-        cache.delete(cache_key)
-    except ConnectionError:
-        logging.warning("Cache not available")
+    category_registry.changed()
+    # Bump now so this process stops serving the old lists, and again after
+    # commit so a list cached from a read racing the commit is dropped too.
+    category_cache.bump()
+    transaction.on_commit(category_cache.bump)
 
 
-def add_permissions_to_group(group, permissions):
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def clear_task_cache(sender, instance, **kwargs):
     """
-    Add a list of permissions to the given group.
+    Invalidate cached task lists and the cached copy of this task.
     """
-    for codename in permissions:
-        try:
-            permission = Permission.objects.get(codename=codename)
-            group.permissions.add(permission)
-        except Permission.DoesNotExist:
-            logging.warning(f"Permission '{codename}' does not exist.")
\ No newline at end of file
+    invalidate_task_cache(instance.pk)
+    transaction.on_commit(lambda: invalidate_task_cache(instance.pk))
+
+
+def invalidate_permissions(pks=None):
+    """
+    Drop the cached permissions of the given users, or of everyone when pks
+    is None.
+    """
+    for pk in pks if pks is not None else [None]:
+        permission_cache.bump(pk)
+
+
+def bump_permissions(pks=None):
+    invalidate_permissions(pks)
+    transaction.on_commit(lambda: invalidate_permissions(pks))
+
+
+@receiver(m2m_changed, sender=CustomUser.groups.through)
+@receiver(m2m_changed, sender=CustomUser.user_permissions.through)
+def clear_user_permission_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Invalidate cached permissions when a user's groups or own permissions
+    change, including through the group-assignment handlers above.
+    """
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        bump_permissions([instance.pk])
+    elif pk_set:
+        # group.custom_user_set.add(...) or permission.custom_user_set.add(...)
+        bump_permissions(list(pk_set))
+    else:
+        # A reverse clear() doesn't say which users were affected.
+        bump_permissions()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=Permission)
+def clear_permission_cache(sender, **kwargs):
+    """
+    Invalidate everyone's cached permissions when a group's permissions
+    change or a group or permission is deleted.
+    """
+    if kwargs.get('action', 'post_').startswith('post_'):
+        bump_permissions()
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_save, sender=Employee)
+@receiver(post_save, sender=Employer)
+def clear_saved_user_permission_cache(sender, instance, created, **kwargs):
+    """
+    is_superuser and is_active change what a user is allowed to do.
+    """
+    if not created:
+        bump_permissions([instance.pk])
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_save, sender=Employee)
+@receiver(post_save, sender=Employer)
+def publish_user_auth_version(sender, instance, created, **kwargs):
+    """
+    Publish the user's auth_version, which CustomUser.save() bumps when a
+    claim changes, so tokens with the old claims stop being trusted.
+    """
+    if not created:
+        publish_auth_version(instance)
+        transaction.on_commit(lambda: publish_auth_version(instance))
+
+
+@receiver(post_delete, sender=CustomUser)
+@receiver(post_delete, sender=Employee)
+@receiver(post_delete, sender=Employer)
+def forget_deleted_user(sender, instance, **kwargs):
+    """
+    Stop trusting a deleted user's tokens and drop their cached permissions.
+    Again after commit, in case a request read the row before the delete
+    and published its version meanwhile.
+    """
+    pk = instance.pk
+    forget_auth_version(pk)
+    transaction.on_commit(lambda: forget_auth_version(pk))
+    bump_permissions([pk])
+
+
+@receiver(pre_save, sender=Task)
+def load_task_stats_state(sender, instance, **kwargs):
+    """
+    Read the counted fields of a task that is updated without having been
+    loaded from the database, so update_task_stats() can tell what changed.
+    """
+    if not instance._state.adding and getattr(instance, '_stats_state', None) is None:
+        instance._stats_state = Task.objects.filter(pk=instance.pk).values_list(*Task.STATS_FIELDS).first()
+
+
+@receiver(post_save, sender=Task)
+def update_task_stats(sender, instance, created, **kwargs):
+    """
+    Apply the task's change to the TaskStat counters.
+    """
+    new = instance.stats_state()
+    if new is None:
+        # Saved with deferred fields, which keep their stored values.
+        new = Task.objects.filter(pk=instance.pk).values_list(*Task.STATS_FIELDS).first()
+    record_changes([(None if created else instance._stats_state, new)])
+    instance._stats_state = new
+
+
+@receiver(post_delete, sender=Task)
+def remove_task_stats(sender, instance, **kwargs):
+    record_changes([(getattr(instance, '_stats_state', None) or instance.stats_state(), None)])
+
+
+@receiver(connection_created)
+def time_queries(sender, connection, **kwargs):
+    """
+    Time every query on the new connection for the request's Server-Timing.
+    """
+    install_query_timer(connection)
+    # The pool counts the connections it opens; this signal is also sent
+    # when it hands out an open one.
+    if not getattr(connection, 'pooled', False):
+        count_db_connect(connection.alias)
+
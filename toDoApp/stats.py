@@ -0,0 +1,190 @@
+"""
+Task counts by user, category, priority, completion and overdue status.
+
+TaskStat holds one row per (dimension, key). The Task signals in signals.py
+(and the bulk endpoints, which bypass them) turn every change into +1/-1
+deltas on the affected rows, applied with one upsert in the same
+transaction as the change, so summary() reads a few rows whatever the
+number of tasks.
+
+Overdue is time-dependent, so open tasks are counted per due day (UTC)
+instead: overdue tasks are those of the days before today plus today's
+tasks due before now, which the task_completed_due_idx index counts
+directly.
+
+Rows are locked by the upsert until the writing transaction commits, so
+task writes serialize on the shared rows (total, priority, completion).
+The update endpoints lock the task rows too and count from their stored
+state (locked_states()), so two updates of one task don't both subtract
+the state they loaded.
+Changes made with queryset.update() or raw SQL are not counted;
+``python manage.py reconcile_task_stats`` recomputes everything.
+"""
+from collections import Counter
+from datetime import datetime, time, timezone
+
+from django.db import connection, transaction
+from django.db.models import Case, Count, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone as django_timezone
+
+from toDoApp.models import Task, TaskStat
+
+DIMENSIONS = ('user', 'category', 'priority', 'completed')
+PRIORITIES = [value for value, _ in Task.PRIORITY_CHOICES]
+
+
+def due_day(due_date):
+    # Unsaved instances may hold a string or a naive datetime, as assigned.
+    due_date = Task._meta.get_field('due_date').to_python(due_date)
+    if django_timezone.is_naive(due_date):
+        due_date = django_timezone.make_aware(due_date)
+    return due_date.astimezone(timezone.utc).date().isoformat()
+
+
+def stat_keys(state):
+    """
+    The (dimension, key) rows a task with the given Task.stats_state() is
+    counted in.
+    """
+    user_id, category_id, priority, is_completed, due_date = state
+    keys = [
+        ('total', ''),
+        ('user', str(user_id)),
+        ('category', str(category_id)),
+        ('priority', priority),
+        ('completed', 'true' if is_completed else 'false'),
+    ]
+    if not is_completed and due_date is not None:
+        keys.append(('open_due_day', due_day(due_date)))
+    return keys
+
+
+def deltas(changes):
+    """
+    Sum (old state, new state) pairs, either of which may be None, into
+    per-row deltas.
+    """
+    counter = Counter()
+    for old, new in changes:
+        if old is not None:
+            counter.subtract(stat_keys(old))
+        if new is not None:
+            counter.update(stat_keys(new))
+    return {key: delta for key, delta in counter.items() if delta}
+
+
+def apply_deltas(changes):
+    """
+    Add the deltas of (old state, new state) pairs to the TaskStat rows.
+    """
+    counts = deltas(changes)
+    if not counts:
+        return
+
+    # Sorted, so concurrent upserts lock rows in the same order.
+    rows = sorted(counts.items())
+    table = connection.ops.quote_name(TaskStat._meta.db_table)
+    count = connection.ops.quote_name('count')
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (dimension, {connection.ops.quote_name('key')}, {count}) "
+            f"VALUES {', '.join(['(%s, %s, %s)'] * len(rows))} "
+            f"ON CONFLICT (dimension, {connection.ops.quote_name('key')}) "
+            f"DO UPDATE SET {count} = {table}.{count} + EXCLUDED.{count}",
+            [value for (dimension, key), delta in rows for value in (dimension, key, delta)],
+        )
+
+
+def locked_states(pks):
+    """
+    Lock the rows of the given tasks until the transaction ends and return
+    their stored Task.stats_state() by id; rows that are gone are left out.
+    """
+    rows = Task.objects.select_for_update().filter(pk__in=pks).order_by('pk').values_list('pk', *Task.STATS_FIELDS)
+    return {pk: tuple(state) for pk, *state in rows}
+
+
+def record_changes(changes):
+    """
+    apply_deltas() for (old state, new state) pairs of tasks, skipping
+    updates that don't change a counted field.
+    """
+    apply_deltas([(old, new) for old, new in changes if old != new])
+
+
+def count_tasks(task_model=Task):
+    """
+    Recompute every TaskStat row with a single GROUP BY.
+    """
+    counter = Counter()
+    rows = (
+        task_model.objects
+        .annotate(open_due_day=Case(When(is_completed=False, then=TruncDate('due_date', tzinfo=timezone.utc))))
+        .values_list('user_id', 'category_id', 'priority', 'is_completed', 'open_due_day')
+        .annotate(n=Count('id'))
+        .order_by()
+    )
+    for user_id, category_id, priority, is_completed, open_day, n in rows.iterator():
+        counter[('total', '')] += n
+        counter[('user', str(user_id))] += n
+        counter[('category', str(category_id))] += n
+        counter[('priority', priority)] += n
+        counter[('completed', 'true' if is_completed else 'false')] += n
+        if open_day is not None:
+            counter[('open_due_day', open_day.isoformat())] += n
+    return counter
+
+
+def reconcile(task_model=Task, stat_model=TaskStat):
+    """
+    Replace the TaskStat rows with counts recomputed from the tasks.
+    """
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            # Blocks task writes, and their deltas, until the new counts are in.
+            with connection.cursor() as cursor:
+                cursor.execute(f'LOCK TABLE {connection.ops.quote_name(task_model._meta.db_table)} IN SHARE MODE')
+        counts = count_tasks(task_model)
+        stat_model.objects.all().delete()
+        stat_model.objects.bulk_create(
+            [stat_model(dimension=dimension, key=key, count=n) for (dimension, key), n in counts.items()],
+            batch_size=1000,
+        )
+    return counts
+
+
+def summary():
+    """
+    Task counts for the stats endpoint.
+    """
+    rows = TaskStat.objects.exclude(count=0).values_list('dimension', 'key', 'count')
+    now = django_timezone.now()
+    today = now.astimezone(timezone.utc).date()
+
+    counts = {dimension: {} for dimension in DIMENSIONS}
+    total = overdue = 0
+    for dimension, key, count in rows:
+        if dimension == 'total':
+            total = count
+        elif dimension == 'open_due_day':
+            if key < today.isoformat():
+                overdue += count
+        else:
+            counts[dimension][key] = count
+
+    overdue += Task.objects.filter(
+        is_completed=False,
+        due_date__gte=datetime.combine(today, time.min, tzinfo=timezone.utc),
+        due_date__lt=now,
+    ).count()
+
+    return {
+        'total': total,
+        'completed': counts['completed'].get('true', 0),
+        'open': counts['completed'].get('false', 0),
+        'overdue': overdue,
+        'by_priority': {priority: counts['priority'].get(priority, 0) for priority in PRIORITIES},
+        'by_category': counts['category'],
+        'by_user': counts['user'],
+    }
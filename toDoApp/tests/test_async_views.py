@@ -0,0 +1,110 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import AsyncClient, override_settings
+from django.urls import include, path
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .base_test import BaseTestCase
+from toDoApp.models import Category, OutboxEvent, Task
+
+urlpatterns = [
+    path('api/v1/', include(('toDoApp.async_urls', 'toDoApp'), namespace='v1')),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncViewsTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.category = Category.objects.create(name='Work')
+        self.task = Task.objects.create(
+            title='Task 1',
+            due_date=timezone.now() + timedelta(days=1),
+            category=self.category,
+            user=self.employer,
+        )
+        self.client.force_authenticate(user=self.employer)
+
+    def test_task_list(self):
+        response = self.client.get('/api/v1/tasks/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['count'], 1)
+        self.assertEqual(response.data['data']['results'][0]['id'], self.task.id)
+
+        response = self.client.get(f'/api/v1/tasks/?category={self.category.id}&pagination=cursor&count=true')
+        self.assertEqual(response.data['data']['skipped'], 0)
+        self.assertEqual(len(response.data['data']['results']), 1)
+
+        response = self.client.get('/api/v1/tasks/?page=5')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(TASK_CACHE_ENABLED=True)
+    def test_cached_task_detail_is_invalidated(self):
+        url = f'/api/v1/tasks/{self.task.id}/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.patch(url, {'is_completed': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['data']['is_completed'])
+
+    def test_create_task_records_event(self):
+        response = self.client.post('/api/v1/tasks/', {
+            'title': 'Task 2',
+            'due_date': (timezone.now() + timedelta(days=1)).isoformat(),
+            'priority': 'high',
+            'category': self.category.id,
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Task.objects.count(), 2)
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+
+        response = self.client.post('/api/v1/tasks/', {'title': 'Task 3', 'category': 9000}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('category', response.data['errors'])
+
+    def test_missing_task_and_permissions(self):
+        self.assertEqual(self.client.get('/api/v1/tasks/9000/').status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(user=self.employee)
+        response = self.client.delete(f'/api/v1/tasks/{self.task.id}/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get('/api/v1/tasks/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_categories(self):
+        response = self.client.post('/api/v1/categories/', {'name': 'Home'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post('/api/v1/categories/', {'name': 'Home'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get('/api/v1/categories/?name=home')
+        self.assertEqual(response.data['data']['count'], 1)
+
+        category_id = Category.objects.get(name='Home').id
+        response = self.client.delete(f'/api/v1/categories/{category_id}/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    async def test_served_from_the_event_loop(self):
+        client = AsyncClient()
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(self.employer)}'}
+
+        response = await client.get(f'/api/v1/tasks/{self.task.id}/', headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['data']['title'], 'Task 1')
+        # Queries run in sync_to_async threads are still counted.
+        self.assertNotEqual(response['X-Query-Count'], '0')
+
+        response = await client.delete(f'/api/v1/tasks/{self.task.id}/', headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(await Task.objects.filter(id=self.task.id).aexists())
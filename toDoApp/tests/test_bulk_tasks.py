@@ -0,0 +1,140 @@
+from datetime import timedelta
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework import status
+
+from .base_test import BaseTestCase
+from toDoApp.models import Category, OutboxEvent, Task
+
+
+class TaskBulkTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.work = Category.objects.create(name='Work')
+        self.home = Category.objects.create(name='Home')
+        self.client.force_authenticate(user=self.employer)
+
+    def item(self, title, category):
+        return {
+            'title': title,
+            'due_date': (timezone.now() + timedelta(days=1)).isoformat(),
+            'priority': 'medium',
+            'category': category.id,
+        }
+
+    def make_tasks(self, count):
+        return [
+            Task.objects.create(
+                title=f'Task {i}',
+                due_date=timezone.now() + timedelta(days=1),
+                category=self.work,
+                user=self.employer,
+            )
+            for i in range(count)
+        ]
+
+    def test_bulk_create(self):
+        items = [self.item(f'Task {i}', self.work if i % 2 else self.home) for i in range(10)]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/v1/tasks/bulk/', items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']), 10)
+        self.assertTrue(all(task['id'] for task in response.data['data']))
+        self.assertEqual(Task.objects.filter(user=self.employer).count(), 10)
+        self.assertEqual(OutboxEvent.objects.filter(topic='task_topic').count(), 10)
+
+        statements = [query['sql'] for query in queries.captured_queries]
+        self.assertEqual(sum('FROM "toDoApp_category"' in sql for sql in statements), 1)
+        self.assertEqual(sum(sql.startswith('INSERT INTO "toDoApp_task"') for sql in statements), 1)
+        self.assertEqual(sum(sql.startswith('INSERT INTO "toDoApp_outboxevent"') for sql in statements), 1)
+
+    def test_invalid_item_rejects_the_batch(self):
+        items = [self.item('Task 1', self.work), {**self.item('Task 2', self.work), 'category': 9000}, self.item('Bad', self.work)]
+
+        response = self.client.post('/api/v1/tasks/bulk/', items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        self.assertIn('category', response.data['errors'][0]['errors'])
+        self.assertIn('title', response.data['errors'][1]['errors'])
+        self.assertFalse(Task.objects.exists())
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    @override_settings(TASK_BULK_MAX_ITEMS=2)
+    def test_batch_size_is_limited(self):
+        items = [self.item(f'Task {i}', self.work) for i in range(3)]
+        response = self.client.post('/api/v1/tasks/bulk/', items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post('/api/v1/tasks/bulk/', {'title': 'Task 1'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update(self):
+        first, second = self.make_tasks(2)
+
+        response = self.client.patch('/api/v1/tasks/bulk/', [
+            {'id': first.id, 'is_completed': True},
+            {'id': second.id, 'category': self.home.id, 'priority': 'high'},
+        ], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertTrue(first.is_completed)
+        self.assertEqual((second.category, second.priority), (self.home, 'high'))
+        self.assertEqual(OutboxEvent.objects.count(), 2)
+
+    def test_bulk_update_reports_unknown_and_duplicate_ids(self):
+        task, = self.make_tasks(1)
+
+        response = self.client.patch('/api/v1/tasks/bulk/', [
+            {'id': task.id, 'is_completed': True},
+            {'id': task.id, 'priority': 'high'},
+            {'id': 9000, 'priority': 'high'},
+        ], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        task.refresh_from_db()
+        self.assertFalse(task.is_completed)
+
+    def test_bulk_update_rejects_boolean_ids(self):
+        # True == 1, so a lookup by it would find this task.
+        task = Task.objects.create(
+            id=1, title='Task', due_date=timezone.now() + timedelta(days=1), category=self.work, user=self.employer,
+        )
+
+        response = self.client.patch('/api/v1/tasks/bulk/', [{'id': True, 'is_completed': True}], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['errors'], [{'index': 0, 'errors': {'id': ["Task not found."]}}])
+        task.refresh_from_db()
+        self.assertFalse(task.is_completed)
+
+    def test_bulk_delete(self):
+        tasks = self.make_tasks(3)
+        ids = [task.id for task in tasks[:2]]
+
+        response = self.client.delete('/api/v1/tasks/bulk/', {'ids': ids + [9000]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data'], {'deleted': ids, 'not_found': [9000]})
+        self.assertEqual(list(Task.objects.values_list('id', flat=True)), [tasks[2].id])
+        self.assertEqual(OutboxEvent.objects.count(), 2)
+
+    def test_employee_cannot_bulk_create_or_delete(self):
+        task, = self.make_tasks(1)
+        self.client.force_authenticate(user=self.employee)
+
+        response = self.client.post('/api/v1/tasks/bulk/', [self.item('Task 1', self.work)], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.delete('/api/v1/tasks/bulk/', {'ids': [task.id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(Task.objects.filter(id=task.id).exists())
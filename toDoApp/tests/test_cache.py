@@ -0,0 +1,97 @@
+from unittest.mock import patch
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django_redis.exceptions import ConnectionInterrupted
+from rest_framework import status
+
+from .base_test import BaseTestCase
+from toDoApp.cache import QueryCache, category_cache
+from toDoApp.models import Category
+
+
+class QueryCacheTest(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.cache = QueryCache('test')
+
+    def test_parameter_order_and_empty_values_do_not_change_key(self):
+        self.assertEqual(
+            self.cache.normalize({'page': '2', 'name': ['b', 'a'], 'title': ''}),
+            self.cache.normalize({'name': ['a', 'b'], 'page': 2}),
+        )
+
+    def test_bump_invalidates_every_variant(self):
+        self.cache.get_or_set({'page': 1}, lambda: 'one')
+        self.cache.get_or_set({'page': 2}, lambda: 'two')
+        self.cache.bump()
+
+        self.assertEqual(self.cache.get_or_set({'page': 1}, lambda: 'new one'), 'new one')
+        self.assertEqual(self.cache.get_or_set({'page': 2}, lambda: 'new two'), 'new two')
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return 'value'
+
+        threads = [threading.Thread(target=self.cache.get_or_set, args=({'page': 1}, compute)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.cache.stats(), {'hits': 7, 'misses': 1, 'errors': 0})
+
+    @patch('toDoApp.cache._retry_after', 0.0)
+    def test_unreachable_cache_falls_back_to_compute(self):
+        with patch('toDoApp.cache.cache.get', side_effect=ConnectionInterrupted(None)) as cache_get:
+            self.assertEqual(self.cache.get_or_set({'page': 1}, lambda: 'value'), 'value')
+            self.assertEqual(self.cache.get_or_set({'page': 1}, lambda: 'value'), 'value')
+
+        # The second call skipped the cache instead of waiting on Redis again.
+        self.assertEqual(cache_get.call_count, 1)
+        self.assertEqual(self.cache.stats()['errors'], 1)
+
+
+class CategoryListCacheTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        Category.objects.bulk_create([Category(name=f'Category {i}') for i in range(15)])
+        self.client.force_authenticate(user=self.employer)
+
+    def names(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [category['name'] for category in response.data['data']['results']]
+
+    def test_pages_and_filters_are_cached_separately(self):
+        self.assertEqual(len(self.names('/api/v1/categories/')), 10)
+        self.assertEqual(len(self.names('/api/v1/categories/?page=2')), 5)
+        self.assertEqual(self.names('/api/v1/categories/?name=Category 1'), [f'Category {i}' for i in [1, 10, 11, 12, 13, 14]])
+
+    def test_repeated_request_is_served_from_cache(self):
+        self.names('/api/v1/categories/')
+        category_cache.reset_stats()
+        with self.assertNumQueries(0):
+            self.names('/api/v1/categories/')
+        self.assertEqual(category_cache.stats()['hits'], 1)
+
+    def test_create_update_and_delete_invalidate(self):
+        category = Category.objects.create(name='Zeta')
+        self.assertIn('Zeta', self.names('/api/v1/categories/?name=Zeta'))
+
+        category.name = 'Zeta Prime'
+        category.save()
+        self.assertEqual(self.names('/api/v1/categories/?name=Zeta'), ['Zeta Prime'])
+
+        category.delete()
+        self.assertEqual(self.names('/api/v1/categories/?name=Zeta'), [])
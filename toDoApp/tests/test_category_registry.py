@@ -0,0 +1,80 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from toDoApp.categories import category_registry
+from toDoApp.models import Category
+from toDoApp.serializers.category_serializer import CategorySerializer
+from toDoApp.serializers.task_serializer import TaskSerializer
+
+
+# Committed writes, so the registry keeps what it loads (see toDoApp/categories.py).
+class CategoryRegistryTest(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        category_registry.clear()
+        self.work = Category.objects.create(name='Work')
+        self.home = Category.objects.create(name='Home')
+
+    def test_lookups_do_not_query_once_loaded(self):
+        category_registry.get(self.work.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(category_registry.get(self.work.pk).name, 'Work')
+            self.assertEqual(set(category_registry.in_bulk([self.work.pk, self.home.pk, 0])), {self.work.pk, self.home.pk})
+            self.assertTrue(category_registry.name_taken('Home'))
+            self.assertFalse(category_registry.name_taken('Garden'))
+            with self.assertRaises(Category.DoesNotExist):
+                category_registry.get(0)
+
+    def test_changes_are_seen_on_the_next_lookup(self):
+        category_registry.get(self.work.pk)
+
+        self.work.name = 'Office'
+        self.work.save()
+        garden = Category.objects.create(name='Garden')
+        self.home.delete()
+
+        self.assertEqual(category_registry.get(self.work.pk).name, 'Office')
+        self.assertEqual(category_registry.get(garden.pk).name, 'Garden')
+        self.assertFalse(category_registry.name_taken('Work'))
+        with self.assertRaises(Category.DoesNotExist):
+            category_registry.get(self.home.pk)
+
+    def test_rows_of_a_rolled_back_transaction_are_not_kept(self):
+        with transaction.atomic():
+            temporary = Category.objects.create(name='Temporary')
+            self.assertEqual(category_registry.get(temporary.pk).name, 'Temporary')
+            transaction.set_rollback(True)
+
+        with self.assertRaises(Category.DoesNotExist):
+            category_registry.get(temporary.pk)
+        self.assertFalse(category_registry.name_taken('Temporary'))
+
+    def test_serializers_validate_without_queries(self):
+        category_registry.get(self.work.pk)
+        due_date = (timezone.now() + timedelta(days=1)).isoformat()
+
+        with self.assertNumQueries(0):
+            task = TaskSerializer(data={'title': 'Write report', 'due_date': due_date, 'category': self.work.pk})
+            self.assertTrue(task.is_valid(), task.errors)
+            self.assertEqual(task.validated_data['category'], self.work)
+
+            missing = TaskSerializer(data={'title': 'Write report', 'category': 0})
+            self.assertFalse(missing.is_valid())
+            self.assertEqual(missing.errors['category'][0].code, 'does_not_exist')
+
+            duplicate = CategorySerializer(data={'name': 'Home'})
+            self.assertFalse(duplicate.is_valid())
+            self.assertTrue(CategorySerializer(data={'name': 'Garden'}).is_valid())
+
+    def test_queries_without_the_cache(self):
+        with patch('toDoApp.categories.cache_available', return_value=False):
+            with self.assertNumQueries(2):
+                self.assertEqual(category_registry.get(self.home.pk).name, 'Home')
+                self.assertTrue(category_registry.name_taken('Work'))
@@ -0,0 +1,90 @@
+from contextlib import nullcontext
+from types import SimpleNamespace
+import threading
+
+from django.test import SimpleTestCase
+from psycopg2 import OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS, TRANSACTION_STATUS_UNKNOWN
+
+from toDoApp.pooled_postgresql.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+
+    def __init__(self, healthy=True):
+        self.closed = 0
+        self.healthy = healthy
+        self.info = SimpleNamespace(transaction_status=TRANSACTION_STATUS_IDLE)
+        self.rolled_back = False
+
+    def rollback(self):
+        self.rolled_back = True
+        self.info.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+    def cursor(self):
+        if not self.healthy:
+            raise OperationalError("server closed the connection unexpectedly")
+        return nullcontext(SimpleNamespace(execute=lambda sql: None))
+
+
+class ConnectionPoolTest(SimpleTestCase):
+
+    def test_reuses_returned_connections(self):
+        pool = ConnectionPool('default', max_size=2)
+        first, created = pool.get(FakeConnection)
+        self.assertTrue(created)
+        pool.put(first)
+
+        self.assertEqual(pool.get(FakeConnection), (first, False))
+        self.assertEqual(pool.stats()['connects'], 1)
+
+    def test_rolls_back_or_discards_on_return(self):
+        pool = ConnectionPool('default', max_size=2)
+        open_transaction, _ = pool.get(FakeConnection)
+        lost, _ = pool.get(FakeConnection)
+        open_transaction.info.transaction_status = TRANSACTION_STATUS_INTRANS
+        lost.info.transaction_status = TRANSACTION_STATUS_UNKNOWN
+
+        pool.put(open_transaction)
+        pool.put(lost)
+
+        self.assertTrue(open_transaction.rolled_back)
+        self.assertTrue(lost.closed)
+        stats = pool.stats()
+        self.assertEqual((stats['size'], stats['idle']), (1, 1))
+
+    def test_checks_idle_connections_before_reuse(self):
+        pool = ConnectionPool('default', max_size=1, check_after=0)
+        broken, _ = pool.get(lambda: FakeConnection(healthy=False))
+        pool.put(broken)
+
+        connection, created = pool.get(FakeConnection)
+
+        self.assertTrue(broken.closed)
+        self.assertIsNot(connection, broken)
+        self.assertTrue(created)
+
+    def test_waits_for_a_connection_then_times_out(self):
+        pool = ConnectionPool('default', max_size=1, timeout=0.05)
+        connection, _ = pool.get(FakeConnection)
+
+        with self.assertRaises(PoolTimeout):
+            pool.get(FakeConnection)
+
+        threading.Timer(0.01, pool.put, [connection]).start()
+        pool.timeout = 5
+        self.assertEqual(pool.get(FakeConnection), (connection, False))
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_failed_connect_frees_its_slot(self):
+        pool = ConnectionPool('default', max_size=1, timeout=0)
+
+        def refuse():
+            raise OperationalError("connection refused")
+
+        with self.assertRaises(OperationalError):
+            pool.get(refuse)
+        self.assertTrue(pool.get(FakeConnection)[1])
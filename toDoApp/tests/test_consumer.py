@@ -0,0 +1,131 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+
+from .base_test import BaseTestCase
+from toDoApp.models import Category, Task
+from toDoApp.kafka.consumer import HandlerRegistry, TaskEventConsumer, load_handlers, registry
+from toDoApp.kafka.events import TaskEventV1, encode_event
+from toDoApp.kafka.fake_broker import FakeBroker
+
+
+class TaskEventConsumerTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name='Work')
+        self.broker = FakeBroker()
+        self.registry = HandlerRegistry()
+        self.batches = []
+
+        @self.registry.register(TaskEventV1.name, 'created')
+        def complete_tasks(events):
+            self.batches.append(len(events))
+            Task.objects.filter(id__in=[event['task_id'] for event in events]).update(is_completed=True)
+
+        self.tasks = [self.publish(f'Task {i}') for i in range(5)]
+
+    def publish(self, title):
+        task = Task.objects.create(
+            title=title,
+            due_date=timezone.now() + timedelta(days=1),
+            category=self.category,
+            user=self.employer,
+        )
+        self.publish_event(task, 'created')
+        return task
+
+    def publish_event(self, task, event_type):
+        value, headers = encode_event(TaskEventV1.name, TaskEventV1.build(task, event_type))
+        self.broker.append('task_topic', str(task.user_id).encode(), value, headers)
+
+    def make_consumer(self, **kwargs):
+        consumer = self.broker.consumer('task_topic', group_id='test')
+        return TaskEventConsumer(consumer, registry=self.registry, poll_timeout_ms=0, **kwargs)
+
+    def test_batch_is_dispatched_and_committed(self):
+        consumer = self.make_consumer()
+
+        self.assertEqual(consumer.poll_once(), 5)
+        self.assertEqual(self.batches, [5])
+        self.assertEqual(Task.objects.filter(is_completed=True).count(), 5)
+
+        self.assertEqual(sum(self.broker.committed.values()), 5)
+        self.assertEqual(consumer.poll_once(), 0)
+
+        stats = consumer.metrics.snapshot()
+        self.assertEqual((stats['records'], stats['batches'], stats['lag']), (5, 1, 0))
+
+    def test_batches_respect_max_records(self):
+        consumer = self.make_consumer(max_records=2)
+        while consumer.poll_once():
+            pass
+        self.assertEqual(self.batches, [2, 2, 1])
+
+    def test_failed_batch_is_not_committed_and_is_retried(self):
+        @self.registry.register(TaskEventV1.name, 'created')
+        def fail_once(events):
+            if len(self.batches) == 1:
+                raise RuntimeError("handler failed")
+
+        consumer = self.make_consumer()
+        with self.assertRaises(RuntimeError):
+            consumer.poll_once()
+        self.assertEqual(self.broker.committed, {})
+        self.assertEqual(Task.objects.filter(is_completed=True).count(), 0)
+
+        self.assertEqual(consumer.poll_once(), 5)
+        self.assertEqual(Task.objects.filter(is_completed=True).count(), 5)
+
+    def test_undecodable_records_are_skipped(self):
+        self.broker.append('task_topic', None, b'not an event', [])
+        consumer = self.make_consumer()
+
+        self.assertEqual(consumer.poll_once(), 6)
+        self.assertEqual(consumer.metrics.snapshot()['skipped'], 1)
+
+    def test_lag_is_reported_per_partition(self):
+        consumer = self.make_consumer(max_records=1)
+        consumer.poll_once()
+        consumer.update_lag(force=True)
+        self.assertEqual(consumer.metrics.snapshot()['lag'], 4)
+
+    def test_consumers_split_partitions(self):
+        first = TaskEventConsumer(self.broker.consumer('task_topic', group_id='test', partitions=[0]), registry=self.registry)
+        second = TaskEventConsumer(self.broker.consumer('task_topic', group_id='test', partitions=[1, 2]), registry=self.registry)
+
+        self.assertEqual(first.poll_once() + second.poll_once(), 5)
+
+    def test_events_of_a_key_are_handled_in_offset_order(self):
+        handled = []
+        for event_type in TaskEventV1.EVENT_TYPES:
+            self.registry.register(TaskEventV1.name, event_type)(
+                lambda events: handled.extend((event['type'], event['task_id']) for event in events)
+            )
+        self.publish_event(self.tasks[0], 'updated')
+        self.publish_event(self.tasks[1], 'created')
+        self.publish_event(self.tasks[0], 'deleted')
+
+        self.make_consumer().poll_once()
+
+        self.assertEqual(handled[5:], [
+            ('updated', self.tasks[0].pk), ('created', self.tasks[1].pk), ('deleted', self.tasks[0].pk),
+        ])
+
+    def test_registry_without_handlers_is_refused(self):
+        with self.assertRaises(ImproperlyConfigured):
+            TaskEventConsumer(self.broker.consumer('task_topic', group_id='test'), registry=HandlerRegistry())
+
+    def test_shipped_handlers_invalidate_the_task_cache(self):
+        load_handlers()
+        self.publish_event(self.tasks[0], 'updated')
+        self.publish_event(self.tasks[1], 'deleted')
+        consumer = TaskEventConsumer(self.broker.consumer('task_topic', group_id='test'), registry=registry, poll_timeout_ms=0)
+
+        with patch('toDoApp.kafka.handlers.invalidate_task_cache') as invalidate:
+            consumer.poll_once()
+
+        invalidated = {pk for call in invalidate.call_args_list for pk in call.args}
+        self.assertEqual(invalidated, {task.pk for task in self.tasks})
@@ -0,0 +1,64 @@
+from datetime import timedelta
+import unittest
+
+from django.test import override_settings
+from django.utils import timezone
+
+from .base_test import BaseTestCase
+from toDoApp.models import Category, Task
+from toDoApp.kafka import events
+from toDoApp.kafka.events import TaskEventV1, decode_event, encode_event
+from toDoApp.kafka.fake_broker import FakeBroker
+from toDoApp.kafka.outbox import enqueue, relay_batch
+from toDoApp.kafka.producer import get_producer_config
+
+
+class TaskEventTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name='Work')
+        self.task = Task.objects.create(
+            title='Task 1',
+            description='Descripción with ünïcode',
+            due_date=timezone.now() + timedelta(days=1),
+            category=self.category,
+            user=self.employer,
+        )
+        self.event = TaskEventV1.build(self.task, 'created')
+
+    def assertRoundTrip(self, encoding):
+        value, headers = encode_event(TaskEventV1.name, self.event, encoding)
+        self.assertEqual(decode_event(value, headers), (TaskEventV1.name, self.event))
+        self.assertIn(('encoding', encoding.encode()), headers)
+
+    def test_json_round_trip(self):
+        self.assertRoundTrip('json')
+
+    def test_struct_round_trip(self):
+        self.assertRoundTrip('struct')
+
+    @unittest.skipIf(events.msgpack is None, "msgpack is not installed")
+    def test_msgpack_round_trip(self):
+        self.assertRoundTrip('msgpack')
+
+    def test_struct_round_trip_without_due_date(self):
+        self.event['due_date'] = None
+        self.assertRoundTrip('struct')
+
+    def test_struct_is_smaller_than_json(self):
+        struct_value, _ = encode_event(TaskEventV1.name, self.event, 'struct')
+        json_value, _ = encode_event(TaskEventV1.name, self.event, 'json')
+        self.assertLess(len(struct_value), len(json_value))
+
+    @override_settings(KAFKA_EVENT_ENCODING='struct')
+    def test_relay_encodes_events_with_headers(self):
+        broker = FakeBroker()
+        producer = broker.producer_class()(**get_producer_config())
+        enqueue('task_topic', self.event, key=self.task.user_id, schema=TaskEventV1.name)
+
+        relay_batch(producer)
+
+        [(key, value, headers)] = [record for log in broker.topics['task_topic'] for record in log]
+        self.assertEqual(key, str(self.employer.id).encode())
+        self.assertEqual(decode_event(value, headers), (TaskEventV1.name, self.event))
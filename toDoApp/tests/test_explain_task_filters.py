@@ -0,0 +1,17 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from .base_test import BaseTestCase
+from toDoApp.models import Task
+
+
+class ExplainTaskFiltersTest(BaseTestCase):
+
+    def test_reports_every_filter_combination_and_rolls_back_seed(self):
+        out = StringIO()
+        call_command('explain_task_filters', seed=200, stdout=out)
+
+        self.assertIn('Seeded 200 tasks.', out.getvalue())
+        self.assertIn('32 filter combinations', out.getvalue())
+        self.assertFalse(Task.objects.exists())
@@ -0,0 +1,175 @@
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from unittest import mock
+import threading
+import base64
+import time
+
+from google.auth import crypt, jwt
+from rest_framework import status
+import rsa
+
+from .base_test import BaseTestCase, User
+from toDoApp import google_auth
+from toDoApp.google_auth import GoogleCertCache, max_age
+
+# Generated once: pure-Python key generation is slow.
+PUBLIC_KEY, PRIVATE_KEY = rsa.newkeys(1024)
+
+
+def b64encode(number):
+    return base64.urlsafe_b64encode(number.to_bytes((number.bit_length() + 7) // 8, 'big')).rstrip(b'=').decode()
+
+
+class FakeResponse:
+
+    def __init__(self, data, headers):
+        self.data = data
+        self.headers = headers
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeJWKS:
+    """
+    A session serving a JWKS with our key, standing in for Google.
+    """
+
+    def __init__(self, kid='key-1', cache_control='public, max-age=3600', delay=0):
+        self.kid = kid
+        self.cache_control = cache_control
+        self.delay = delay
+        self.requests = 0
+
+    def get(self, url, timeout=None):
+        self.requests += 1
+        time.sleep(self.delay)
+        jwk = {'kty': 'RSA', 'alg': 'RS256', 'use': 'sig', 'kid': self.kid, 'n': b64encode(PUBLIC_KEY.n), 'e': b64encode(PUBLIC_KEY.e)}
+        return FakeResponse({'keys': [jwk]}, {'Cache-Control': self.cache_control})
+
+
+def id_token(kid='key-1', email='new@example.com', iss='https://accounts.google.com', aud='client-id'):
+    signer = crypt.RSASigner.from_string(PRIVATE_KEY.save_pkcs1('PEM'), key_id=kid)
+    now = int(time.time())
+    payload = {'iss': iss, 'aud': aud, 'sub': '1234', 'email': email, 'iat': now, 'exp': now + 300}
+    return jwt.encode(signer, payload).decode()
+
+
+class GoogleCertCacheTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.jwks = FakeJWKS()
+        self.certs = GoogleCertCache('https://certs.test/', session=self.jwks)
+        patcher = mock.patch.object(google_auth, 'google_certs', self.certs)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_certs_are_fetched_once(self):
+        for _ in range(3):
+            self.assertEqual(google_auth.verify_id_token(id_token())['email'], 'new@example.com')
+        self.assertEqual(self.jwks.requests, 1)
+
+    def test_expired_certs_are_refetched(self):
+        self.jwks.cache_control = 'max-age=0'
+        google_auth.verify_id_token(id_token())
+        google_auth.verify_id_token(id_token())
+        self.assertEqual(self.jwks.requests, 2)
+
+    def test_certs_are_refreshed_in_background_before_expiry(self):
+        self.jwks.cache_control = 'max-age=60'
+        self.certs.get()
+
+        with mock.patch('threading.Thread') as thread:
+            self.certs.get()
+        thread.assert_called_once_with(target=self.certs._refresh, daemon=True)
+
+        self.certs._refresh()
+        self.assertEqual(self.jwks.requests, 2)
+
+    def test_concurrent_misses_fetch_once(self):
+        self.jwks.delay = 0.05
+        barrier = threading.Barrier(8)
+
+        def login():
+            barrier.wait()
+            self.certs.get_for('key-1')
+
+        threads = [threading.Thread(target=login) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.jwks.requests, 1)
+
+    def test_unknown_key_id_refetches_once(self):
+        self.certs.get()
+        self.jwks.kid = 'key-2'
+        self.certs._last_fetch -= google_auth.UNKNOWN_KEY_REFETCH_INTERVAL
+
+        google_auth.verify_id_token(id_token(kid='key-2'))
+        with self.assertRaises(Exception):
+            google_auth.verify_id_token(id_token(kid='key-3'))
+        self.assertEqual(self.jwks.requests, 2)
+
+    def test_invalid_tokens(self):
+        with self.assertRaises(ValueError):
+            google_auth.verify_id_token(id_token(iss='https://evil.example.com'))
+
+        other_key = rsa.newkeys(512)[1]
+        forged = jwt.encode(crypt.RSASigner.from_string(other_key.save_pkcs1('PEM'), key_id='key-1'), {'iss': 'accounts.google.com'})
+        with self.assertRaises(Exception):
+            google_auth.verify_id_token(forged.decode())
+
+    def test_max_age(self):
+        self.assertEqual(max_age({'Cache-Control': 'public, max-age=20000, must-revalidate', 'Age': '100'}), 19900)
+        self.assertEqual(max_age({'Cache-Control': 'no-cache'}), 0)
+        self.assertEqual(max_age({}), google_auth.DEFAULT_MAX_AGE)
+
+
+@override_settings(GOOGLE_CLIENT_ID='client-id', SOCIAL_AUTH_PASSWORD='social-password')
+class GoogleSignInTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(google_auth, 'google_certs', GoogleCertCache('https://certs.test/', session=FakeJWKS()))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def sign_in(self, token):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/v1/google/', {'id_token': token})
+        return response, [query['sql'] for query in queries.captured_queries if 'customuser"' in query['sql'] or 'customuser`' in query['sql']]
+
+    def test_new_user_is_written_once(self):
+        with mock.patch('toDoApp.utils.make_password', wraps=make_password) as hasher:
+            response, queries = self.sign_in(id_token())
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(hasher.call_count, 1)
+        self.assertEqual([sql.split()[0] for sql in queries], ['SELECT', 'INSERT'])
+
+        user = User.objects.get(email='new@example.com')
+        self.assertEqual(user.auth_provider, 'google')
+        self.assertTrue(user.check_password('social-password'))
+
+    def test_existing_user_is_only_read(self):
+        self.sign_in(id_token(email='employer@example.com'))
+
+        with mock.patch('toDoApp.utils.make_password') as hasher:
+            response, queries = self.sign_in(id_token(email='employer@example.com'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        hasher.assert_not_called()
+        self.assertEqual([sql.split()[0] for sql in queries], ['SELECT'])
+
+    def test_wrong_audience_is_rejected(self):
+        response, _ = self.sign_in(id_token(aud='someone-else'))
+        self.assertNotEqual(response.status_code, status.HTTP_200_OK)
+
@@ -0,0 +1,61 @@
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from io import StringIO
+
+from .base_test import BaseTestCase, Employee, Employer
+from toDoApp.groups import _group_ids, bootstrap_groups
+
+
+class RoleGroupTest(BaseTestCase):
+
+    def test_user_creation_only_checks_the_group_and_inserts_membership(self):
+        Employee.objects.create_user(email='first@example.com', password='password')
+
+        with CaptureQueriesContext(connection) as queries:
+            user = Employer.objects.create_user(email='second@example.com', password='password')
+
+        statements = [query['sql'] for query in queries.captured_queries if not query['sql'].startswith(('SAVEPOINT', 'RELEASE'))]
+        self.assertEqual([sql.split()[0] for sql in statements], ['INSERT', 'SELECT', 'INSERT'])
+        self.assertEqual(list(user.groups.all()), [self.employer_group])
+
+    def test_group_deleted_after_caching_is_resolved_again(self):
+        Employee.objects.create_user(email='first@example.com', password='password')
+        cached = dict(_group_ids)
+        Group.objects.filter(name='Employees').delete()
+        # As if another process deleted it: this one still has the old id.
+        _group_ids.update(cached)
+
+        employee = Employee.objects.create_user(email='second@example.com', password='password')
+
+        group = employee.groups.get()
+        self.assertEqual(group.name, 'Employees')
+        self.assertNotEqual(group.id, cached[employee.role])
+
+    def test_missing_groups_are_bootstrapped(self):
+        Group.objects.all().delete()
+
+        employee = Employee.objects.create_user(email='new@example.com', password='password')
+
+        group = employee.groups.get()
+        self.assertEqual(group.name, 'Employees')
+        self.assertEqual(
+            set(group.permissions.values_list('codename', flat=True)),
+            {'change_task', 'delete_task', 'view_task', 'view_category'},
+        )
+        self.assertTrue(Group.objects.filter(name='Employers').exists())
+
+    def test_bootstrap_is_idempotent(self):
+        Group.objects.filter(name='Employers').delete()
+
+        self.assertEqual(bootstrap_groups(), ['Employers'])
+        with self.assertNumQueries(1):
+            self.assertEqual(bootstrap_groups(), [])
+
+        out = StringIO()
+        call_command('bootstrap_groups', stdout=out)
+        self.assertIn('already exist', out.getvalue())
+
+    def test_existing_group_permissions_are_kept(self):
+        self.assertFalse(Employee.objects.create_user(email='new@example.com', password='password').has_perm('toDoApp.delete_task'))
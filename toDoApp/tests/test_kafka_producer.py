@@ -0,0 +1,72 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from kafka.errors import KafkaTimeoutError, NoBrokersAvailable
+
+from toDoApp.kafka import producer
+from toDoApp.kafka.fake_broker import FakeBroker
+
+
+@patch.dict('os.environ', {'KAFKA_BOOTSTRAP_SERVER': 'fake:9092'})
+class ProducerTest(SimpleTestCase):
+
+    def setUp(self):
+        self.broker = FakeBroker()
+        patcher = patch.object(producer, 'KafkaProducer', self.broker.producer_class())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        producer.reset_producer()
+        producer.reset_stats()
+        self.addCleanup(producer.reset_producer)
+
+    def test_producer_is_reused_across_messages(self):
+        producer.produce_message('task_topic', {'title': 'Task 1'})
+        producer.produce_message('task_topic', {'title': 'Task 2'})
+
+        self.assertEqual(self.broker.connections, 1)
+        self.assertEqual(len(self.broker.messages('task_topic')), 2)
+        self.assertEqual(producer.get_stats(), {'sent': 2, 'delivered': 2, 'failed': 0})
+
+    def test_producer_is_rebuilt_in_forked_process(self):
+        first = producer.get_producer()
+        with patch('os.getpid', return_value=-1):
+            second = producer.get_producer()
+
+        self.assertIsNot(first, second)
+        self.assertEqual(self.broker.connections, 2)
+
+    def test_messages_with_same_key_share_a_partition(self):
+        for i in range(5):
+            producer.produce_message('task_topic', {'n': i}, key='user-1')
+
+        partitions = [log for log in self.broker.topics['task_topic'] if log]
+        self.assertEqual(len(partitions), 1)
+        self.assertEqual(partitions[0][0][0], b'user-1')
+
+    def test_failed_delivery_calls_error_callbacks(self):
+        failures = []
+        callback = lambda topic, message, exception: failures.append((topic, message))
+        producer.add_error_callback(callback)
+        self.addCleanup(producer.remove_error_callback, callback)
+
+        self.broker.fail_sends = KafkaTimeoutError()
+        producer.produce_message('task_topic', {'title': 'Task 1'})
+
+        self.assertEqual(failures, [('task_topic', {'title': 'Task 1'})])
+        self.assertEqual(producer.get_stats()['failed'], 1)
+
+    def test_unreachable_brokers_are_not_retried_immediately(self):
+        with patch.object(producer, 'KafkaProducer', side_effect=NoBrokersAvailable()) as kafka_producer:
+            with self.assertRaises(NoBrokersAvailable):
+                producer.produce_message('task_topic', {})
+            with self.assertRaises(NoBrokersAvailable):
+                producer.produce_message('task_topic', {})
+
+        self.assertEqual(kafka_producer.call_count, 1)
+
+    def test_nothing_is_sent_without_bootstrap_server(self):
+        with patch.dict('os.environ', {'KAFKA_BOOTSTRAP_SERVER': ''}):
+            self.assertIsNone(producer.produce_message('task_topic', {}))
+        self.assertEqual(self.broker.connections, 0)
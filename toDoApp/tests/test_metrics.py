@@ -0,0 +1,81 @@
+from django.core.cache import cache
+from django.test import override_settings
+
+from kafka.errors import KafkaTimeoutError
+from prometheus_client import REGISTRY
+
+from .base_test import BaseTestCase
+from toDoApp.models import Category
+from toDoApp.kafka.fake_broker import FakeBroker
+from toDoApp.kafka.outbox import enqueue, relay_batch
+from toDoApp.kafka.producer import get_producer_config
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        Category.objects.create(name='Work')
+        self.client.force_authenticate(user=self.employer)
+
+    def test_requests_are_measured_per_view_method_and_status(self):
+        labels = {'view': 'v1:category-list-create', 'method': 'GET', 'status': '200'}
+        requests = sample('todo_http_request_duration_seconds_count', **labels)
+        queries = sample('todo_db_queries_total', view='v1:category-list-create')
+
+        self.client.get('/api/v1/categories/')
+
+        self.assertEqual(sample('todo_http_request_duration_seconds_count', **labels), requests + 1)
+        self.assertGreater(sample('todo_db_queries_total', view='v1:category-list-create'), queries)
+
+    def test_cache_hits_and_misses_per_namespace(self):
+        hits = sample('todo_cache_requests_total', cache='categories', result='hit')
+        misses = sample('todo_cache_requests_total', cache='categories', result='miss')
+
+        self.client.get('/api/v1/categories/')
+        self.client.get('/api/v1/categories/')
+
+        self.assertEqual(sample('todo_cache_requests_total', cache='categories', result='hit'), hits + 1)
+        self.assertEqual(sample('todo_cache_requests_total', cache='categories', result='miss'), misses + 1)
+
+    def test_page_depth(self):
+        deep = sample('todo_pagination_page_number_bucket', view='TaskList', le='5.0')
+        self.client.get('/api/v1/tasks/?page=4')
+        self.client.get('/api/v1/tasks/?pagination=cursor')
+        self.assertEqual(sample('todo_pagination_page_number_bucket', view='TaskList', le='5.0'), deep + 1)
+
+    def test_kafka_sends_and_failures(self):
+        broker = FakeBroker()
+        producer = broker.producer_class()(**get_producer_config())
+        sent = sample('todo_kafka_send_duration_seconds_count', topic='metrics_topic')
+        failed = sample('todo_kafka_send_failures_total', topic='metrics_topic')
+
+        enqueue('metrics_topic', {'n': 1})
+        relay_batch(producer)
+        broker.fail_sends = KafkaTimeoutError()
+        enqueue('metrics_topic', {'n': 2})
+        relay_batch(producer)
+
+        self.assertEqual(sample('todo_kafka_send_duration_seconds_count', topic='metrics_topic'), sent + 1)
+        self.assertEqual(sample('todo_kafka_send_failures_total', topic='metrics_topic'), failed + 1)
+
+    def test_metrics_endpoint(self):
+        self.client.get('/api/v1/categories/')
+
+        with override_settings(METRICS_TOKEN='secret'):
+            response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(b'todo_http_request_duration_seconds_bucket{', response.content)
+
+            self.assertEqual(self.client.get('/metrics').status_code, 401)
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_metrics_endpoint_is_closed_without_a_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer ').status_code, 403)
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from django.utils import timezone
+
+from kafka.errors import KafkaTimeoutError
+
+from .base_test import BaseTestCase
+from toDoApp.models import Category, OutboxEvent, Task
+from toDoApp.kafka.fake_broker import FakeBroker
+from toDoApp.kafka.outbox import _in_key_order, enqueue, relay_batch
+from toDoApp.kafka.producer import get_producer_config
+
+
+class OutboxTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name='Work')
+        self.broker = FakeBroker()
+        self.producer = self.broker.producer_class()(**get_producer_config())
+
+    def test_task_creation_writes_outbox_event(self):
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.post('/api/v1/tasks/', {
+            'title': 'Task 2',
+            'description': 'New task description',
+            'due_date': (timezone.now() + timedelta(days=1)).isoformat(),
+            'priority': 'medium',
+            'category': self.category.id,
+        })
+        self.assertEqual(response.status_code, 200)
+
+        event = OutboxEvent.objects.get()
+        self.assertEqual(event.topic, 'task_topic')
+        self.assertEqual(event.key, str(self.employer.id))
+        self.assertEqual(event.schema, 'task.v1')
+        self.assertEqual(event.payload['task_id'], response.data['data']['id'])
+
+    def test_task_update_and_delete_write_outbox_events(self):
+        task = Task.objects.create(title='Task 1', due_date=timezone.now() + timedelta(days=1), category=self.category, user=self.employer)
+        self.client.force_authenticate(user=self.employer)
+
+        self.assertEqual(self.client.patch(f'/api/v1/tasks/{task.pk}/', {'title': 'Task 2'}).status_code, 200)
+        self.assertEqual(self.client.delete(f'/api/v1/tasks/{task.pk}/').status_code, 200)
+
+        events = [event.payload for event in OutboxEvent.objects.order_by('id')]
+        self.assertEqual([(event['type'], event['task_id']) for event in events], [('updated', task.pk), ('deleted', task.pk)])
+        self.assertEqual(events[0]['title'], 'Task 2')
+
+    def test_failed_task_creation_writes_no_event(self):
+        self.client.force_authenticate(user=self.employer)
+        self.client.post('/api/v1/tasks/', {'title': 'Task 2'})
+        self.assertFalse(Task.objects.filter(title='Task 2').exists())
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_relay_sends_and_deletes_events_in_order(self):
+        for i in range(3):
+            enqueue('task_topic', {'n': i}, key='user-1')
+
+        self.assertEqual(relay_batch(self.producer), (3, 0))
+        self.assertFalse(OutboxEvent.objects.exists())
+        self.assertEqual(self.broker.messages('task_topic'), [b'{"n": 0}', b'{"n": 1}', b'{"n": 2}'])
+
+    def test_failed_event_backs_off_and_holds_back_later_events_for_key(self):
+        enqueue('task_topic', {'n': 0}, key='user-1')
+        self.broker.fail_sends = KafkaTimeoutError()
+        self.assertEqual(relay_batch(self.producer), (0, 1))
+
+        failed = OutboxEvent.objects.get()
+        self.assertEqual(failed.attempts, 1)
+        self.assertGreater(failed.available_at, timezone.now())
+
+        self.broker.fail_sends = None
+        enqueue('task_topic', {'n': 1}, key='user-1')
+        enqueue('task_topic', {'n': 2}, key='user-2')
+
+        self.assertEqual(relay_batch(self.producer), (1, 0))
+        self.assertEqual(self.broker.messages('task_topic'), [b'{"n": 2}'])
+
+        OutboxEvent.objects.update(available_at=timezone.now())
+        self.assertEqual(relay_batch(self.producer), (2, 0))
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_event_that_cannot_be_encoded_is_marked_failed(self):
+        enqueue('task_topic', {'n': 0}, key='user-1', schema='unknown.v1')
+        enqueue('task_topic', {'n': 1}, key='user-2')
+
+        self.assertEqual(relay_batch(self.producer), (1, 1))
+        self.assertEqual(self.broker.messages('task_topic'), [b'{"n": 1}'])
+
+        dead = OutboxEvent.objects.get()
+        self.assertIsNotNone(dead.failed_at)
+        self.assertIn('unknown.v1', dead.error)
+        self.assertEqual(relay_batch(self.producer), (0, 0))
+
+    def test_events_behind_one_taken_by_another_relay_are_held_back(self):
+        first, second, other = (enqueue('task_topic', {'n': i}, key=key) for i, key in enumerate(['user-1', 'user-1', 'user-2']))
+
+        # As if another relay had locked (and so this one skipped) the first.
+        events = _in_key_order(OutboxEvent.objects.all(), [second, other])
+
+        self.assertEqual(events, [other])
+
+    def test_failed_keyless_event_does_not_hold_back_other_keyless_events(self):
+        enqueue('task_topic', {'n': 0})
+        self.broker.fail_sends = KafkaTimeoutError()
+        self.assertEqual(relay_batch(self.producer), (0, 1))
+
+        self.broker.fail_sends = None
+        enqueue('task_topic', {'n': 1})
+
+        self.assertEqual(relay_batch(self.producer), (1, 0))
+        self.assertEqual(self.broker.messages('task_topic'), [b'{"n": 1}'])
@@ -0,0 +1,88 @@
+from datetime import timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework import status
+
+from .base_test import BaseTestCase
+from toDoApp.models import Category, Task
+
+
+class TaskKeysetPaginationTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name='Work')
+        now = timezone.now()
+        # Repeated and missing due dates, so the id tie-breaker and nulls-last matter.
+        Task.objects.bulk_create([
+            Task(
+                title=f'Task {i}',
+                due_date=None if i % 7 == 0 else now + timedelta(days=i % 5),
+                category=self.category,
+                user=self.employer,
+            )
+            for i in range(33)
+        ])
+        self.expected = [
+            task.id for task in sorted(
+                Task.objects.all(),
+                key=lambda task: (task.due_date is None, task.due_date or now, task.id),
+            )
+        ]
+        self.client.force_authenticate(user=self.employer)
+
+    def get_page(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['data']
+
+    def test_walking_forward_and_back_visits_every_task_once(self):
+        page = self.get_page('/api/v1/tasks/?pagination=cursor')
+        self.assertIsNone(page['previous'])
+        self.assertNotIn('count', page)
+
+        pages = [[task['id'] for task in page['results']]]
+        while page['next']:
+            page = self.get_page(page['next'])
+            pages.append([task['id'] for task in page['results']])
+
+        self.assertEqual([len(ids) for ids in pages], [10, 10, 10, 3])
+        self.assertEqual(sum(pages, []), self.expected)
+
+        backwards = []
+        while page['previous']:
+            page = self.get_page(page['previous'])
+            backwards.append([task['id'] for task in page['results']])
+        self.assertEqual(backwards, pages[-2::-1])
+
+    def test_filters_apply_to_cursor_pages(self):
+        Task.objects.filter(id__in=self.expected[:5]).update(is_completed=True)
+        page = self.get_page('/api/v1/tasks/?pagination=cursor&is_completed=true')
+        self.assertEqual([task['id'] for task in page['results']], self.expected[:5])
+        self.assertIsNone(page['next'])
+
+    def test_skipped_count_is_optional(self):
+        first = self.get_page('/api/v1/tasks/?pagination=cursor')
+        second = self.get_page(first['next'] + '&count=true')
+        self.assertEqual(second['skipped'], 10)
+
+    def test_null_tail_is_only_queried_once_reached(self):
+        first = self.get_page('/api/v1/tasks/?pagination=cursor')
+        # The second page ends before the first task without a due date.
+        with CaptureQueriesContext(connection) as queries:
+            second = self.get_page(first['next'])
+        self.assertFalse([query for query in queries if '"due_date" IS NULL' in query['sql']])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get_page(second['next'])
+        self.assertTrue([query for query in queries if '"due_date" IS NULL' in query['sql']])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/api/v1/tasks/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_page_number_mode_is_the_default(self):
+        page = self.get_page('/api/v1/tasks/')
+        self.assertEqual(page['count'], 33)
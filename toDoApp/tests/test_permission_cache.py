@@ -0,0 +1,56 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .base_test import BaseTestCase, User
+from toDoApp.cache import permission_cache
+
+
+class PermissionCacheTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def fresh(self, user):
+        # A new instance, as each request loads the user again.
+        return User.objects.get(pk=user.pk)
+
+    def permission_queries(self, user):
+        with CaptureQueriesContext(connection) as queries:
+            user.has_perm('toDoApp.view_task')
+        return [query['sql'] for query in queries.captured_queries if 'permission' in query['sql']]
+
+    def test_permissions_are_cached_across_requests(self):
+        self.assertTrue(self.permission_queries(self.fresh(self.employee)))
+        self.assertEqual(self.permission_queries(self.fresh(self.employee)), [])
+        self.assertEqual(permission_cache.stats()['hits'], 1)
+
+        self.assertEqual(self.fresh(self.employee).get_all_permissions(), self.employee.get_all_permissions())
+
+    def test_group_assignment_invalidates(self):
+        employee = self.fresh(self.employee)
+        self.assertFalse(employee.has_perm('toDoApp.delete_task'))
+
+        self.employee.groups.add(self.employer_group)
+        self.assertTrue(self.fresh(self.employee).has_perm('toDoApp.delete_task'))
+
+        self.employer_group.custom_user_set.remove(self.employee)
+        self.assertFalse(self.fresh(self.employee).has_perm('toDoApp.delete_task'))
+
+    def test_group_and_user_permission_changes_invalidate(self):
+        self.assertFalse(self.fresh(self.employee).has_perm('toDoApp.delete_task'))
+
+        self.employee_group.permissions.add(self.delete_task_permission)
+        self.assertTrue(self.fresh(self.employee).has_perm('toDoApp.delete_task'))
+
+        self.employee_group.permissions.remove(self.delete_task_permission)
+        self.employee.user_permissions.add(self.delete_task_permission)
+        self.assertTrue(self.fresh(self.employee).has_perm('toDoApp.delete_task'))
+
+        self.delete_task_permission.delete()
+        self.assertFalse(self.fresh(self.employee).has_perm('toDoApp.delete_task'))
+
+    def test_new_users_get_their_group_permissions(self):
+        self.assertTrue(self.fresh(self.employer).has_perm('toDoApp.add_task'))
+        self.assertFalse(self.fresh(self.employee).has_perm('toDoApp.add_task'))
@@ -0,0 +1,63 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+import tempfile
+import pstats
+import os
+
+from .base_test import BaseTestCase
+from toDoApp.models import Category
+from toDoApp.timing import current_timings, timed
+
+
+class ProfilingMiddlewareTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        Category.objects.create(name='Work')
+        self.client.force_authenticate(user=self.employer)
+
+    def test_queries_are_counted_without_debug(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/v1/categories/')
+
+        self.assertEqual(response['X-Query-Count'], str(len(queries.captured_queries)))
+        self.assertRegex(response['X-Total-Time'], r'^\d+\.\d{2}s$')
+
+    def test_server_timing_reports_db_cache_and_total(self):
+        response = self.client.get('/api/v1/categories/')
+
+        metrics = [metric.split(';')[0] for metric in response['Server-Timing'].split(', ')]
+        self.assertEqual(metrics, ['db', 'cache', 'total'])
+        self.assertIn('queries"', response['Server-Timing'])
+
+        # Served from the cache: only the user's permissions are queried.
+        response = self.client.get('/api/v1/categories/')
+        self.assertIn('cache;dur=', response['Server-Timing'])
+
+    def test_timings_are_only_collected_inside_a_request(self):
+        with timed('cache'):
+            pass
+        self.assertIsNone(current_timings())
+
+    def test_profile_is_written_for_token(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(PROFILING_TOKEN='secret', PROFILING_DIR=directory):
+            response = self.client.get('/api/v1/categories/')
+            self.assertNotIn('X-Profile-Id', response)
+
+            response = self.client.get('/api/v1/categories/', HTTP_X_PROFILE='wrong')
+            self.assertNotIn('X-Profile-Id', response)
+
+            response = self.client.get('/api/v1/categories/', HTTP_X_PROFILE='secret')
+            path = os.path.join(directory, response['X-Profile-Id'])
+            self.assertTrue(pstats.Stats(path).total_calls > 0)
+
+    def test_sampled_profiles(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(PROFILING_SAMPLE_RATE=1.0, PROFILING_DIR=directory):
+            self.client.get('/api/v1/categories/')
+            self.client.get('/api/v1/tasks/')
+            self.assertEqual(len(os.listdir(directory)), 2)
@@ -0,0 +1,105 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from io import StringIO
+import tempfile
+import json
+
+from rest_framework import status
+
+from .base_test import BaseTestCase, User
+from toDoApp.provisioning import provision, read_rows
+
+CSV = """email,password,role
+ann@example.com,annpassword,employee
+bob@example.com,bobpassword,EMPLOYER
+not-an-email,password,EMPLOYEE
+carl@example.com,carlpassword,ADMIN
+ann@example.com,again,EMPLOYEE
+employer@example.com,password,EMPLOYER
+dina@example.com,,
+"""
+
+
+class ProvisioningTest(BaseTestCase):
+
+    def run_provision(self, text, file_format='csv', **kwargs):
+        reports = list(provision(read_rows(StringIO(text), file_format), **kwargs))
+        return reports[-1], len(reports)
+
+    def test_valid_rows_are_created_with_their_groups(self):
+        report, _ = self.run_provision(CSV)
+
+        self.assertEqual((report.processed, report.created, report.failed), (7, 3, 4))
+        self.assertEqual(
+            [(error['line'], error['error']) for error in report.errors],
+            [
+                (4, "Invalid email."),
+                (5, "Role must be one of EMPLOYEE, EMPLOYER."),
+                (6, "Duplicate email in input."),
+                (7, "A user with that email already exists."),
+            ],
+        )
+
+        ann = User.objects.get(email='ann@example.com')
+        self.assertTrue(ann.check_password('annpassword'))
+        self.assertEqual(list(ann.groups.all()), [self.employee_group])
+        self.assertTrue(ann.has_perm('toDoApp.view_task'))
+        self.assertEqual(User.objects.get(email='bob@example.com').role, 'EMPLOYER')
+        self.assertFalse(User.objects.get(email='dina@example.com').has_usable_password())
+
+    def test_batches_make_a_constant_number_of_queries(self):
+        rows = ''.join(json.dumps({'email': f'user{i}@example.com', 'password': 'pw'}) + '\n' for i in range(10))
+
+        # Existing emails, users, memberships (group ids are cached by now).
+        with self.assertNumQueries(3 * 5 + 2 * 5):
+            report, batches = self.run_provision(rows, 'jsonl', batch_size=2)
+
+        self.assertEqual(batches, 5)
+        self.assertEqual(report.created, 10)
+
+    def test_invalid_json_lines(self):
+        report, _ = self.run_provision('{"email": "ann@example.com"}\n\nnot json\n[1]\n', 'jsonl')
+        self.assertEqual(report.created, 1)
+        self.assertEqual([error['line'] for error in report.errors], [3, 4])
+
+    def test_passwords_hashed_in_process_pool(self):
+        report, _ = self.run_provision(CSV, workers=2)
+        self.assertEqual(report.created, 3)
+        self.assertTrue(User.objects.get(email='bob@example.com').check_password('bobpassword'))
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as f:
+            f.write(CSV)
+            f.flush()
+            out, err = StringIO(), StringIO()
+            call_command('bulk_provision_users', f.name, '--workers', '0', stdout=out, stderr=err)
+
+        self.assertIn('Processed 7: 3 created, 4 failed.', err.getvalue())
+        self.assertIn('Created 3 users, 4 rows failed.', out.getvalue())
+
+
+@override_settings(USER_PROVISIONING_WORKERS=0)
+class UserProvisioningEndpointTest(BaseTestCase):
+
+    def upload(self, name='users.csv', content=CSV):
+        return self.client.post(
+            '/api/v1/users/provision/', {'file': SimpleUploadedFile(name, content.encode())}, format='multipart',
+        )
+
+    def test_admin_upload_streams_progress(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.upload()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(lines[0], {'processed': 7, 'created': 3, 'failed': 4})
+        self.assertTrue(lines[-1]['success'])
+        self.assertEqual(len(lines[-1]['data']['errors']), 4)
+
+    def test_requires_admin_and_known_format(self):
+        self.client.force_authenticate(user=self.employer)
+        self.assertEqual(self.upload().status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(self.upload(name='users.txt').status_code, status.HTTP_400_BAD_REQUEST)
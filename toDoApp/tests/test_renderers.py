@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+import uuid
+
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+import msgpack
+
+from .base_test import BaseTestCase
+from toDoApp.models import Category, Task
+from toDoApp.renderers import MessagePackRenderer, ORJSONRenderer
+
+
+class RendererTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name='Wörk')
+        Task.objects.create(title='Write report \u2028 now', category=self.category, user=self.employer, due_date=timezone.now() + timedelta(days=1))
+        Task.objects.create(title='Someday task', category=self.category, user=self.employee)
+        self.client.force_authenticate(user=self.employer)
+
+    def test_json_matches_json_renderer(self):
+        response = self.client.get('/api/v1/tasks/')
+
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+        self.assertIn(b'\\u2028', response.content)
+
+    def test_native_types(self):
+        pk = uuid.UUID('12345678-1234-5678-1234-567812345678')
+        data = {
+            'id': pk,
+            'due': datetime(2030, 1, 2, 3, 4, 5, tzinfo=ZoneInfo('Asia/Karachi')),
+            'utc': datetime(2030, 1, 2, 3, 4, 5, tzinfo=ZoneInfo('UTC')),
+            'amount': Decimal('1.50'),
+            1: 'int key',
+        }
+
+        self.assertEqual(
+            ORJSONRenderer().render(data),
+            b'{"id":"12345678-1234-5678-1234-567812345678","due":"2030-01-02T03:04:05+05:00",'
+            b'"utc":"2030-01-02T03:04:05Z","amount":1.5,"1":"int key"}',
+        )
+        self.assertEqual(
+            msgpack.unpackb(MessagePackRenderer().render(data), strict_map_key=False),
+            {'id': str(pk), 'due': '2030-01-02T03:04:05+05:00', 'utc': '2030-01-02T03:04:05Z', 'amount': 1.5, 1: 'int key'},
+        )
+
+    def test_indent_falls_back_to_json_renderer(self):
+        response = self.client.get('/api/v1/tasks/', HTTP_ACCEPT='application/json; indent=2')
+
+        self.assertEqual(response.content, JSONRenderer().render(response.data, 'application/json; indent=2'))
+        self.assertIn(b'\n  ', response.content)
+
+    def test_msgpack_is_negotiated(self):
+        json_response = self.client.get('/api/v1/tasks/')
+        response = self.client.get('/api/v1/tasks/', HTTP_ACCEPT='application/msgpack')
+
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content), json_response.json())
+
+    def test_msgpack_and_json_bodies_are_parsed(self):
+        due_date = (timezone.now() + timedelta(days=3)).isoformat()
+        for fmt in ('json', 'msgpack'):
+            data = {'title': f'Posted as {fmt}', 'due_date': due_date, 'priority': 'high', 'category': self.category.id}
+            response = self.client.post('/api/v1/tasks/', data, format=fmt)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(Task.objects.filter(title=f'Posted as {fmt}', priority='high').exists())
+
+    def test_malformed_bodies_are_rejected(self):
+        for content_type, body in [('application/json', b'{"title": '), ('application/msgpack', b'\xc1')]:
+            response = self.client.post('/api/v1/tasks/', body, content_type=content_type)
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
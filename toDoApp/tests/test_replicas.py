@@ -0,0 +1,80 @@
+from datetime import timedelta
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .base_test import BaseTestCase
+from toDoApp.authentication import UserRefreshToken
+from toDoApp.middleware.replicas import PIN_COOKIE
+from toDoApp.models import Category, Task
+from toDoApp.replicas import ReplicaSet, replica_set
+
+
+# 'replica' is a separate, empty test database (see todo/test_settings.py),
+# so a read that finds no tasks came from it.
+@skipUnless('replica' in settings.DATABASES, "Needs the 'replica' database of todo.test_settings.")
+@override_settings(REPLICA_DATABASES=['replica'])
+class ReplicaRoutingTest(BaseTestCase):
+    # The runner sets up the databases of skipped tests too.
+    databases = {'default', 'replica'} & set(settings.DATABASES)
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        replica_set.clear()
+        Task.objects.create(
+            title='Task 1', due_date=timezone.now() + timedelta(days=1),
+            category=Category.objects.create(name='Work'), user=self.employer,
+        )
+
+    def list_tasks(self):
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            response = self.client.get('/api/v1/tasks/')
+        return response.data['data']['count'], len(replica_queries)
+
+    def test_safe_requests_read_from_a_replica(self):
+        self.client.force_authenticate(user=self.employer)
+
+        count, replica_queries = self.list_tasks()
+
+        self.assertEqual(count, 0)
+        self.assertGreater(replica_queries, 0)
+        # Outside requests, reads stay on the primary.
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_token_users_are_loaded_from_the_primary(self):
+        # No published auth_version, so authentication reads the user row,
+        # which only the primary has.
+        token = UserRefreshToken.for_user(self.employer).access_token
+        response = self.client.get('/api/v1/tasks/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['count'], 0)
+
+    def test_writers_read_from_the_primary(self):
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.post('/api/v1/categories/', {'name': 'Personal'})
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        self.assertEqual(self.list_tasks(), (1, 0))
+        # Without the cookie, as API clients send none.
+        del self.client.cookies[PIN_COOKIE]
+        self.assertEqual(self.list_tasks(), (1, 0))
+
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(self.list_tasks()[0], 0)
+
+    def test_lagging_replicas_are_left_out(self):
+        self.client.force_authenticate(user=self.employer)
+
+        with patch.object(ReplicaSet, 'lag', return_value=30.0):
+            self.assertEqual(self.list_tasks(), (1, 0))
+
+        with override_settings(REPLICA_CHECK_INTERVAL=0):
+            self.assertEqual(self.list_tasks()[0], 0)
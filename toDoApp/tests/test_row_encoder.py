@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone as django_timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from .base_test import BaseTestCase
+from toDoApp.models import Category, Task
+from toDoApp.serializers.category_serializer import CategorySerializer
+from toDoApp.serializers.row_encoder import RowEncoder
+from toDoApp.serializers.task_serializer import TaskSerializer
+
+
+class RowEncoderTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name='Wörk ✓')
+        Task.objects.bulk_create([
+            Task(title='Utc midnight', due_date=datetime(2030, 1, 1, tzinfo=timezone.utc), category=self.category, user=self.employer),
+            Task(title='With microseconds', due_date=datetime(2030, 6, 1, 8, 30, 15, 123456, tzinfo=timezone.utc), category=self.category, user=self.employee, is_completed=True),
+            Task(title='No due date  ', description='línea', priority='high', category=self.category, user=self.employer),
+        ])
+
+    def assertRendersLikeSerializer(self, serializer_class, queryset):
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        encoder = RowEncoder(serializer_class)
+        self.assertEqual(JSONRenderer().render(encoder.encode(encoder.rows(queryset))), expected)
+
+    def test_tasks_encode_like_the_serializer(self):
+        self.assertRendersLikeSerializer(TaskSerializer, Task.objects.order_by('id'))
+
+    def test_utc_datetimes_encode_like_the_serializer(self):
+        with django_timezone.override('UTC'):
+            self.assertRendersLikeSerializer(TaskSerializer, Task.objects.order_by('id'))
+
+    def test_categories_encode_like_the_serializer(self):
+        self.assertRendersLikeSerializer(CategorySerializer, Category.objects.order_by('id'))
+
+    def test_list_response_is_unchanged(self):
+        self.client.force_authenticate(user=self.employer)
+        tasks = Task.objects.order_by('due_date')
+        expected = {
+            'success': True,
+            'message': "Tasks retrieved successfully.",
+            'data': {'count': 3, 'next': None, 'previous': None, 'results': TaskSerializer(tasks, many=True).data},
+        }
+
+        response = self.client.get('/api/v1/tasks/')
+
+        self.assertEqual(response.content, JSONRenderer().render(expected))
+
+    def test_keyset_pages_work_on_rows(self):
+        self.client.force_authenticate(user=self.employer)
+        Task.objects.bulk_create([
+            Task(title=f'Task {i}', due_date=datetime.now(timezone.utc) + timedelta(days=i), category=self.category, user=self.employer)
+            for i in range(12)
+        ])
+
+        first = self.client.get('/api/v1/tasks/?pagination=cursor&count=true').data['data']
+        second = self.client.get(first['next']).data['data']
+
+        self.assertEqual(len(first['results']) + len(second['results']), 15)
+        self.assertEqual(second['skipped'], 10)
+
+    def test_nested_fields_are_rejected(self):
+        class NestedSerializer(serializers.ModelSerializer):
+            category = CategorySerializer()
+
+            class Meta:
+                model = Task
+                fields = ['id', 'category']
+
+        with self.assertRaises(ImproperlyConfigured):
+            RowEncoder(NestedSerializer)
@@ -0,0 +1,33 @@
+from rest_framework import status
+
+from .base_test import BaseTestCase
+from toDoApp.models import Category, Task
+
+
+class SearchTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.work = Category.objects.create(name='Work')
+        self.home = Category.objects.create(name='Home')
+        Task.objects.create(title='Quarterly report', description='Numbers for finance', category=self.work, user=self.employer)
+        Task.objects.create(title='Groceries', description='Milk and report card', category=self.home, user=self.employer)
+        Task.objects.create(title='Laundry', description='', category=self.home, user=self.employer)
+        self.client.force_authenticate(user=self.employer)
+
+    def search(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(item.get('title') or item.get('name') for item in response.data['data']['results'])
+
+    def test_task_search_matches_title_and_description(self):
+        self.assertEqual(self.search('/api/v1/tasks/?search=report'), ['Groceries', 'Quarterly report'])
+
+    def test_task_search_combines_with_filters(self):
+        self.assertEqual(self.search(f'/api/v1/tasks/?search=report&category={self.work.id}'), ['Quarterly report'])
+
+    def test_blank_search_returns_everything(self):
+        self.assertEqual(len(self.search('/api/v1/tasks/?search=%20')), 3)
+
+    def test_category_search(self):
+        self.assertEqual(self.search('/api/v1/categories/?search=hom'), ['Home'])
@@ -0,0 +1,40 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from .base_test import BaseTestCase
+from toDoApp.models import Category, CustomUser, Task
+from toDoApp.stats import summary
+
+
+class SeedDataTest(BaseTestCase):
+
+    def seed(self, **options):
+        call_command('seed_data', stdout=StringIO(), stderr=StringIO(), **options)
+
+    def test_seeds_users_categories_and_tasks(self):
+        users_before, tasks_before = CustomUser.objects.count(), Task.objects.count()
+
+        self.seed(users=10, categories=20, tasks=500, batch_size=200, random_seed=1)
+
+        seeded = CustomUser.objects.filter(email__startswith='seed-')
+        self.assertEqual(CustomUser.objects.count() - users_before, 10)
+        self.assertEqual(Category.objects.count(), 20)
+        self.assertEqual(Category.objects.filter(name='Work 2').count(), 1)
+        self.assertEqual(Task.objects.count() - tasks_before, 500)
+        for user in seeded:
+            self.assertTrue(user.check_password('seedpassword'))
+            self.assertEqual(list(user.groups.all()), [self.employer_group if user.role == 'EMPLOYER' else self.employee_group])
+
+    def test_task_stats_are_reconciled(self):
+        self.seed(users=3, categories=2, tasks=300, random_seed=2)
+
+        stats = summary()
+        self.assertEqual(stats['total'], Task.objects.count())
+        self.assertEqual(stats['completed'], Task.objects.filter(is_completed=True).count())
+        self.assertEqual(sum(stats['by_user'].values()), 300)
+
+    def test_needs_users_and_categories(self):
+        with self.assertRaises(CommandError):
+            self.seed(users=0)
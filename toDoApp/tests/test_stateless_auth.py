@@ -0,0 +1,115 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .base_test import BaseTestCase
+from toDoApp.authentication import ClaimsUser, UserRefreshToken, UserRowCache, user_rows
+from toDoApp.models import Category, Task
+
+
+class StatelessJWTAuthenticationTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        user_rows.clear()
+        self.category = Category.objects.create(name='Work')
+        self.refresh = UserRefreshToken.for_user(self.employer)
+
+    def get(self, token, url='/api/v1/categories/'):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}')
+        return response, [query['sql'] for query in queries.captured_queries if 'customuser' in query['sql']]
+
+    def test_obtained_tokens_carry_user_claims(self):
+        response = self.client.post('/api/v1/token/', {'email': 'employer@example.com', 'password': 'employerpassword'})
+        access = AccessToken(response.data['access'])
+
+        self.assertEqual(access['role'], 'EMPLOYER')
+        self.assertTrue(access['is_active'])
+        self.assertEqual(access['auth_version'], 0)
+
+    def test_current_token_skips_user_query(self):
+        response, queries = self.get(self.refresh.access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(queries)
+
+        response, queries = self.get(self.refresh.access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, [])
+
+    def test_claims_user_can_create_tasks(self):
+        self.get(self.refresh.access_token)
+        response = self.client.post(
+            '/api/v1/tasks/', {'title': 'Write report', 'category': self.category.id},
+            HTTP_AUTHORIZATION=f'Bearer {self.refresh.access_token}',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Task.objects.get().user_id, self.employer.pk)
+
+    def test_claim_changes_bump_auth_version(self):
+        employer = type(self.employer).objects.get(pk=self.employer.pk)
+        employer.email = 'boss@example.com'
+        employer.save()
+        self.assertEqual(employer.auth_version, 0)
+
+        employer.role = 'EMPLOYEE'
+        employer.save(update_fields=['role'])
+        employer.refresh_from_db()
+        self.assertEqual(employer.auth_version, 1)
+
+    def test_deactivated_user_is_rejected(self):
+        access = self.refresh.access_token
+        self.get(access)
+
+        self.employer.is_active = False
+        self.employer.save()
+
+        response, queries = self.get(access)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertTrue(queries)
+
+    def test_deleted_user_is_rejected(self):
+        token = self.refresh.access_token
+        self.assertEqual(self.get(token)[0].status_code, status.HTTP_200_OK)
+
+        self.employer.delete()
+
+        self.assertEqual(self.get(token)[0].status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_picks_up_new_claims(self):
+        self.employer.is_superuser = True
+        self.employer.save()
+
+        response = self.client.post('/api/v1/token/refresh/', {'refresh': str(self.refresh)})
+        access = AccessToken(response.data['access'])
+
+        self.assertTrue(access['is_superuser'])
+        self.assertEqual(access['auth_version'], 1)
+
+    def test_claims_user_permissions(self):
+        user = ClaimsUser(UserRefreshToken.for_user(self.employee).access_token)
+
+        self.assertTrue(user.has_perms(['toDoApp.view_task', 'toDoApp.change_task']))
+        self.assertFalse(user.has_perm('toDoApp.delete_task'))
+        self.assertIsInstance(user._perm_cache, set)
+
+
+class UserRowCacheTest(BaseTestCase):
+
+    def test_rows_are_keyed_by_version_and_evicted(self):
+        rows = UserRowCache(maxsize=2, ttl=60)
+        rows.put(self.admin)
+        rows.put(self.employer)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(rows.get(str(self.admin.pk), 0), self.admin)
+        with self.assertNumQueries(1):
+            rows.get(str(self.admin.pk), 1)
+
+        rows.put(self.employee)
+        with self.assertNumQueries(1):
+            rows.get(str(self.employer.pk), 0)
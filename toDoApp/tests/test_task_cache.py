@@ -0,0 +1,84 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+
+from rest_framework import status
+
+from .base_test import BaseTestCase
+from toDoApp.cache import task_cache, task_list_cache
+from toDoApp.models import Category, Task
+
+
+@override_settings(TASK_CACHE_ENABLED=True)
+class TaskCacheTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.category = Category.objects.create(name='Work')
+        self.task = Task.objects.create(
+            title='Task 1',
+            due_date=timezone.now() + timedelta(days=1),
+            category=self.category,
+            user=self.employer,
+        )
+        self.client.force_authenticate(user=self.employer)
+
+    def test_list_is_served_from_cache(self):
+        self.client.get('/api/v1/tasks/')
+        task_list_cache.reset_stats()
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/v1/tasks/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['count'], 1)
+        self.assertEqual(task_list_cache.stats()['hits'], 1)
+
+    def test_list_is_cached_per_user_and_filter(self):
+        self.client.get('/api/v1/tasks/')
+        self.client.get('/api/v1/tasks/?priority=high')
+        self.client.force_authenticate(user=self.employee)
+        self.client.get('/api/v1/tasks/')
+        self.assertEqual(task_list_cache.stats()['misses'], 3)
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = self.client.get('/api/v1/tasks/')['ETag']
+
+        response = self.client.get('/api/v1/tasks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        detail_etag = self.client.get(f'/api/v1/tasks/{self.task.id}/')['ETag']
+        response = self.client.get(f'/api/v1/tasks/{self.task.id}/', HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_update_invalidates_list_and_detail(self):
+        list_etag = self.client.get('/api/v1/tasks/')['ETag']
+        detail_etag = self.client.get(f'/api/v1/tasks/{self.task.id}/')['ETag']
+
+        self.client.patch(f'/api/v1/tasks/{self.task.id}/', {'title': 'Updated Task'})
+
+        response = self.client.get('/api/v1/tasks/', HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['results'][0]['title'], 'Updated Task')
+
+        response = self.client.get(f'/api/v1/tasks/{self.task.id}/', HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['title'], 'Updated Task')
+
+    def test_other_tasks_keep_their_cached_detail(self):
+        other = Task.objects.create(title='Task 2', category=self.category, user=self.employer)
+        self.client.get(f'/api/v1/tasks/{other.id}/')
+        self.task.delete()
+
+        task_cache.reset_stats()
+        self.client.get(f'/api/v1/tasks/{other.id}/')
+        self.assertEqual(task_cache.stats()['hits'], 1)
+
+    def test_missing_task_is_not_cached(self):
+        response = self.client.get('/api/v1/tasks/9000/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        Task.objects.create(id=9000, title='Task 9000', category=self.category, user=self.employer)
+        response = self.client.get('/api/v1/tasks/9000/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+
+from .base_test import BaseTestCase
+from toDoApp.models import Category, Task, TaskStat
+from toDoApp.serializers.task_serializer import TaskSerializer
+from toDoApp.stats import reconcile, summary
+
+
+class TaskStatsTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.work = Category.objects.create(name='Work')
+        self.home = Category.objects.create(name='Home')
+        now = timezone.now()
+        self.tasks = [
+            Task.objects.create(title='Overdue task', category=self.work, user=self.employer, priority='high', due_date=now - timedelta(days=3)),
+            Task.objects.create(title='Due soon task', category=self.work, user=self.employee, due_date=now + timedelta(days=2)),
+            Task.objects.create(title='Finished task', category=self.home, user=self.employer, is_completed=True, due_date=now - timedelta(days=1)),
+            Task.objects.create(title='Someday task', category=self.home, user=self.employer, priority='low'),
+        ]
+        self.client.force_authenticate(user=self.employer)
+
+    def expected(self):
+        return {
+            'total': 4,
+            'completed': 1,
+            'open': 3,
+            'overdue': 1,
+            'by_priority': {'low': 1, 'medium': 2, 'high': 1},
+            'by_category': {str(self.work.id): 2, str(self.home.id): 2},
+            'by_user': {str(self.employer.pk): 3, str(self.employee.pk): 1},
+        }
+
+    def test_endpoint(self):
+        response = self.client.get('/api/v1/tasks/stats/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data'], self.expected())
+
+    def test_reads_do_not_scan_tasks(self):
+        # The counters, and the open tasks due earlier today.
+        with self.assertNumQueries(2):
+            summary()
+
+    def test_updates_and_deletes_move_counts(self):
+        overdue, due_soon, finished, _ = self.tasks
+
+        overdue.is_completed = True
+        overdue.save()
+        due_soon.category = self.home
+        due_soon.save(update_fields=['category'])
+        finished.delete()
+        Task.objects.get(pk=due_soon.pk).save()
+
+        stats = summary()
+        self.assertEqual((stats['total'], stats['completed'], stats['open'], stats['overdue']), (3, 1, 2, 0))
+        self.assertEqual(stats['by_category'], {str(self.work.id): 1, str(self.home.id): 2})
+
+    def test_bulk_endpoints_are_counted(self):
+        self.client.post('/api/v1/tasks/bulk/', [{'title': 'Bulk task one', 'category': self.work.id}], format='json')
+        self.client.patch('/api/v1/tasks/bulk/', [{'id': self.tasks[0].id, 'priority': 'low'}], format='json')
+        self.client.delete('/api/v1/tasks/bulk/', {'ids': [self.tasks[1].id]}, format='json')
+
+        stats = summary()
+        self.assertEqual(stats['total'], 4)
+        self.assertEqual(stats['by_priority'], {'low': 2, 'medium': 2, 'high': 0})
+
+    def update_meanwhile(self, priority):
+        """
+        Patch TaskSerializer.is_valid to first update the task's priority,
+        as a concurrent request would after the patched one loaded it.
+        """
+        is_valid = TaskSerializer.is_valid
+
+        def wrapper(serializer, *args, **kwargs):
+            if serializer.instance.priority != priority:
+                other = Task.objects.get(pk=serializer.instance.pk)
+                other.priority = priority
+                other.save()
+            return is_valid(serializer, *args, **kwargs)
+        return mock.patch.object(TaskSerializer, 'is_valid', autospec=True, side_effect=wrapper)
+
+    def assertCountsMatchTasks(self):
+        counts = dict(((s.dimension, s.key), s.count) for s in TaskStat.objects.exclude(count=0))
+        self.assertEqual(dict(reconcile()), counts)
+
+    def test_concurrent_updates_are_counted_from_the_stored_row(self):
+        task = self.tasks[0]
+
+        with self.update_meanwhile('low'):
+            response = self.client.patch(f'/api/v1/tasks/{task.pk}/', {'priority': 'medium'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCountsMatchTasks()
+
+        with self.update_meanwhile('high'):
+            response = self.client.patch('/api/v1/tasks/bulk/', [{'id': task.pk, 'priority': 'low'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCountsMatchTasks()
+        self.assertEqual(summary()['by_priority'], {'low': 2, 'medium': 2, 'high': 0})
+
+    def test_reconcile_recomputes_from_scratch(self):
+        Task.objects.filter(pk=self.tasks[0].pk).update(is_completed=True)
+        TaskStat.objects.filter(dimension='user').update(count=100)
+
+        out = StringIO()
+        call_command('reconcile_task_stats', stdout=out)
+        self.assertIn('for 4 tasks', out.getvalue())
+
+        expected = self.expected()
+        expected.update(completed=2, open=2, overdue=0)
+        self.assertEqual(summary(), expected)
+
+    def test_reconcile_matches_incremental_counts(self):
+        before = dict(((s.dimension, s.key), s.count) for s in TaskStat.objects.exclude(count=0))
+        self.assertEqual(dict(reconcile()), before)
@@ -0,0 +1,83 @@
+"""
+Per-request timing of database, cache and Kafka calls.
+
+ProfilingMiddleware starts a RequestTimings for each request in a context
+variable, and instrumented calls add to it through timed() or, for queries,
+the record_query execute wrapper. Context variables are separate per thread
+and per asyncio task and are copied into sync_to_async threads, so
+concurrent requests never share timings. Outside a request, the cost is one
+context variable lookup.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter_ns
+
+_current = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+
+    __slots__ = ('started', 'counts', 'durations')
+
+    def __init__(self):
+        self.started = perf_counter_ns()
+        self.counts = {}
+        self.durations = {}
+
+    def add(self, name, duration_ns):
+        self.counts[name] = self.counts.get(name, 0) + 1
+        self.durations[name] = self.durations.get(name, 0) + duration_ns
+
+    def elapsed_ns(self):
+        return perf_counter_ns() - self.started
+
+
+def start_request():
+    """
+    Begin collecting timings; returns them and the token for end_request().
+    """
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def current_timings():
+    return _current.get()
+
+
+@contextmanager
+def timed(name):
+    """
+    Add the duration of the block to the current request's timings.
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = perf_counter_ns()
+    try:
+        yield
+    finally:
+        timings.add(name, perf_counter_ns() - start)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Connection execute wrapper that times every query as 'db'.
+    """
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = perf_counter_ns()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add('db', perf_counter_ns() - start)
+
+
+def install_query_timer(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
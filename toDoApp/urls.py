@@ -1,14 +1,18 @@
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from .views import CategoryDetail, CategoryList, GoogleSignInView, TaskDetail, TaskList, google_login_view
+from .views import CategoryDetail, CategoryList, GoogleSignInView, TaskBulk, TaskDetail, TaskList, TaskStats, UserProvisioning, google_login_view
 
 urlpatterns = [
     path('categories/', CategoryList.as_view(), name='category-list-create'),  # For GET and POST
     path('categories/<int:pk>/', CategoryDetail.as_view(), name='category-retrieve-update-delete'),  # For GET, PUT, PATCH, DELETE
 
     path('tasks/', TaskList.as_view(), name='task-list-create'),  # For GET and POST
+    path('tasks/bulk/', TaskBulk.as_view(), name='task-bulk'),  # For POST, PATCH, DELETE
+    path('tasks/stats/', TaskStats.as_view(), name='task-stats'),  # For GET
     path('tasks/<int:pk>/', TaskDetail.as_view(), name='task-retrieve-update-delete'),  # For GET, PUT, PATCH, DELETE
 
+    path('users/provision/', UserProvisioning.as_view(), name='user-provision'),  # For POST
+
     path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 
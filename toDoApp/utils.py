@@ -1,9 +1,9 @@
-from google.auth.transport import requests
-from google.oauth2 import id_token
+from django.db import IntegrityError, transaction
+from .authentication import UserRefreshToken
+from .google_auth import verify_id_token
 from .models import CustomUser
 from django.conf import settings
 from rest_framework.exceptions import AuthenticationFailed
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth import authenticate
 from rest_framework.exceptions import AuthenticationFailed
@@ -17,35 +17,34 @@ class Google():
     @staticmethod
     def validate(received_token):
         try:
-            id_info = id_token.verify_oauth2_token(str(received_token), requests.Request())
+            id_info = verify_id_token(str(received_token))
             
             if "accounts.google.com" in id_info['iss']:
                 return id_info
 
         except Exception as e:
-            logger.exception("Error during token validation:", str(e))
+            logger.exception(f"Error during token validation: {e}")
             raise AuthenticationFailed('Token is either invalid or has expired.')
         
 
 
 
 def register_social_user(provider, email, role):
-    # Define a default password for new users
-    password = settings.SOCIAL_AUTH_PASSWORD
-    # Create or update the user
-    user, created = CustomUser.objects.get_or_create(
-        email=email, 
-        defaults={
-            'password': make_password(password),
-            'role': role,
-            'auth_provider': provider
-        }
-    )
-
-    if created:
-        user.set_password(password)
-        user.save()
-
+    # Existing users are only read; new ones are hashed and written once.
+    user = CustomUser.objects.filter(email=email).first()
+    if user is None:
+        password = make_password(settings.SOCIAL_AUTH_PASSWORD)
+        try:
+            with transaction.atomic():
+                user = CustomUser.objects.create(
+                    email=email,
+                    password=password,
+                    role=role,
+                    auth_provider=provider,
+                )
+        except IntegrityError:
+            # Created by a concurrent login.
+            user = CustomUser.objects.get(email=email)
 
     # Generate tokens
     tokens = get_tokens_for_user(user)
@@ -61,7 +60,7 @@ def register_social_user(provider, email, role):
 
 
 def get_tokens_for_user(user):
-    refresh = RefreshToken.for_user(user)
+    refresh = UserRefreshToken.for_user(user)
     return {
         'refresh': str(refresh),
         'access': str(refresh.access_token),
@@ -1,34 +1,81 @@
 from rest_framework import status
 from rest_framework import serializers
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.generics import GenericAPIView
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import DjangoModelPermissions
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
 
 import logging
-from kafka.errors import NoBrokersAvailable
+import json
+import io
 
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import render
-from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.http import parse_etags
 from django_filters.rest_framework import DjangoFilterBackend
 
-from redis.exceptions import ConnectionError
-
+from toDoApp.authentication import StatelessJWTAuthentication
+from toDoApp.categories import category_registry
 from toDoApp.filters import CategoryFilter, TaskFilter
+from toDoApp.pagination import PageNumberPagination, TaskKeysetPagination
+from toDoApp.provisioning import FORMATS, format_for, provision, read_rows
+from toDoApp.stats import locked_states, record_changes, summary as task_stats
 from toDoApp.serializers.google_serializer import GoogleLoginSerializer
 
 from .models import Task, Category
-from toDoApp.kafka.producer import produce_message
+from toDoApp.cache import category_cache, invalidate_task_cache, task_cache, task_list_cache, tagged
+from toDoApp.kafka.events import TaskEventV1
+from toDoApp.kafka.outbox import enqueue, enqueue_many
+from toDoApp.metrics import observe_page, render as render_metrics
 from .serializers.category_serializer import CategorySerializer
+from .serializers.row_encoder import RowEncoder
 from .serializers.task_serializer import TaskSerializer
 
 logger = logging.getLogger('toDoApp')
 
 
+TASK_LIST_PARAMETERS = [
+    OpenApiParameter(name='title', description='Title of the Task', required=False, type=str),
+    OpenApiParameter(name='description', description='Task Description', required=False, type=OpenApiTypes.STR),
+    OpenApiParameter(name='due_date_gt', description='Due Date Greater Than', required=False, type=OpenApiTypes.DATE),
+    OpenApiParameter(name='due_date_lt', description='Due Date Less Than', required=False, type=OpenApiTypes.DATE),
+    OpenApiParameter(name='is_completed', description='Status', required=False, type=OpenApiTypes.BOOL),
+    OpenApiParameter(name='priority', description='Priority', required=False, type=OpenApiTypes.STR, enum=[choice[0] for choice in Task.PRIORITY_CHOICES]),
+    OpenApiParameter(name='category', description='Category', required=False, type=OpenApiTypes.STR),
+    OpenApiParameter(name='search', description='Search title and description', required=False, type=OpenApiTypes.STR),
+    OpenApiParameter(name='page', description='Page Number', required=False, type=OpenApiTypes.INT),
+    OpenApiParameter(name='pagination', description='Pagination mode', required=False, type=OpenApiTypes.STR, enum=['page', 'cursor']),
+    OpenApiParameter(name='cursor', description='Cursor from a previous next/previous link', required=False, type=OpenApiTypes.STR),
+    OpenApiParameter(name='count', description='Include the number of tasks before the page (cursor mode)', required=False, type=OpenApiTypes.BOOL),
+]
+
+CATEGORY_LIST_PARAMETERS = [
+    OpenApiParameter(name='name', description='Category Name', required=False, type=str),
+    OpenApiParameter(name='search', description='Search category names', required=False, type=str),
+    OpenApiParameter(name='page', description='Page Number', required=False, type=OpenApiTypes.INT),
+]
+
+
+def item_ids(items, field):
+    """
+    Return the integer values of field across the given dicts, ignoring
+    missing or malformed ones (those fail validation later).
+    """
+    ids = set()
+    for item in items:
+        try:
+            ids.add(int(item[field]))
+        except (TypeError, ValueError, KeyError):
+            pass
+    return ids
+
+
 class BaseAPIView(GenericAPIView):
    
     def success_response(self, data=None, message="Success", status_code=status.HTTP_200_OK):
@@ -41,7 +88,45 @@ class BaseAPIView(GenericAPIView):
             "data": data
         }
         return Response(response_data, status=status_code)
+
+    def cached_success_response(self, query_cache, params, compute, message="Success", scope=None):
+        """
+        Return a success response for compute()'s data, read through query_cache.
+        Answers 304 Not Modified when the client's If-None-Match matches.
+        """
+        entry = query_cache.get_or_set(params, lambda: tagged(compute()), scope=scope)
+        return self.etag_response(entry, message)
+
+    def etag_response(self, entry, message):
+        """
+        Return the response for a tagged() cache entry, or 304 Not Modified.
+        """
+        etags = parse_etags(self.request.headers.get('If-None-Match', ''))
+        if entry['etag'] in etags or '*' in etags:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': entry['etag']})
+
+        response = self.success_response(data=entry['data'], message=message)
+        response['ETag'] = entry['etag']
+        return response
     
+    def get_paginated_data(self, data):
+        """
+        The envelope get_paginated_response() would return, without the Response.
+        """
+        return self.paginator.get_paginated_data(data)
+
+    def observe_page_depth(self):
+        """
+        Record the page number requested from a page-number paginated list.
+        """
+        params = self.request.query_params
+        if 'cursor' in params or params.get('pagination') == 'cursor':
+            return
+        try:
+            observe_page(type(self).__name__, int(params.get('page', 1)))
+        except ValueError:
+            pass
+
     def bad_request_response(self, errors=None, message="Bad Request", status_code=status.HTTP_400_BAD_REQUEST):
         """
         Return a bad request response with the given errors and message.
@@ -56,7 +141,7 @@ class BaseAPIView(GenericAPIView):
 
 class TaskList(BaseAPIView):
 
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [DjangoModelPermissions]
 
     filter_backends = [DjangoFilterBackend]
@@ -66,49 +151,58 @@ class TaskList(BaseAPIView):
 
     serializer_class = TaskSerializer   
     queryset = Task.objects.all().order_by('due_date')  
+    row_encoder = RowEncoder(TaskSerializer)
 
-    @extend_schema(
-            operation_id="get_all_tasks",
-            parameters=[
-            OpenApiParameter(name='title', description='Title of the Task', required=False, type=str),
-            OpenApiParameter(name='description', description='Task Description', required=False, type=OpenApiTypes.STR),
-            OpenApiParameter(name='due_date_gt', description='Due Date Greater Than', required=False, type=OpenApiTypes.DATE),
-            OpenApiParameter(name='due_date_lt', description='Due Date Less Than', required=False, type=OpenApiTypes.DATE),
-            OpenApiParameter(name='is_completed', description='Status', required=False, type=OpenApiTypes.BOOL),
-            OpenApiParameter(name='priority', description='Priority', required=False, type=OpenApiTypes.STR, enum=[choice[0] for choice in Task.PRIORITY_CHOICES]),
-            OpenApiParameter(name='category', description='Category', required=False, type=OpenApiTypes.STR),
-            OpenApiParameter(name='page', description='Page Number', required=False, type=OpenApiTypes.INT),
-        ]
-            )
+    @property
+    def paginator(self):
+        """
+        Use keyset pagination when the client asks for ?pagination=cursor or
+        follows a cursor link.
+        """
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if params.get('pagination') == 'cursor' or 'cursor' in params:
+                self._paginator = TaskKeysetPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    @extend_schema(operation_id="get_all_tasks", parameters=TASK_LIST_PARAMETERS)
     def get(self, request, *args, **kwargs):
+        self.observe_page_depth()
         try:
-            tasks = self.filter_queryset(self.queryset)
-            page_tasks = self.paginate_queryset(tasks)
-            serializer = TaskSerializer(page_tasks, many=True)
-            return self.success_response(data=self.get_paginated_response(serializer.data).data, message="Tasks retrieved successfully.")
+            if settings.TASK_CACHE_ENABLED:
+                params = {'_host': request.get_host(), '_user': request.user.pk, **dict(request.query_params.lists())}
+                return self.cached_success_response(task_list_cache, params, self.list_tasks, message="Tasks retrieved successfully.")
+            return self.success_response(data=self.list_tasks(), message="Tasks retrieved successfully.")
         except Exception as e:
             return self.bad_request_response(errors=str(e), message="Failed to retrieve tasks.")
 
+    def list_tasks(self):
+        tasks = self.row_encoder.rows(self.filter_queryset(self.queryset))
+        page_tasks = self.paginate_queryset(tasks)
+        return self.get_paginated_data(self.row_encoder.encode(page_tasks))
+
     @extend_schema(operation_id="create_task")
     def post(self, request, *args, **kwargs):
         try:
             serializer = TaskSerializer(data=request.data, context = {'request':request})
             if serializer.is_valid():
-                task = serializer.save(user=request.user)
-
-                try:
-                    produce_message('task_topic', {'task_data': serializer.data, 'user_data': request.user})
-                except NoBrokersAvailable:
-                    logger.warning("Kafka brokers not available. Proceeding without message production.")
-
+                self.create_task(serializer)
                 return self.success_response(data=serializer.data, message="Task created successfully.")
             return self.bad_request_response(errors=serializer.errors, message="Failed to create task.")
         except Exception as e:
             return self.bad_request_response(errors=str(e), message="Failed to create task.")
+
+    def create_task(self, serializer):
+        with transaction.atomic():
+            task = serializer.save()
+            enqueue('task_topic', TaskEventV1.build(task, 'created'), key=task.user_id, schema=TaskEventV1.name)
+        return task
         
 
 class TaskDetail(BaseAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [DjangoModelPermissions]
     
     serializer_class = TaskSerializer   
@@ -120,14 +214,17 @@ class TaskDetail(BaseAPIView):
         Handle GET requests for retrieving a single task.
         """
         try:
-            task = self.queryset.get(pk=pk)
-            serializer = self.serializer_class(task)
-            return self.success_response(data=serializer.data, message="Task retrieved successfully.")
+            if settings.TASK_CACHE_ENABLED:
+                return self.cached_success_response(task_cache, {}, lambda: self.retrieve_task(pk), message="Task retrieved successfully.", scope=pk)
+            return self.success_response(data=self.retrieve_task(pk), message="Task retrieved successfully.")
         except Task.DoesNotExist:
             return self.bad_request_response(message="Task not found.", status_code=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return self.bad_request_response(errors=str(e), message="Failed to retrieve task.")
-        
+
+    def retrieve_task(self, pk):
+        task = self.queryset.get(pk=pk)
+        return self.serializer_class(task).data
 
     @extend_schema(operation_id="update_task")
     def put(self, request, pk, *args, **kwargs):
@@ -135,7 +232,7 @@ class TaskDetail(BaseAPIView):
             task = self.queryset.get(pk=pk)
             serializer = self.serializer_class(task, data=request.data)
             if serializer.is_valid():
-                serializer.save()
+                self.update_task(serializer)
                 return self.success_response(data=serializer.data, message="Task updated successfully.")
             return self.bad_request_response(errors=serializer.errors, message="Failed to update task.")
         except Task.DoesNotExist:
@@ -152,7 +249,7 @@ class TaskDetail(BaseAPIView):
             task = self.queryset.get(pk=pk)
             serializer = self.serializer_class(task, data=request.data, partial=True)
             if serializer.is_valid():
-                serializer.save()
+                self.update_task(serializer)
                 return self.success_response(data=serializer.data, message="Task updated successfully.")
             return self.bad_request_response(errors=serializer.errors, message="Failed to update task.")
         except Task.DoesNotExist:
@@ -164,18 +261,185 @@ class TaskDetail(BaseAPIView):
     def delete(self, request, pk, *args, **kwargs):
         try:
             task = self.queryset.get(pk=pk)
-            task.delete()
+            self.delete_task(task)
             return self.success_response(message="Task deleted successfully.")
         except Task.DoesNotExist:
             return self.bad_request_response(message="Task not found.", status_code=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return self.bad_request_response(errors=str(e), message="Failed to delete task.")
 
+    def update_task(self, serializer):
+        with transaction.atomic():
+            # The task may have been updated since it was loaded.
+            task = serializer.instance
+            task._stats_state = locked_states([task.pk]).get(task.pk)
+            task = serializer.save()
+            enqueue('task_topic', TaskEventV1.build(task, 'updated'), key=task.user_id, schema=TaskEventV1.name)
+        return task
+
+    def delete_task(self, task):
+        with transaction.atomic():
+            enqueue('task_topic', TaskEventV1.build(task, 'deleted'), key=task.user_id, schema=TaskEventV1.name)
+            task.delete()
+
+
+class TaskStats(BaseAPIView):
+    """
+    Task counts by user, category, priority, completion and overdue status,
+    read from the counters in toDoApp/stats.py.
+    """
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [DjangoModelPermissions]
+
+    queryset = Task.objects.all()
+
+    @extend_schema(operation_id="get_task_stats")
+    def get(self, request, *args, **kwargs):
+        try:
+            return self.success_response(data=task_stats(), message="Task statistics retrieved successfully.")
+        except Exception as e:
+            return self.bad_request_response(errors=str(e), message="Failed to retrieve task statistics.")
+
+
+class TaskBulk(BaseAPIView):
+    """
+    Create, update or delete up to TASK_BULK_MAX_ITEMS tasks in one request.
+
+    Every item is validated first, against categories looked up once for
+    the whole batch; if any item is invalid nothing is written and the errors are
+    returned with the index of their item. Valid batches are written with a
+    single bulk query in one transaction, together with their events.
+    """
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [DjangoModelPermissions]
+
+    serializer_class = TaskSerializer
+    queryset = Task.objects.all()
+
+    def check_batch(self, items):
+        """
+        Return an error message if items is not a usable batch, else None.
+        """
+        if not isinstance(items, list) or not items:
+            return "Expected a non-empty list."
+        if len(items) > settings.TASK_BULK_MAX_ITEMS:
+            return f"A batch can contain at most {settings.TASK_BULK_MAX_ITEMS} items."
+        return None
+
+    def get_categories(self, items):
+        return category_registry.in_bulk(item_ids(items, 'category'))
+
+    @extend_schema(operation_id="bulk_create_tasks", request=TaskSerializer(many=True))
+    def post(self, request, *args, **kwargs):
+        try:
+            items = request.data
+            error = self.check_batch(items)
+            if error:
+                return self.bad_request_response(errors=error, message="Failed to create tasks.")
+
+            context = {'request': request, 'categories': self.get_categories(items)}
+            serializers = [self.serializer_class(data=item, context=context) for item in items]
+            errors = [{'index': i, 'errors': s.errors} for i, s in enumerate(serializers) if not s.is_valid()]
+            if errors:
+                return self.bad_request_response(errors=errors, message="Failed to create tasks.")
+
+            tasks = [Task(**s.validated_data, user_id=request.user.pk) for s in serializers]
+            with transaction.atomic():
+                Task.objects.bulk_create(tasks)
+                # bulk_create() and bulk_update() don't send the signals that count tasks.
+                record_changes([(None, task.stats_state()) for task in tasks])
+                enqueue_many('task_topic', [(task.user_id, TaskEventV1.build(task, 'created')) for task in tasks], schema=TaskEventV1.name)
+                transaction.on_commit(lambda: invalidate_task_cache(*[task.pk for task in tasks]))
+
+            data = self.serializer_class(tasks, many=True).data
+            return self.success_response(data=data, message="Tasks created successfully.")
+        except Exception as e:
+            return self.bad_request_response(errors=str(e), message="Failed to create tasks.")
+
+    @extend_schema(operation_id="bulk_update_tasks", request=TaskSerializer(many=True, partial=True))
+    def patch(self, request, *args, **kwargs):
+        """
+        Partially update tasks; every item must carry the id of its task.
+        """
+        try:
+            items = request.data
+            error = self.check_batch(items)
+            if error:
+                return self.bad_request_response(errors=error, message="Failed to update tasks.")
+
+            tasks = self.queryset.in_bulk(item_ids(items, 'id'))
+            context = {'request': request, 'categories': self.get_categories(items)}
+            errors = []
+            serializers = []
+            seen = set()
+            for i, item in enumerate(items):
+                pk = item.get('id') if isinstance(item, dict) else None
+                task = tasks.get(pk) if isinstance(pk, int) and not isinstance(pk, bool) else None
+                if task is None:
+                    errors.append({'index': i, 'errors': {'id': ["Task not found."]}})
+                    continue
+                if pk in seen:
+                    errors.append({'index': i, 'errors': {'id': ["Task appears more than once in the batch."]}})
+                    continue
+                seen.add(pk)
+                serializer = self.serializer_class(task, data=item, partial=True, context=context)
+                if not serializer.is_valid():
+                    errors.append({'index': i, 'errors': serializer.errors})
+                serializers.append(serializer)
+            if errors:
+                return self.bad_request_response(errors=errors, message="Failed to update tasks.")
+
+            fields = set()
+            for serializer in serializers:
+                for attr, value in serializer.validated_data.items():
+                    setattr(serializer.instance, attr, value)
+                    fields.add(attr)
+            updated = [serializer.instance for serializer in serializers]
+
+            with transaction.atomic():
+                if fields:
+                    # Counted from the locked rows: the tasks may have been updated since they were loaded.
+                    stored = locked_states([task.pk for task in updated])
+                    Task.objects.bulk_update(updated, fields)
+                    record_changes([(stored[task.pk], task.stats_state()) for task in updated if task.pk in stored])
+                enqueue_many('task_topic', [(task.user_id, TaskEventV1.build(task, 'updated')) for task in updated], schema=TaskEventV1.name)
+                transaction.on_commit(lambda: invalidate_task_cache(*[task.pk for task in updated]))
+
+            data = self.serializer_class(updated, many=True).data
+            return self.success_response(data=data, message="Tasks updated successfully.")
+        except Exception as e:
+            return self.bad_request_response(errors=str(e), message="Failed to update tasks.")
+
+    @extend_schema(operation_id="bulk_delete_tasks")
+    def delete(self, request, *args, **kwargs):
+        """
+        Delete the tasks listed in {"ids": [...]}; unknown ids are reported back.
+        """
+        try:
+            ids = request.data.get('ids') if isinstance(request.data, dict) else None
+            error = self.check_batch(ids)
+            if error:
+                return self.bad_request_response(errors={'ids': error}, message="Failed to delete tasks.")
+            if not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+                return self.bad_request_response(errors={'ids': "Ids must be integers."}, message="Failed to delete tasks.")
+
+            with transaction.atomic():
+                tasks = list(self.queryset.filter(id__in=ids).select_for_update())
+                enqueue_many('task_topic', [(task.user_id, TaskEventV1.build(task, 'deleted')) for task in tasks], schema=TaskEventV1.name)
+                # post_delete invalidates the cached copies of each task.
+                Task.objects.filter(id__in=[task.pk for task in tasks]).delete()
+
+            deleted = sorted(task.pk for task in tasks)
+            missing = sorted(set(ids) - set(deleted))
+            return self.success_response(data={'deleted': deleted, 'not_found': missing}, message="Tasks deleted successfully.")
+        except Exception as e:
+            return self.bad_request_response(errors=str(e), message="Failed to delete tasks.")
+
 
 
 class CategoryList(BaseAPIView):
 
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [DjangoModelPermissions]
     
     filter_backends = [DjangoFilterBackend]
@@ -185,48 +449,26 @@ class CategoryList(BaseAPIView):
 
     serializer_class = CategorySerializer   
     queryset = Category.objects.all()  
+    row_encoder = RowEncoder(CategorySerializer)
 
-
-    def get_cache_key(self):
-        return 'all_categories'
-
-    @extend_schema(operation_id="get_all_categories", 
-        parameters=[
-            OpenApiParameter(name='name', description='Category Name', required=False, type=str),
-            OpenApiParameter(name='page', description='Page Number', required=False, type=OpenApiTypes.INT),
-        ]
-    )
+    @extend_schema(operation_id="get_all_categories", parameters=CATEGORY_LIST_PARAMETERS)
     def get(self, request, *args, **kwargs):
         """
         Handle GET requests for listing categories.
         """
-
+        self.observe_page_depth()
         try:
-            cache_key = self.get_cache_key()
-            cached_data = cache.get(cache_key)
-        except :
-            cached_data = None
-
-        if cached_data:
-            return self.success_response(data=cached_data, message="Categories retrieved successfully.")
-
-        try:
-            categories = self.filter_queryset(self.queryset)
-            page_categories = self.paginate_queryset(categories)
-            serializer = self.serializer_class(page_categories, many=True)
-
-            data = self.get_paginated_response(serializer.data).data
-
-            try: 
-                cache.set(cache_key, data, 60 * 15)
-            except ConnectionError:
-                logger.warning("Cache not found.")
-
+            params = {'_host': request.get_host(), **dict(request.query_params.lists())}
+            data = category_cache.get_or_set(params, self.list_categories)
             return self.success_response(data=data, message="Categories retrieved successfully.")
-        
         except Exception as e:
             return self.bad_request_response(errors=str(e), message="Failed to retrieve categories.")
 
+    def list_categories(self):
+        categories = self.row_encoder.rows(self.filter_queryset(self.queryset))
+        page_categories = self.paginate_queryset(categories)
+        return self.get_paginated_data(self.row_encoder.encode(page_categories))
+
     @extend_schema(operation_id="create_category")
     def post(self, request, *args, **kwargs):
         """
@@ -236,12 +478,6 @@ class CategoryList(BaseAPIView):
             serializer = self.serializer_class(data=request.data)
             if serializer.is_valid():
                 serializer.save()
-
-                try: 
-                    cache.delete(self.get_cache_key())
-                except ConnectionError:
-                    logger.warning("Cache not found.")
-
                 return self.success_response(data=serializer.data, message="Category created successfully.")
             return self.bad_request_response(errors=serializer.errors, message="Failed to create category.")
         except Exception as e:
@@ -255,7 +491,7 @@ class CategoryDetail(BaseAPIView):
     Retrieve, update or delete a category.
     """
 
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [DjangoModelPermissions]
     serializer_class = CategorySerializer     
     queryset = Category.objects.all()  
@@ -324,6 +560,58 @@ class CategoryDetail(BaseAPIView):
             return self.bad_request_response(errors=str(e), message="Failed to delete category.")
         
 
+class UserProvisioning(BaseAPIView):
+    """
+    Create employees and employers from an uploaded CSV or JSONL file.
+
+    The response streams one JSON line of progress per batch and ends with
+    a line holding the final report; see toDoApp/provisioning.py. Files too
+    large to finish within the proxy timeout belong with the
+    bulk_provision_users command.
+    """
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    @extend_schema(
+        operation_id="provision_users",
+        request={'multipart/form-data': {
+            'type': 'object',
+            'properties': {
+                'file': {'type': 'string', 'format': 'binary'},
+                'format': {'type': 'string', 'enum': list(FORMATS)},
+                'role': {'type': 'string', 'description': "Role of rows that don't have one."},
+            },
+        }},
+    )
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return self.bad_request_response(message="A CSV or JSONL file is required.")
+        file_format = request.data.get('format') or format_for(upload.name)
+        if file_format not in FORMATS:
+            return self.bad_request_response(message=f"Format must be one of {', '.join(FORMATS)}.")
+
+        rows = read_rows(io.TextIOWrapper(upload.file, encoding='utf-8', newline=''), file_format)
+        batches = provision(
+            rows, batch_size=settings.USER_PROVISIONING_BATCH_SIZE, workers=settings.USER_PROVISIONING_WORKERS,
+            default_role=request.data.get('role', 'EMPLOYEE').upper(),
+        )
+        return StreamingHttpResponse(self.stream_report(batches), content_type='application/x-ndjson')
+
+    def stream_report(self, batches):
+        report = None
+        try:
+            for report in batches:
+                yield json.dumps(report.progress()) + '\n'
+        except Exception as e:
+            logger.exception("User provisioning failed")
+            yield json.dumps({'success': False, 'message': "Provisioning failed.", 'errors': str(e)}) + '\n'
+            return
+        data = report.as_dict() if report else {'processed': 0, 'created': 0, 'failed': 0, 'errors': []}
+        yield json.dumps({'success': True, 'message': "Users provisioned.", 'data': data}) + '\n'
+
+
 class GoogleSignInView(BaseAPIView):
     serializer_class = GoogleLoginSerializer
     permission_classes = [AllowAny]
@@ -342,10 +630,23 @@ class GoogleSignInView(BaseAPIView):
         except serializers.ValidationError as e:
             return self.bad_request_response(errors=str(e), message="Google authentication failed.")
         except Exception as e:
-            import traceback
-            logger.exception("Exception:", traceback.format_exc())
+            logger.exception("Google authentication failed")
             return self.bad_request_response(errors=str(e), message="Google authentication failed.")
 
+def metrics_view(request):
+    """
+    Prometheus metrics of every worker, for requests that carry the
+    METRICS_TOKEN as a bearer token; refused while none is configured.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        return HttpResponse(status=status.HTTP_403_FORBIDDEN)
+    if not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
+
+
 # For testing google signin
 
 def google_login_view(request):
@@ -53,6 +53,9 @@ SITE_ID = 1
 
 
 MIDDLEWARE = [
+    'toDoApp.middleware.profiling.ProfilingMiddleware',
+    'toDoApp.middleware.metrics.MetricsMiddleware',
+    'toDoApp.middleware.replicas.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -60,7 +63,6 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'toDoApp.middleware.query_count.QueryCountMiddleware',
 ]
 
 ROOT_URLCONF = 'todo.urls'
@@ -110,6 +112,53 @@ else:
         }
     }
 
+# How requests get their connection:
+# - persistent: each thread keeps its connection for DB_CONN_MAX_AGE seconds,
+#   checked before the first query of a request that follows an error or
+#   the age limit.
+# - pgbouncer: the same, through pgbouncer in transaction mode; server-side
+#   cursors (QuerySet.iterator()) do not survive its switching of server
+#   connections between transactions.
+# - pool: each process shares DB_POOL_SIZE connections among its threads
+#   (toDoApp/pooled_postgresql). gunicorn_config.py sets DB_POOL_SIZE to the
+#   threads per worker, so Postgres sees workers x threads connections.
+# - none: a new connection per request.
+DB_CONNECTION_MODE = os.getenv('DB_CONNECTION_MODE', 'persistent')
+
+if DB_CONNECTION_MODE in ('persistent', 'pgbouncer'):
+    DATABASES['default'].update(CONN_MAX_AGE=int(os.getenv('DB_CONN_MAX_AGE', 600)), CONN_HEALTH_CHECKS=True)
+    if DB_CONNECTION_MODE == 'pgbouncer':
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+elif DB_CONNECTION_MODE == 'pool':
+    DATABASES['default'].update(ENGINE='toDoApp.pooled_postgresql', CONN_MAX_AGE=0, OPTIONS={
+        'pool': {
+            'max_size': int(os.getenv('DB_POOL_SIZE', 1)),
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', 5)),
+            # Idle connections older than this are checked before reuse.
+            'check_after': float(os.getenv('DB_POOL_CHECK_AFTER', 30)),
+        },
+    })
+
+# Read replicas (toDoApp/replicas.py): DB_REPLICAS is a comma-separated list
+# of host[:port] of streaming replicas of default, which safe requests read
+# from. A client that writes reads from the primary for REPLICA_PIN_SECONDS
+# afterwards; keep it above REPLICA_MAX_LAG plus REPLICA_CHECK_INTERVAL, the
+# most a replica in use can be behind. In tests a replica is a mirror of the
+# test database rather than a database of its own.
+REPLICA_DATABASES = []
+for index, address in enumerate(filter(None, os.getenv('DB_REPLICAS', '').split(',')), 1):
+    host, _, port = address.strip().partition(':')
+    REPLICA_DATABASES.append(f'replica_{index}')
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'], 'HOST': host, 'PORT': port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['toDoApp.replicas.ReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+REPLICA_MAX_LAG = float(os.getenv('REPLICA_MAX_LAG', 2))
+REPLICA_CHECK_INTERVAL = float(os.getenv('REPLICA_CHECK_INTERVAL', 1))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -117,7 +166,7 @@ else:
 AUTH_USER_MODEL = "toDoApp.CustomUser"
 
 AUTHENTICATION_BACKENDS = (
-    'django.contrib.auth.backends.ModelBackend',
+    'toDoApp.backends.CachedPermissionBackend',
 )
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -168,7 +217,25 @@ REST_FRAMEWORK = {
     ),
 
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'toDoApp.authentication.StatelessJWTAuthentication',
+    ),
+
+    # orjson for JSON, and MessagePack for clients that ask for it.
+    'DEFAULT_RENDERER_CLASSES': (
+        'toDoApp.renderers.ORJSONRenderer',
+        'toDoApp.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'toDoApp.parsers.ORJSONParser',
+        'toDoApp.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'TEST_REQUEST_RENDERER_CLASSES': (
+        'rest_framework.renderers.MultiPartRenderer',
+        'rest_framework.renderers.JSONRenderer',
+        'toDoApp.renderers.MessagePackRenderer',
     ),
 
     'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.NamespaceVersioning',
@@ -184,8 +251,14 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
     'SIGNING_KEY': SECRET_KEY,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_OBTAIN_SERIALIZER': 'toDoApp.serializers.token_serializer.TokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'toDoApp.serializers.token_serializer.TokenRefreshSerializer',
 }
 
+# Per-process cache of user rows behind stateless JWT users.
+AUTH_USER_CACHE_SIZE = int(os.getenv('AUTH_USER_CACHE_SIZE', 1024))
+AUTH_USER_CACHE_TTL = int(os.getenv('AUTH_USER_CACHE_TTL', 30))
+
 REST_USE_JWT = True 
 
 CACHES = {
@@ -197,11 +270,39 @@ CACHES = {
             'CONNECTION_POOL_KWARGS': {
                 'max_connections': 100,
                 'retry_on_timeout': True,
-            }
+            },
+            # Fail fast when Redis is down; cached views then fall back to the database.
+            'SOCKET_CONNECT_TIMEOUT': 0.5,
+            'SOCKET_TIMEOUT': 0.5,
         }
     }
 }
 
+# Read-through cache with ETags for the task list and detail endpoints.
+TASK_CACHE_ENABLED = os.getenv('TASK_CACHE_ENABLED', '').lower() in ('1', 'true')
+
+# Request profiling (toDoApp/middleware/profiling.py): requests sending
+# X-Profile: <PROFILING_TOKEN>, plus a PROFILING_SAMPLE_RATE fraction of all
+# requests, run under cProfile and are dumped to PROFILING_DIR.
+PROFILING_TOKEN = os.getenv('PROFILING_TOKEN', '')
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', 0))
+PROFILING_DIR = os.getenv('PROFILING_DIR', os.path.join(BASE_DIR, 'profiles'))
+
+# Bearer token required to read /metrics; while empty, /metrics answers 403.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Serve the task and category endpoints from their async views; run under
+# uvicorn workers (see gunicorn_config.py).
+ASYNC_API = os.getenv('ASYNC_API', '').lower() in ('1', 'true')
+
+# Largest number of items accepted by the bulk task endpoints.
+TASK_BULK_MAX_ITEMS = int(os.getenv('TASK_BULK_MAX_ITEMS', 500))
+
+# Rows per insert, and password hashing processes (0 hashes in the request's
+# own thread), of the user provisioning endpoint.
+USER_PROVISIONING_BATCH_SIZE = int(os.getenv('USER_PROVISIONING_BATCH_SIZE', 1000))
+USER_PROVISIONING_WORKERS = int(os.getenv('USER_PROVISIONING_WORKERS', 2))
+
 
 SPECTACULAR_SETTINGS = {
     'TITLE': 'To Do App', 
@@ -253,6 +354,20 @@ LOGGING = {
     },
 }
 
+KAFKA_PRODUCER = {
+    'linger_ms': int(os.getenv('KAFKA_LINGER_MS', 20)),
+    'compression_type': os.getenv('KAFKA_COMPRESSION_TYPE', 'gzip'),
+}
+
+# Wire format of schema'd events: 'struct', 'msgpack' or 'json'. See toDoApp/kafka/events.py.
+KAFKA_EVENT_ENCODING = os.getenv('KAFKA_EVENT_ENCODING', 'struct')
+
+# Modules whose @register_handler functions process consumed events;
+# consume_task_events refuses to start while there are none.
+KAFKA_CONSUMER_HANDLERS = ['toDoApp.kafka.handlers']
+
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET") 
-SOCIAL_AUTH_PASSWORD = os.getenv("SOCIAL_AUTH_PASSWORD") 
\ No newline at end of file
+SOCIAL_AUTH_PASSWORD = os.getenv("SOCIAL_AUTH_PASSWORD")
+# Google's signing keys, as a JWKS; see toDoApp/google_auth.py.
+GOOGLE_CERTS_URL = os.getenv("GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v3/certs") 
\ No newline at end of file
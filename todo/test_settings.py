@@ -0,0 +1,12 @@
+"""
+Settings for the test suite: todo.settings plus 'replica', a second test
+database that the read-replica routing tests (toDoApp/tests/test_replicas.py)
+read from. Routing stays off elsewhere; those tests turn it on by overriding
+REPLICA_DATABASES.
+
+    python manage.py test --settings=todo.test_settings
+"""
+from todo.settings import *  # noqa: F401,F403
+from todo.settings import DATABASES
+
+DATABASES['replica'] = {**DATABASES['default'], 'TEST': {'NAME': 'test_replica'}}
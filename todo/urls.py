@@ -15,16 +15,20 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from toDoApp.views import metrics_view
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     
     path('api/schema/', SpectacularAPIView.as_view(api_version='v1'), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
 
-    path('api/v1/', include(('toDoApp.urls', 'toDoApp'), namespace='v1')),
+    path('api/v1/', include(('toDoApp.async_urls' if settings.ASYNC_API else 'toDoApp.urls', 'toDoApp'), namespace='v1')),
 ]